@@ -0,0 +1,180 @@
+# Running many optimizations with bounded concurrency
+# Work is pulled from the input lazily and at most max_concurrency runs are in
+# flight, so memory stays flat however many jobs there are. Results are
+# yielded as each run finishes, not in input order.
+
+import argparse
+import contextlib
+import json
+import os
+import sys
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+from config import settings
+from .dedup import minhash
+from .nodes.latex_text import project_resume
+from .nodes.resume_analysis import resume_chunks
+from .nodes.text_index import build_index
+
+
+def prepare_resume(resume: str) -> None:
+    # Fill the per-document caches (projection, token indexes, MinHash and
+    # section chunks) once, so every run of a batch reuses the same work
+    projection = project_resume(resume)
+    build_index(projection.text)
+    build_index(projection.text.lower())
+    if settings.DEDUP_ENABLED:
+        minhash(resume)
+    resume_chunks(resume, settings.RESUME_CHUNK_CHARS)
+
+
+def run_bounded(
+    fn: Callable[[Any], Any],
+    items: Iterable[Any],
+    max_concurrency: int,
+) -> Iterator[Tuple[Any, Any, Optional[BaseException]]]:
+    # (item, result, error) for each item in completion order
+    items = iter(items)
+    executor = ThreadPoolExecutor(max_workers=max(1, max_concurrency), thread_name_prefix="batch")
+    pending = {}
+
+    def submit_next() -> None:
+        for item in items:
+            pending[executor.submit(fn, item)] = item
+            return
+
+    try:
+        for _ in range(max(1, max_concurrency)):
+            submit_next()
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                item = pending.pop(future)
+                submit_next()
+                error = future.exception()
+                yield item, None if error else future.result(), error
+    finally:
+        # A consumer that stops early (client disconnect) leaves queued work unstarted
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+# Offline JSONL runner
+#   python -m agent.batch input.jsonl --output results.jsonl --concurrency 4
+# Each input line is {"resume", "job_description", "id"?, "tier"?, "include_cover_letter"?,
+# "deadline_seconds"?, "narrative_analysis"?}. Each output line is
+# {"line", "id", "result"} or {"line", "id", "error"}, written as runs finish.
+# Rerunning with the same output file skips input lines it already covers.
+
+_RUN_OPTIONS = ("tier", "include_cover_letter", "deadline_seconds", "narrative_analysis")
+
+
+class _LineSet:
+    # Bitset of input line numbers: one bit per line however large the input
+    def __init__(self):
+        self._bits = bytearray()
+
+    def add(self, line: int) -> None:
+        byte = line >> 3
+        if byte >= len(self._bits):
+            self._bits.extend(bytes(byte - len(self._bits) + 1))
+        self._bits[byte] |= 1 << (line & 7)
+
+    def __contains__(self, line: int) -> bool:
+        byte = line >> 3
+        return byte < len(self._bits) and bool(self._bits[byte] & (1 << (line & 7)))
+
+
+def _finished_lines(path: str, retry_failed: bool) -> _LineSet:
+    # Lines already in the output; a torn last line from a crash is cut off
+    done = _LineSet()
+    if not os.path.exists(path):
+        return done
+    with open(path, "r+b") as f:
+        keep = 0
+        for raw in f:
+            if not raw.endswith(b"\n"):
+                break
+            keep += len(raw)
+            try:
+                record = json.loads(raw)
+            except ValueError:
+                continue
+            if isinstance(record.get("line"), int) and not (retry_failed and "error" in record):
+                done.add(record["line"])
+        f.truncate(keep)
+    return done
+
+
+def _read_jobs(stream: TextIO, done: _LineSet) -> Iterator[Tuple[int, Dict]]:
+    for number, raw in enumerate(stream, start=1):
+        if number in done or not raw.strip():
+            continue
+        try:
+            record = json.loads(raw)
+        except ValueError as e:
+            yield number, {"_error": f"Invalid JSON: {e}"}
+            continue
+        if not isinstance(record, dict):
+            record = {"_error": f"Expected a JSON object, got {type(record).__name__}"}
+        yield number, record
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Run resume optimizations from a JSONL file")
+    parser.add_argument("input", nargs="?", default="-", help="JSONL input file, or - for stdin")
+    parser.add_argument("--output", "-o", default="-", help="JSONL output file; existing results are skipped")
+    parser.add_argument("--concurrency", "-c", type=int, default=settings.BATCH_MAX_CONCURRENCY)
+    parser.add_argument("--retry-failed", action="store_true", help="rerun lines whose earlier result was an error")
+    parser.add_argument("--user-id", default="batch-cli")
+    parser.add_argument("--api-key", default=None, help="LLM API key (default: GROQ_API_KEY)")
+    args = parser.parse_args(argv)
+
+    from .workflow import run_optimization
+
+    def optimize(job: Tuple[int, Dict]) -> Dict:
+        _, record = job
+        if "_error" in record:
+            raise ValueError(record["_error"])
+        if not record.get("resume") or not record.get("job_description"):
+            raise ValueError("resume and job_description are required")
+        result = run_optimization(
+            job_description=record["job_description"],
+            resume=record["resume"],
+            user_id=args.user_id,
+            user_llm_api_key=args.api_key,
+            **{option: record[option] for option in _RUN_OPTIONS if option in record},
+        )
+        result.pop("fingerprints", None)
+        return result
+
+    done = _finished_lines(args.output, args.retry_failed) if args.output != "-" else _LineSet()
+    source = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8")
+    sink = sys.stdout if args.output == "-" else open(args.output, "a", encoding="utf-8")
+    completed = failed = 0
+    try:
+        # Node logs go to stderr so stdout carries only results
+        with contextlib.redirect_stdout(sys.stderr):
+            for (number, record), result, error in run_bounded(optimize, _read_jobs(source, done), args.concurrency):
+                line = {"line": number, "id": record.get("id")}
+                if error is None:
+                    line["result"] = result
+                    completed += 1
+                else:
+                    line["error"] = str(error)
+                    failed += 1
+                sink.write(json.dumps(line, default=str) + "\n")
+                sink.flush()
+                print(f"[BATCH] line {number}: {'error' if error else result.get('final_status')}")
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if sink is not sys.stdout:
+            sink.close()
+
+    print(f"[BATCH] Done: {completed} completed, {failed} failed", file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
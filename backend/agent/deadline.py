@@ -0,0 +1,92 @@
+# Run-level deadline helpers
+# The deadline is stored in state as an epoch timestamp so it survives result_json
+
+import time
+from functools import wraps
+from typing import Callable, Dict, Optional
+
+from openai import APITimeoutError
+from config import settings
+from .nodes.local_analysis import analyze_resume_locally
+from .nodes.local_requirements import extract_requirements_locally
+
+
+class DeadlineExceeded(Exception):
+    """Raised when a node is asked to start after the run deadline."""
+
+
+def compute_deadline(deadline_seconds: Optional[float] = None) -> Optional[float]:
+    budget = settings.RUN_DEADLINE_SECONDS if deadline_seconds is None else deadline_seconds
+    if not budget or budget <= 0:
+        return None
+    return time.time() + float(budget)
+
+
+def remaining_seconds(state: Dict) -> Optional[float]:
+    deadline_at = state.get("deadline_at")
+    if deadline_at is None:
+        return None
+    return float(deadline_at) - time.time()
+
+
+def request_timeout(state: Dict) -> Optional[float]:
+    # Remaining budget to use as the timeout of the next LLM request
+    remaining = remaining_seconds(state)
+    if remaining is None:
+        return None
+    if remaining < settings.DEADLINE_MIN_REQUEST_SECONDS:
+        raise DeadlineExceeded(f"Run deadline reached ({remaining:.1f}s left)")
+    return remaining
+
+
+def with_deadline_fallback(node: Callable[[Dict], Dict], fallback: Callable[[Dict], Dict]) -> Callable[[Dict], Dict]:
+    # Wrap a node so running out of time degrades to a cheap result instead of failing the run
+    @wraps(node)
+    def guarded(state: Dict) -> Dict:
+        try:
+            return node(state)
+        except (DeadlineExceeded, APITimeoutError) as e:
+            if state.get("deadline_at") is None:
+                raise
+            print(f"[DEADLINE] {node.__name__} fell back: {e}")
+            update = fallback(state)
+            decision = {
+                "node": node.__name__,
+                "action": "deadline_fallback",
+            }
+            update["decision_log"] = state.get("decision_log", []) + [decision]
+            return update
+
+    return guarded
+
+
+def fallback_requirements(state: Dict) -> Dict:
+    # Whatever the local parser finds, however confident; not cached for later runs
+    requirements, _ = extract_requirements_locally(state["job_description"])
+    return {"job_requirements": requirements}
+
+
+def fallback_analysis(state: Dict) -> Dict:
+    # Requirements that do not appear in the resume are the obvious gaps
+    return analyze_resume_locally(state)
+
+
+def fallback_plan(state: Dict) -> Dict:
+    requirements = state.get("job_requirements") or {}
+    missing = (state.get("resume_analysis") or {}).get("missing_keywords", [])
+
+    return {
+        "improvement_plan": {
+            "priority_changes": [],
+            "skill_additions": [],
+            "keyword_insertions": list(missing or requirements.get("key_keywords", [])),
+            "section_improvements": [],
+            "expected_score_gain": 0,
+            "reasoning": "Run deadline reached before planning finished",
+        }
+    }
+
+
+def fallback_modification(state: Dict) -> Dict:
+    # Keep the best resume produced so far; the rescore step will see no gain and stop
+    return {"modified_resume": state.get("modified_resume")}
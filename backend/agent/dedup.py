@@ -0,0 +1,169 @@
+# Near-duplicate run detection
+# Resumes and job descriptions are fingerprinted with MinHash over token
+# shingles. An LSH index over the resume signature finds a user's earlier runs
+# on almost the same resume; if the posting is similar too, that run's
+# analysis and first plan are reused instead of calling the LLM again.
+
+import threading
+import zlib
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from config import settings
+from .nodes.latex_text import project_resume
+from .nodes.text_index import tokenize
+
+NUM_PERM = 64
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+SHINGLE_SIZE = 3
+
+_PRIME = (1 << 31) - 1
+_rng = np.random.default_rng(20240601)
+_A = _rng.integers(1, _PRIME, size=NUM_PERM, dtype=np.uint64)
+_B = _rng.integers(0, _PRIME, size=NUM_PERM, dtype=np.uint64)
+
+
+def minhash(text: str) -> Optional[List[int]]:
+    # Signature of the text's token shingles, or None for empty text
+    signature = _minhash(text)
+    return list(signature) if signature is not None else None
+
+
+@lru_cache(maxsize=256)
+def _minhash(text: str) -> Optional[Tuple[int, ...]]:
+    # Memoized so a resume run against many postings is hashed once
+    tokens = [token for token, _, _ in tokenize(project_resume(text).text)]
+    if not tokens:
+        return None
+    size = min(SHINGLE_SIZE, len(tokens))
+    shingles = {"\x1f".join(tokens[i:i + size]) for i in range(len(tokens) - size + 1)}
+    # crc32 is stable across processes, so stored signatures stay comparable
+    hashes = np.fromiter((zlib.crc32(s.encode("utf-8")) % _PRIME for s in shingles), dtype=np.uint64)
+    signature = (_A[:, np.newaxis] * hashes[np.newaxis, :] + _B[:, np.newaxis]) % _PRIME
+    return tuple(signature.min(axis=1).tolist())
+
+
+def fingerprint(resume: str, job_description: str) -> Optional[Dict[str, List[int]]]:
+    resume_signature = minhash(resume)
+    job_signature = minhash(job_description)
+    if resume_signature is None or job_signature is None:
+        return None
+    return {"resume": resume_signature, "job": job_signature}
+
+
+def similarity(a: List[int], b: List[int]) -> float:
+    # Estimated Jaccard similarity of the underlying shingle sets
+    return float(np.mean(np.asarray(a) == np.asarray(b)))
+
+
+class _Entry:
+    __slots__ = ("user_id", "fingerprints", "payload")
+
+    def __init__(self, user_id: str, fingerprints: Dict, payload: Dict):
+        self.user_id = user_id
+        self.fingerprints = fingerprints
+        self.payload = payload
+
+
+class DuplicateIndex:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._buckets: Dict[Tuple, set] = {}
+        self.lookups = 0
+        self.hits = 0
+        self.reused = {"resume_analysis": 0, "improvement_plan": 0}
+
+    @staticmethod
+    def _band_keys(user_id: str, signature: List[int]):
+        # Buckets are per user so one user's runs never match another's
+        for band in range(BANDS):
+            yield (user_id, band, tuple(signature[band * ROWS:(band + 1) * ROWS]))
+
+    def add(self, run_id: str, user_id: str, fingerprints: Optional[Dict], payload: Dict) -> None:
+        if not fingerprints or not payload:
+            return
+        with self._lock:
+            if run_id in self._entries:
+                return
+            self._entries[run_id] = _Entry(user_id, fingerprints, payload)
+            for key in self._band_keys(user_id, fingerprints["resume"]):
+                self._buckets.setdefault(key, set()).add(run_id)
+            while len(self._entries) > settings.DEDUP_INDEX_SIZE:
+                self._evict_oldest()
+
+    def _evict_oldest(self) -> None:
+        run_id, entry = self._entries.popitem(last=False)
+        for key in self._band_keys(entry.user_id, entry.fingerprints["resume"]):
+            bucket = self._buckets.get(key)
+            if bucket is not None:
+                bucket.discard(run_id)
+                if not bucket:
+                    del self._buckets[key]
+
+    def lookup(self, user_id: str, fingerprints: Optional[Dict]) -> Optional[Tuple[str, Dict]]:
+        # (run_id, payload) of the closest earlier run above both thresholds
+        if not fingerprints:
+            return None
+        with self._lock:
+            self.lookups += 1
+            candidates = set()
+            for key in self._band_keys(user_id, fingerprints["resume"]):
+                candidates |= self._buckets.get(key, set())
+
+            best = None
+            for run_id in candidates:
+                entry = self._entries[run_id]
+                resume_similarity = similarity(fingerprints["resume"], entry.fingerprints["resume"])
+                if resume_similarity < settings.DEDUP_RESUME_THRESHOLD:
+                    continue
+                if similarity(fingerprints["job"], entry.fingerprints["job"]) < settings.DEDUP_JOB_THRESHOLD:
+                    continue
+                if best is None or resume_similarity > best[0]:
+                    best = (resume_similarity, run_id, entry.payload)
+
+            if best is None:
+                return None
+            self.hits += 1
+            return best[1], best[2]
+
+    def record_reuse(self, field: str) -> None:
+        with self._lock:
+            self.reused[field] = self.reused.get(field, 0) + 1
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            return {
+                "enabled": settings.DEDUP_ENABLED,
+                "indexed_runs": len(self._entries),
+                "lookups": self.lookups,
+                "hits": self.hits,
+                "hit_rate": round(self.hits / self.lookups, 3) if self.lookups else 0.0,
+                "reused": dict(self.reused),
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._buckets.clear()
+            self.lookups = 0
+            self.hits = 0
+            self.reused = {"resume_analysis": 0, "improvement_plan": 0}
+
+
+duplicate_index = DuplicateIndex()
+
+
+def reusable_payload(state: Dict) -> Dict:
+    # What a later near-duplicate run can skip recomputing: the analysis and
+    # the first plan, both made for the original resume
+    payload = {}
+    if state.get("resume_analysis"):
+        payload["resume_analysis"] = state["resume_analysis"]
+    if state.get("initial_improvement_plan"):
+        payload["improvement_plan"] = state["initial_improvement_plan"]
+    return payload
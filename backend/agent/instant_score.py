@@ -0,0 +1,51 @@
+# Score-only path: fit check and ATS score with no LLM calls
+# Requirements come from the caller, the extraction cache filled by earlier
+# runs, or the local extractor, in that order.
+
+from typing import Dict, Optional
+
+from .nodes.fit_check import assess_job_fit
+from .nodes.job_requirements import get_cached_requirements
+from .nodes.local_requirements import extract_requirements_locally
+from .nodes.scoring import _score_resume_text
+
+
+def resolve_requirements(job_description: str, job_requirements: Optional[Dict] = None):
+    # (requirements, source) where source is "request", "cache" or "local"
+    if job_requirements:
+        return job_requirements, "request"
+    cached = get_cached_requirements(job_description)
+    if cached is not None:
+        return cached, "cache"
+    requirements, _ = extract_requirements_locally(job_description)
+    return requirements, "local"
+
+
+def instant_score(
+    job_description: str,
+    resume: str,
+    job_requirements: Optional[Dict] = None,
+    include_spans: bool = False,
+) -> Dict:
+    requirements, source = resolve_requirements(job_description, job_requirements)
+
+    score, breakdown = _score_resume_text(resume, requirements)
+    fit = assess_job_fit(
+        {"job_requirements": requirements, "original_resume": resume},
+        with_spans=include_spans,
+        quiet=True,
+    )
+    fit_details = fit["decision_log"][-1]
+
+    return {
+        "ats_score": score,
+        "ats_breakdown": breakdown,
+        "fit_decision": fit["fit_decision"],
+        "fit_reason": fit["fit_reason"],
+        "fit_confidence": fit["fit_confidence"],
+        "fit_score": fit_details["fit_score"],
+        "relevance_score": fit["relevance_score"],
+        "job_requirements": requirements,
+        "requirements_source": source,
+        "match_spans": fit.get("match_spans_before"),
+    }
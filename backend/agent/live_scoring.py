@@ -0,0 +1,195 @@
+# Incremental ATS scoring for editor sessions
+# The document is kept as lines with per-line word counts, bullet flags and
+# matched terms. An edit re-tokenizes only the lines it touches, rematches
+# them and the neighbours whose context reaches them, and updates
+# document-wide counters, so scoring a keystroke does not rescan the resume. A line owns the matches
+# that start in it; it is matched together with enough tokens of the lines
+# around it that a multi-word term or alias split across a line break is
+# found as the full scorer finds it. LaTeX sources are rescored in full on
+# every edit because projection is not line-local.
+
+from bisect import bisect_right
+from collections import Counter
+from itertools import accumulate
+from typing import Dict, List, Optional, Set, Tuple
+
+from .nodes.keyword_matcher import compile_requirements
+from .nodes.latex_text import looks_like_latex, project_resume
+from .nodes.scoring import BULLET_CHARS, _format_points, _score_matches, _score_resume_text
+from .nodes.skill_aliases import get_alias_index
+from .nodes.text_index import TextIndex, scan_tokens
+
+
+class _Line:
+    __slots__ = ("words", "bullets", "empty", "terms")
+
+    def __init__(self, words: int, bullets: bool, empty: bool, terms: Set[str]):
+        self.words = words
+        self.bullets = bullets
+        self.empty = empty
+        self.terms = terms
+
+
+class LiveScoringSession:
+    def __init__(self, requirements: Dict, resume: str = ""):
+        self.requirements = requirements or {}
+        self.compiled = compile_requirements(self.requirements)
+
+        # Terms grouped by first token: a line only checks terms it can contain
+        self._by_first_token: Dict[str, List[Tuple[str, Tuple[str, ...]]]] = {}
+        for term, phrases in self.compiled.phrases.items():
+            for phrase in phrases:
+                if phrase:
+                    self._by_first_token.setdefault(phrase[0], []).append((term, phrase))
+
+        # Tokens of the following lines a match starting in a line can reach (every
+        # word of the longest term may be a multi-word alias), and tokens of the
+        # preceding lines that decide where an alias overlapping the line starts
+        longest = max((len(p) for phrases in self.compiled.phrases.values() for p in phrases), default=1)
+        alias_length = get_alias_index().max_length
+        self._after = longest * alias_length - 1
+        self._before = alias_length - 1
+
+        self.version = 0
+        self.reset(resume)
+
+    def reset(self, resume: str) -> None:
+        resume = resume or ""
+        self.latex = looks_like_latex(resume)
+        self._text = resume if self.latex else None
+
+        self.lines: List[str] = []
+        self._stats: List[_Line] = []
+        self._tokens: List[List[Tuple[str, int, int]]] = []
+        self._offsets: List[int] = [0]
+        self.word_count = 0
+        self.bullet_lines = 0
+        self.empty_lines = 0
+        self.term_lines: Counter = Counter()
+        if not self.latex:
+            self._replace_lines(0, 0, resume.split("\n"))
+
+    @property
+    def text(self) -> str:
+        return self._text if self.latex else "\n".join(self.lines)
+
+    def __len__(self) -> int:
+        if self.latex:
+            return len(self._text)
+        return self._offsets[-1] + len(self.lines[-1])
+
+    def _lines_reaching(self, line: int, step: int, size: int) -> int:
+        # Walk from line in direction step until the lines passed hold size tokens;
+        # returns the last line whose context of that size reaches line
+        seen = 0
+        while 0 <= line + step < len(self.lines) and seen < size:
+            line += step
+            seen += len(self._tokens[line])
+        return line
+
+    def _context_tokens(self, i: int, step: int, size: int) -> List[Tuple[str, int, int]]:
+        # Up to size tokens of the lines before (step -1) or after (step 1) line i
+        tokens: List[Tuple[str, int, int]] = []
+        while 0 <= i + step < len(self.lines) and len(tokens) < size:
+            i += step
+            tokens = tokens + self._tokens[i] if step > 0 else self._tokens[i] + tokens
+        if step > 0:
+            return tokens[:size]
+        return tokens[len(tokens) - size:] if size else []
+
+    def _line_stats(self, i: int) -> _Line:
+        line = self.lines[i]
+        lowered = line.lower()
+        before = self._context_tokens(i, -1, self._before)
+        own = self._tokens[i]
+        index = TextIndex.from_tokens(before + own + self._context_tokens(i, 1, self._after))
+
+        # The line owns the matches that start in it
+        lo, hi = len(before), len(before) + len(own)
+        terms = set()
+        for token in index.positions:
+            for term, phrase in self._by_first_token.get(token, ()):
+                if term not in terms and any(lo <= p < hi for p in index.find_positions(phrase)):
+                    terms.add(term)
+        return _Line(len(lowered.split()), any(c in lowered for c in BULLET_CHARS), not line, terms)
+
+    def _replace_lines(self, first: int, last: int, new_lines: List[str]) -> None:
+        # Swap lines[first:last] for new_lines, keeping the document counters in step.
+        # Lines around the edit whose context reaches into it are matched again.
+        start = self._lines_reaching(first, -1, self._after)
+        self.lines[first:last] = new_lines
+        self._tokens[first:last] = [scan_tokens(line) for line in new_lines]
+        stop = self._lines_reaching(first + len(new_lines) - 1, 1, self._before) + 1
+        old_stop = stop - len(new_lines) + (last - first)
+
+        for stats in self._stats[start:old_stop]:
+            self.word_count -= stats.words
+            self.bullet_lines -= stats.bullets
+            self.empty_lines -= stats.empty
+            self.term_lines.subtract(stats.terms)
+
+        # Line start offsets from the first changed line on
+        offset = self._offsets[first]
+        tail = accumulate((len(line) + 1 for line in self.lines[first:-1]), initial=offset)
+        self._offsets[first:] = list(tail)
+
+        new_stats = [self._line_stats(i) for i in range(start, stop)]
+        for stats in new_stats:
+            self.word_count += stats.words
+            self.bullet_lines += stats.bullets
+            self.empty_lines += stats.empty
+            self.term_lines.update(stats.terms)
+        self._stats[start:old_stop] = new_stats
+
+    def apply_edit(self, start: int, end: int, text: str) -> None:
+        # Replace document[start:end] with text; offsets are in characters
+        if not 0 <= start <= end <= len(self):
+            raise ValueError(f"Edit range {start}:{end} is outside the document")
+        self.version += 1
+
+        if self.latex:
+            self._text = self._text[:start] + (text or "") + self._text[end:]
+            return
+
+        first = bisect_right(self._offsets, start) - 1
+        last = bisect_right(self._offsets, end) - 1
+        prefix = self.lines[first][:start - self._offsets[first]]
+        suffix = self.lines[last][end - self._offsets[last]:]
+        self._replace_lines(first, last + 1, (prefix + (text or "") + suffix).split("\n"))
+
+    def _has_blank_line(self) -> bool:
+        # "\n\n" appears exactly when a line other than the first or last is empty
+        interior = self.empty_lines
+        if not self.lines[0]:
+            interior -= 1
+        if len(self.lines) > 1 and not self.lines[-1]:
+            interior -= 1
+        return interior > 0
+
+    def found_terms(self) -> Set[str]:
+        if self.latex:
+            return self.compiled.find(project_resume(self._text).text.lower())
+        return {term for term, count in self.term_lines.items() if count > 0}
+
+    def score(self) -> Tuple[float, Dict[str, float]]:
+        if self.latex:
+            return _score_resume_text(self._text, self.requirements)
+        format_score = _format_points(self.word_count, self.bullet_lines > 0, self._has_blank_line())
+        return _score_matches(self.compiled, self.found_terms(), format_score)
+
+    def snapshot(self) -> Dict:
+        score, breakdown = self.score()
+        found = self.found_terms()
+        return {
+            "version": self.version,
+            "ats_score": score,
+            "ats_breakdown": breakdown,
+            "missing_keywords": [k for k in self.compiled.keywords if k not in found],
+            "missing_skills": [s for s in self.compiled.required if s not in found],
+        }
+
+
+def apply_changes(session: LiveScoringSession, changes: Optional[List[Dict]]) -> None:
+    # Changes are applied in order, each against the result of the previous one
+    for change in changes or []:
+        session.apply_edit(int(change["start"]), int(change["end"]), change.get("text") or "")
@@ -0,0 +1,115 @@
+# Adaptive load shedding
+# Watches recent LLM latency and error rates and degrades new runs while the
+# provider is struggling, then steps back to normal once it recovers.
+
+import threading
+import time
+from typing import Dict, Any, Optional
+
+from config import settings
+from .nodes.llm_client import recent_llm_health
+from .tiers import FAST
+
+NORMAL = 0
+FEWER_ITERATIONS = 1
+CHEAPER_MODELS = 2
+SKIP_ANALYSIS = 3
+
+LEVEL_NAMES = {
+    NORMAL: "normal",
+    FEWER_ITERATIONS: "fewer_iterations",
+    CHEAPER_MODELS: "cheaper_models",
+    SKIP_ANALYSIS: "skip_analysis",
+}
+
+_LLM_NODES = [
+    "extract_requirements",
+    "analyze_resume",
+    "plan_improvements",
+    "modify_resume",
+    "write_cover_letter",
+]
+
+
+class LoadShedder:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.level = NORMAL
+        self.changed_at = time.monotonic()
+        self.last_health: Dict[str, Dict] = {}
+
+    def _pressure(self, health: Dict[str, Dict]) -> Optional[bool]:
+        # True when degraded, False when healthy with margin, None in between
+        if not health:
+            return False
+
+        worst_p95 = max((h["p95_seconds"] or 0.0) for h in health.values())
+        worst_errors = max(h["error_rate"] for h in health.values())
+
+        if worst_p95 > settings.LOAD_SHED_P95_SECONDS or worst_errors > settings.LOAD_SHED_ERROR_RATE:
+            return True
+        # Hysteresis: only recover once well below both thresholds
+        if worst_p95 < settings.LOAD_SHED_P95_SECONDS * 0.7 and worst_errors < settings.LOAD_SHED_ERROR_RATE / 2:
+            return False
+        return None
+
+    def evaluate(self) -> int:
+        health = recent_llm_health(
+            settings.LOAD_SHED_WINDOW_SECONDS,
+            min_samples=settings.LOAD_SHED_MIN_SAMPLES,
+        )
+        with self._lock:
+            self.last_health = health
+            if not settings.LOAD_SHEDDING_ENABLED:
+                self.level = NORMAL
+                return self.level
+
+            # Move at most one level per cooldown so a single spike cannot jump to the floor
+            now = time.monotonic()
+            if now - self.changed_at < settings.LOAD_SHED_COOLDOWN_SECONDS:
+                return self.level
+
+            pressure = self._pressure(health)
+            if pressure is True and self.level < SKIP_ANALYSIS:
+                self.level += 1
+                self.changed_at = now
+                print(f"[LOAD_SHED] Degrading to {LEVEL_NAMES[self.level]}")
+            elif pressure is False and self.level > NORMAL:
+                self.level -= 1
+                self.changed_at = now
+                print(f"[LOAD_SHED] Recovering to {LEVEL_NAMES[self.level]}")
+            return self.level
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "enabled": settings.LOAD_SHEDDING_ENABLED,
+                "level": self.level,
+                "level_name": LEVEL_NAMES[self.level],
+                "seconds_at_level": round(time.monotonic() - self.changed_at, 1),
+                "recent_health": self.last_health,
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self.level = NORMAL
+            self.changed_at = time.monotonic()
+            self.last_health = {}
+
+
+load_shedder = LoadShedder()
+
+
+def apply_degradation(state: Dict, level: int) -> Optional[str]:
+    # Adjust a fresh run state in place for the degradation level.
+    # Returns the tier whose compiled graph should run instead, if any.
+    state["degradation_level"] = level
+    if level >= FEWER_ITERATIONS:
+        state["max_iterations"] = min(int(state["max_iterations"]), 1)
+        state["modification_candidates"] = 1
+    if level >= CHEAPER_MODELS:
+        state["models"] = {node: settings.FAST_TIER_MODEL for node in _LLM_NODES}
+        state["cycle_estimate_seconds"] = settings.FAST_TIER_CYCLE_ESTIMATE_SECONDS
+    if level >= SKIP_ANALYSIS:
+        return FAST
+    return None
@@ -0,0 +1,124 @@
+# Vectorized ATS scoring for many resumes against many job postings
+# Resumes become a sparse resume x term presence matrix, postings become
+# term x posting count matrices, and the keyword/skills breakdown for the
+# whole cross product is two sparse matrix products. Each cell matches
+# _score_resume_text exactly: the float operations run in the same order and
+# rounding is done with Python's round when results are materialized.
+
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+from scipy import sparse
+
+from .keyword_matcher import compile_requirements, term_phrases, SECTION_KEYS
+from .latex_text import project_resume
+from .scoring import _format_score, _section_score
+from .text_index import build_index
+
+
+class BatchScores:
+    # Unrounded component scores, shape (resumes, postings)
+    def __init__(self, keywords: np.ndarray, skills: np.ndarray, format_: np.ndarray, sections: np.ndarray):
+        self.keywords = keywords
+        self.skills = skills
+        self.format = format_
+        self.sections = sections
+        # Same summation order as the scalar scorer so totals are bit-identical
+        self.totals = np.minimum(keywords + skills + format_ + sections, 100)
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return self.totals.shape
+
+    def result(self, resume: int, posting: int) -> Tuple[float, Dict[str, float]]:
+        # Same (total, breakdown) tuple _score_resume_text returns for this pair
+        breakdown = {
+            "keywords": round(float(self.keywords[resume, posting]), 2),
+            "skills": round(float(self.skills[resume, posting]), 2),
+            "format": round(float(self.format[resume, posting]), 2),
+            "sections": round(float(self.sections[resume, posting]), 2),
+        }
+        return round(float(self.totals[resume, posting]), 2), breakdown
+
+    def rounded_totals(self) -> List[List[float]]:
+        return [[round(float(v), 2) for v in row] for row in self.totals.tolist()]
+
+
+def _posting_matrix(term_lists: List[List[str]], vocab: Dict[str, int]) -> sparse.csc_matrix:
+    # term x posting counts; duplicate terms count twice, as in the scalar scorer
+    rows, cols = [], []
+    for posting, terms in enumerate(term_lists):
+        for term in terms:
+            rows.append(vocab[term])
+            cols.append(posting)
+    data = np.ones(len(rows), dtype=np.int64)
+    return sparse.csc_matrix((data, (rows, cols)), shape=(len(vocab), len(term_lists)), dtype=np.int64)
+
+
+def _ratio_points(matched: np.ndarray, totals: np.ndarray, points: int) -> np.ndarray:
+    # (matched / total) * points, 0 where the posting lists no terms
+    ratio = np.divide(matched, totals, out=np.zeros(matched.shape, dtype=np.float64), where=totals > 0)
+    return ratio * points
+
+
+def score_batch(resumes: Sequence[str], postings: Sequence[Dict]) -> BatchScores:
+    compiled = [compile_requirements(requirements) for requirements in postings]
+
+    vocab: Dict[str, int] = {}
+    # Group phrases by first token so each resume only checks terms it can contain;
+    # an any-of term is listed once per alternative under the same column
+    by_first_token: Dict[str, List[Tuple[int, Tuple[str, ...]]]] = {}
+
+    def add_term(term: str, phrases: List[Tuple[str, ...]]) -> None:
+        if term not in vocab:
+            vocab[term] = len(vocab)
+            for phrase in phrases:
+                if phrase:
+                    by_first_token.setdefault(phrase[0], []).append((vocab[term], phrase))
+
+    for item in compiled:
+        for term in item.keywords + item.required:
+            add_term(term, item.phrases[term])
+    for keys in SECTION_KEYS.values():
+        for term in keys:
+            add_term(term, term_phrases(term))
+
+    terms = list(vocab)
+    rows, cols = [], []
+    format_scores = np.zeros(len(resumes), dtype=np.float64)
+    section_scores = np.zeros(len(resumes), dtype=np.float64)
+    for row, resume_text in enumerate(resumes):
+        resume = project_resume(resume_text).text.lower()
+        index = build_index(resume)
+        found_columns = list({
+            column
+            for token in index.positions.keys() & by_first_token.keys()
+            for column, phrase in by_first_token[token]
+            if index.contains(phrase)
+        })
+        rows.extend([row] * len(found_columns))
+        cols.extend(found_columns)
+        format_scores[row] = _format_score(resume)
+        section_scores[row] = _section_score({terms[c] for c in found_columns})
+
+    presence = sparse.csr_matrix(
+        (np.ones(len(rows), dtype=np.int64), (rows, cols)),
+        shape=(len(resumes), len(vocab)),
+        dtype=np.int64,
+    )
+
+    keyword_matrix = _posting_matrix([item.keywords for item in compiled], vocab)
+    skill_matrix = _posting_matrix([item.required for item in compiled], vocab)
+
+    matched_keywords = (presence @ keyword_matrix).toarray()
+    matched_skills = (presence @ skill_matrix).toarray()
+    keyword_totals = np.asarray(keyword_matrix.sum(axis=0)).ravel()
+    skill_totals = np.asarray(skill_matrix.sum(axis=0)).ravel()
+
+    shape = (len(resumes), len(postings))
+    return BatchScores(
+        keywords=_ratio_points(matched_keywords, keyword_totals[np.newaxis, :], 40),
+        skills=_ratio_points(matched_skills, skill_totals[np.newaxis, :], 30),
+        format_=np.broadcast_to(format_scores[:, np.newaxis], shape),
+        sections=np.broadcast_to(section_scores[:, np.newaxis], shape),
+    )
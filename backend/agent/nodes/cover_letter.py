@@ -0,0 +1,62 @@
+from typing import Dict
+import json
+from .llm_client import create_chat_completion
+from config import settings
+
+
+def generate_cover_letter(state: Dict) -> Dict:
+    # Runs as a parallel branch next to the plan/modify/rescore loop.
+    # Only writes cover_letter so it never conflicts with the loop's updates.
+    if not state.get("generate_cover_letter"):
+        return {}
+
+    if state.get("fit_decision") == "poor_fit":
+        return {}
+
+    prompt = f"""You are an expert career coach.
+
+Write a concise, professional cover letter for the candidate below, tailored to the job.
+
+RULES:
+- 3 to 4 short paragraphs, under 350 words
+- Reference the most relevant strengths from the resume analysis
+- Use keywords from the job requirements naturally
+- Do NOT invent experience or skills the candidate doesn't have
+- Plain text only, no markdown, no placeholders for addresses
+
+Job Description:
+---
+{state["job_description"]}
+---
+
+Job Requirements:
+---
+{json.dumps(state.get("job_requirements") or {}, indent=2)}
+---
+
+Resume Analysis:
+---
+{json.dumps(state.get("resume_analysis") or {}, indent=2)}
+---
+
+Resume:
+---
+{state["original_resume"]}
+---
+
+Return ONLY the cover letter text."""
+
+    try:
+        response = create_chat_completion(
+            state,
+            "write_cover_letter",
+            model=settings.COVER_LETTER_MODEL,
+            messages=[{"role": "user", "content": prompt}],
+            temperature=0.4
+        )
+    except Exception as e:
+        # A failed cover letter should not fail the resume optimization
+        print(f"[COVER_LETTER] Generation failed: {e}")
+        return {}
+
+    return {"cover_letter": response.choices[0].message.content.strip()}
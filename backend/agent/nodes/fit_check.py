@@ -1,6 +1,19 @@
-from typing import Dict, List, Tuple
-import re
+from typing import Dict
 from config import settings
+from .keyword_matcher import compile_requirements
+from .latex_text import project_resume
+from .scoring import _match_spans
+from .text_index import build_index
+from ..relevance import corpus_stats
+
+
+def fit_settings() -> str:
+    # Settings the fit decision depends on, stored with each run so that
+    # changing one marks the stored runs for rescoring
+    return (
+        f"poor={settings.FIT_THRESHOLD_POOR};partial={settings.FIT_THRESHOLD_PARTIAL};"
+        f"relevance={settings.RELEVANCE_FIT_WEIGHT}@{settings.RELEVANCE_MIN_DOCUMENTS}"
+    )
 
 
 def _ratio(matched: int, total: int) -> float:
@@ -9,54 +22,50 @@ def _ratio(matched: int, total: int) -> float:
     return matched / total
 
 
-def _normalize_list(values: List[str]) -> List[str]:
-    return [str(v).strip().lower() for v in values if str(v).strip()]
-
-
-def _strip_latex(text: str) -> str:
-    """Remove LaTeX commands and formatting to get clean text for matching."""
-    # Remove comments
-    text = re.sub(r'%.*$', '', text, flags=re.MULTILINE)
-    # Remove common LaTeX commands but keep the text
-    text = re.sub(r'\\[a-zA-Z]+\*?\{([^}]*)\}', r'\1', text)
-    text = re.sub(r'\\[a-zA-Z]+\*?\s', ' ', text)
-    # Remove math mode delimiters
-    text = re.sub(r'\$\$?(.*?)\$\$?', r'\1', text)
-    # Remove special characters
-    text = re.sub(r'[\\{}\[\]~^_]', ' ', text)
-    # Clean up whitespace
-    text = re.sub(r'\s+', ' ', text)
-    return text.strip().lower()
-
-
-def assess_job_fit(state: Dict) -> Dict:
+def assess_job_fit(state: Dict, with_spans: bool = False, quiet: bool = False) -> Dict:
     # Check if the resume is a good match for the job
     # Using simple keyword matching (no LLM needed) to save tokens
+    # quiet=True skips the debug lines for per-keystroke and bulk callers
     requirements = state.get("job_requirements") or {}
     resume_raw = state.get("original_resume") or ""
     
-    # Strip LaTeX formatting if present
-    resume = _strip_latex(resume_raw)
+    # Shared projection, cached so scoring reuses the same plain text
+    projection = project_resume(resume_raw)
+    resume = projection.text
     
-    required = _normalize_list(requirements.get("required_skills", []))
-    preferred = _normalize_list(requirements.get("preferred_skills", []))
-    keywords = _normalize_list(requirements.get("key_keywords", []))
+    # Requirement terms are compiled once per run and matched in a single pass
+    compiled = compile_requirements(requirements)
+    if with_spans:
+        found = compiled.locate_in_index(build_index(resume))
+    else:
+        found = compiled.find(resume)
+    required = compiled.required
+    preferred = compiled.preferred
+    keywords = compiled.keywords
 
-    matched_required = [s for s in required if s in resume]
-    matched_preferred = [s for s in preferred if s in resume]
-    matched_keywords = [k for k in keywords if k in resume]
+    matched_required = [s for s in required if s in found]
+    matched_preferred = [s for s in preferred if s in found]
+    matched_keywords = [k for k in keywords if k in found]
 
     required_ratio = _ratio(len(matched_required), len(required))
     keyword_ratio = _ratio(len(matched_keywords), len(keywords))
     preferred_ratio = _ratio(len(matched_preferred), len(preferred))
 
     fit_score = round((required_ratio * 0.6) + (keyword_ratio * 0.3) + (preferred_ratio * 0.1), 3)
+
+    # Blend in corpus-weighted relevance once enough runs back the statistics
+    relevance_score = corpus_stats.relevance(requirements, resume)
+    if corpus_stats.document_count >= settings.RELEVANCE_MIN_DOCUMENTS:
+        weight = settings.RELEVANCE_FIT_WEIGHT
+        fit_score = round(fit_score * (1 - weight) + relevance_score * weight, 3)
     
     # Debug logging
-    print(f"[FIT_CHECK] Required: {len(matched_required)}/{len(required)} ({required_ratio:.2f})")
-    print(f"[FIT_CHECK] Keywords: {len(matched_keywords)}/{len(keywords)} ({keyword_ratio:.2f})")
-    print(f"[FIT_CHECK] Preferred: {len(matched_preferred)}/{len(preferred)} ({preferred_ratio:.2f})")
-    print(f"[FIT_CHECK] Final Fit Score: {fit_score}")
+    if not quiet:
+        print(f"[FIT_CHECK] Required: {len(matched_required)}/{len(required)} ({required_ratio:.2f})")
+        print(f"[FIT_CHECK] Keywords: {len(matched_keywords)}/{len(keywords)} ({keyword_ratio:.2f})")
+        print(f"[FIT_CHECK] Preferred: {len(matched_preferred)}/{len(preferred)} ({preferred_ratio:.2f})")
+        print(f"[FIT_CHECK] Relevance: {relevance_score}")
+        print(f"[FIT_CHECK] Final Fit Score: {fit_score}")
 
     if fit_score < settings.FIT_THRESHOLD_POOR:
         fit_decision = "poor_fit"
@@ -75,16 +84,21 @@ def assess_job_fit(state: Dict) -> Dict:
         "action": "assessed_role_fit",
         "fit_decision": fit_decision,
         "fit_score": fit_score,
+        "relevance_score": relevance_score,
         "matched_required_count": len(matched_required),
         "required_count": len(required),
     }
 
     status = "rejected_poor_fit" if fit_decision == "poor_fit" else "processing"
 
-    return {
+    result = {
         "fit_decision": fit_decision,
         "fit_reason": reason,
         "fit_confidence": fit_confidence,
+        "relevance_score": relevance_score,
         "status": status,
         "decision_log": state.get("decision_log", []) + [decision],
     }
+    if with_spans:
+        result["match_spans_before"] = _match_spans(compiled, found, projection)
+    return result
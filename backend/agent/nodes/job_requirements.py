@@ -1,13 +1,65 @@
-from typing import Dict
+from typing import Dict, Optional
+import hashlib
 import json
-from .llm_client import build_groq_client
+import threading
+from collections import OrderedDict
+from .llm_client import create_chat_completion
+from .local_requirements import extract_requirements_locally
 from config import settings
 
+_CACHE_SIZE = 1024
+
+# Extracted requirements by job description hash, reused by later runs and /score
+_requirements_cache: "OrderedDict[str, Dict]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def _job_key(job_description: str) -> str:
+    normalized = " ".join((job_description or "").split()).lower()
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+def get_cached_requirements(job_description: str) -> Optional[Dict]:
+    key = _job_key(job_description)
+    with _cache_lock:
+        requirements = _requirements_cache.get(key)
+        if requirements is not None:
+            _requirements_cache.move_to_end(key)
+        return requirements
+
+
+def cache_requirements(job_description: str, requirements: Dict) -> None:
+    key = _job_key(job_description)
+    with _cache_lock:
+        _requirements_cache[key] = requirements
+        _requirements_cache.move_to_end(key)
+        if len(_requirements_cache) > _CACHE_SIZE:
+            _requirements_cache.popitem(last=False)
+
 
 def extract_job_requirements(state: Dict) -> Dict:
-    client = build_groq_client(state)
-    
     job_description = state["job_description"]
+
+    cached = get_cached_requirements(job_description)
+    if cached is not None:
+        print("[JOB_REQUIREMENTS] Using cached requirements")
+        return {"job_requirements": cached}
+
+    # Well-structured postings are parsed locally; the LLM handles the rest
+    if settings.LOCAL_REQUIREMENTS_ENABLED:
+        local, confidence = extract_requirements_locally(job_description)
+        if confidence >= settings.LOCAL_REQUIREMENTS_MIN_CONFIDENCE:
+            print(f"[JOB_REQUIREMENTS] Extracted locally (confidence {confidence})")
+            cache_requirements(job_description, local)
+            decision = {
+                "node": "extract_requirements",
+                "action": "extracted_locally",
+                "confidence": confidence,
+            }
+            return {
+                "job_requirements": local,
+                "decision_log": state.get("decision_log", []) + [decision],
+            }
     
     prompt = f"""Extract structured requirements from this job description:
 
@@ -21,7 +73,10 @@ Return JSON with:
 
 Return ONLY valid JSON, no other text."""
 
-    response = client.chat.completions.create(
+    response = create_chat_completion(
+        state,
+        "extract_requirements",
+        hedge=True,
         model=settings.JOB_REQUIREMENTS_MODEL,
         messages=[{"role": "user", "content": prompt}],
         temperature=0
@@ -36,5 +91,6 @@ Return ONLY valid JSON, no other text."""
         content = content.split("```")[1].split("```")[0].strip()
     
     requirements = json.loads(content)
+    cache_requirements(job_description, requirements)
     
     return {"job_requirements": requirements}
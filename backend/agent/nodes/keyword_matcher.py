@@ -0,0 +1,101 @@
+# Keyword matching shared by scoring and fit check
+# Requirement terms are compiled once into token tuples; a resume is tokenized
+# once into a positional index and every term becomes an index lookup.
+
+import json
+import re
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Set, Tuple
+
+from .skill_aliases import alias_version
+from .text_index import build_index, term_tokens, TextIndex
+
+# Section headings looked for by the ATS scorer
+SECTION_KEYS = {
+    "experience": ["experience", "work history"],
+    "skills": ["skills", "technical skills"],
+    "education": ["education", "degree"],
+    "summary": ["summary", "profile", "objective"],
+}
+
+_CACHE_SIZE = 256
+
+# "django or fastapi" is one requirement met by either alternative
+_ANY_OF_RE = re.compile(r"\s+or\s+")
+
+
+def normalize_terms(values: Iterable) -> List[str]:
+    return [str(v).strip().lower() for v in values or [] if str(v).strip()]
+
+
+def term_phrases(term: str) -> List[Tuple[str, ...]]:
+    # Token tuples of a term's alternatives; a plain term has exactly one
+    phrases = [term_tokens(part) for part in _ANY_OF_RE.split(term) if part.strip()]
+    phrases = [phrase for phrase in phrases if phrase]
+    return phrases if len(phrases) > 1 else [term_tokens(term)]
+
+
+class CompiledRequirements:
+    # Normalized requirement lists plus the token tuples of every term's alternatives
+    def __init__(self, requirements: Dict):
+        requirements = requirements or {}
+        self.required = normalize_terms(requirements.get("required_skills"))
+        self.preferred = normalize_terms(requirements.get("preferred_skills"))
+        self.keywords = normalize_terms(requirements.get("key_keywords"))
+        section_terms = [k for keys in SECTION_KEYS.values() for k in keys]
+
+        self.phrases: Dict[str, List[Tuple[str, ...]]] = {}
+        for term in self.required + self.preferred + self.keywords + section_terms:
+            if term not in self.phrases:
+                self.phrases[term] = term_phrases(term)
+
+    def find_in_index(self, index: TextIndex) -> Set[str]:
+        return {
+            term for term, phrases in self.phrases.items()
+            if any(index.contains(phrase) for phrase in phrases)
+        }
+
+    def locate_in_index(self, index: TextIndex) -> Dict[str, List[Tuple[int, int]]]:
+        # Same lookups as find_in_index, keeping the (start, end) of every match
+        located = {}
+        for term, phrases in self.phrases.items():
+            spans = [
+                index.phrase_span(position, phrase)
+                for phrase in phrases
+                for position in index.find_positions(phrase)
+            ]
+            if spans:
+                located[term] = sorted(spans)
+        return located
+
+    def find(self, text: str) -> Set[str]:
+        # All terms present in text on token boundaries
+        return self.find_in_index(build_index(text))
+
+
+_cache: "OrderedDict[str, CompiledRequirements]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def _fingerprint(requirements: Dict) -> str:
+    # Includes the alias version so terms are recompiled after an alias reload
+    return f"{alias_version()}:" + json.dumps(requirements or {}, sort_keys=True, default=str)
+
+
+def compile_requirements(requirements: Dict) -> CompiledRequirements:
+    # Compiled once per job_requirements and reused by check_fit, score_initial
+    # and every score_modified iteration of the run
+    key = _fingerprint(requirements)
+    with _cache_lock:
+        compiled = _cache.get(key)
+        if compiled is not None:
+            _cache.move_to_end(key)
+            return compiled
+
+    compiled = CompiledRequirements(requirements)
+    with _cache_lock:
+        _cache[key] = compiled
+        if len(_cache) > _CACHE_SIZE:
+            _cache.popitem(last=False)
+    return compiled
@@ -0,0 +1,226 @@
+# Plain-text projection of LaTeX resumes for scoring and fit checks
+# A single left-to-right scan drops the preamble, comments and command names,
+# keeps argument text, turns \item into bullets and records section headings.
+# Each projected character remembers its source offset so matches can be
+# highlighted in the LaTeX the user edits.
+# Projections are memoized by content hash so each document is projected once.
+
+import hashlib
+import re
+import threading
+from array import array
+from collections import OrderedDict
+from typing import List, NamedTuple, Optional, Sequence, Tuple
+
+_COMMAND_RE = re.compile(r"[A-Za-z]+\*?")
+_LATEX_MARKERS_RE = re.compile(r"\\(documentclass|begin\{|section|item\b|textbf\{|usepackage)")
+_PLAIN_HEADING_RE = re.compile(r"^\s*([A-Z][A-Za-z/& ]{2,40}):?\s*$")
+_SPACES_RE = re.compile(r"[ \t]+")
+_LINE_SPACES_RE = re.compile(r" *\n *")
+_BLANK_LINES_RE = re.compile(r"\n{3,}")
+_SPLIT_LIST_RE = re.compile(r"\n\n- ")
+
+# Headings that start a new section of the document
+_SECTION_COMMANDS = {"section", "section*", "subsection", "subsection*", "chapter", "chapter*"}
+
+# Commands whose arguments are layout or metadata, not resume content
+_DROP_ARGUMENT_COMMANDS = {
+    "usepackage", "documentclass", "vspace", "vspace*", "hspace", "hspace*", "setlength",
+    "addtolength", "newcommand", "renewcommand", "label", "ref", "pagestyle", "thispagestyle",
+    "titleformat", "titlespacing", "titlespacing*", "setlist", "geometry", "color", "definecolor",
+    "fontsize", "hypersetup", "includegraphics", "begin", "end",
+}
+
+_LINE_BREAK_COMMANDS = {"newline", "linebreak", "par", "bigskip", "medskip", "smallskip"}
+
+_CACHE_SIZE = 256
+
+
+class Projection(NamedTuple):
+    text: str
+    sections: List[str]
+    # Source offset of each character of text; None when text is the source itself
+    offsets: Optional[Sequence[int]] = None
+
+    def source_span(self, start: int, end: int) -> Tuple[int, int]:
+        # Maps a [start, end) range of text back to the original document
+        if self.offsets is None:
+            return start, end
+        return self.offsets[start], self.offsets[end - 1] + 1
+
+
+def looks_like_latex(text: str) -> bool:
+    return bool(_LATEX_MARKERS_RE.search(text or ""))
+
+
+def _skip_group(text: str, i: int, open_ch: str, close_ch: str) -> int:
+    # Index just past the balanced group starting at text[i] == open_ch
+    depth = 0
+    n = len(text)
+    while i < n:
+        ch = text[i]
+        if ch == "\\":
+            i += 2
+            continue
+        if ch == open_ch:
+            depth += 1
+        elif ch == close_ch:
+            depth -= 1
+            if depth == 0:
+                return i + 1
+        i += 1
+    return n
+
+
+def _read_group(text: str, i: int) -> str:
+    end = _skip_group(text, i, "{", "}")
+    return text[i + 1:end - 1]
+
+
+def _sub_tracked(pattern: "re.Pattern", repl: str, text: str, offsets: List[int]) -> Tuple[str, List[int]]:
+    # re.sub that keeps the per-character offset map aligned with the text
+    pieces: List[str] = []
+    kept: List[int] = []
+    last = 0
+    for match in pattern.finditer(text):
+        start = match.start()
+        pieces.append(text[last:start])
+        kept.extend(offsets[last:start])
+        pieces.append(repl)
+        kept.extend([offsets[start]] * len(repl))
+        last = match.end()
+    if not pieces:
+        return text, offsets
+    pieces.append(text[last:])
+    kept.extend(offsets[last:])
+    return "".join(pieces), kept
+
+
+def _project_latex(source: str, base: int = 0) -> Projection:
+    begin = source.find("\\begin{document}")
+    if begin != -1:
+        base += begin + len("\\begin{document}")
+        source = source[begin + len("\\begin{document}"):]
+    end = source.find("\\end{document}")
+    if end != -1:
+        source = source[:end]
+
+    out: List[str] = []
+    # Source offset of every character appended to out
+    offsets: List[int] = []
+    sections: List[str] = []
+    i = 0
+    n = len(source)
+    while i < n:
+        ch = source[i]
+
+        if ch == "%":
+            newline = source.find("\n", i)
+            i = n if newline == -1 else newline
+            continue
+
+        if ch == "\\":
+            if i + 1 >= n:
+                break
+            nxt = source[i + 1]
+            if nxt == "\\":
+                out.append("\n")
+                offsets.append(base + i)
+                i += 2
+                continue
+            match = _COMMAND_RE.match(source, i + 1)
+            if not match:
+                # Escaped character such as \& or \%
+                if nxt not in "{}":
+                    out.append(nxt)
+                    offsets.append(base + i + 1)
+                i += 2
+                continue
+
+            name = match.group()
+            command_at = base + i
+            i = match.end()
+            while i < n and source[i] == "[":
+                i = _skip_group(source, i, "[", "]")
+
+            if name in _SECTION_COMMANDS and i < n and source[i] == "{":
+                title = _project_latex(_read_group(source, i), base + i + 1)
+                sections.append(title.text)
+                out.extend(("\n\n", title.text, "\n"))
+                offsets.extend((command_at, command_at))
+                offsets.extend(title.offsets)
+                offsets.append(command_at)
+                i = _skip_group(source, i, "{", "}")
+            elif name in _DROP_ARGUMENT_COMMANDS:
+                while i < n and source[i] in "{[":
+                    i = _skip_group(source, i, source[i], "}" if source[i] == "{" else "]")
+                out.append("\n" if name in ("begin", "end") else " ")
+                offsets.append(command_at)
+            elif name == "href" and i < n and source[i] == "{":
+                # Keep the link text, drop the URL
+                i = _skip_group(source, i, "{", "}")
+            elif name == "item":
+                out.append("\n- ")
+                offsets.extend((command_at, command_at, command_at))
+            elif name in _LINE_BREAK_COMMANDS:
+                out.append("\n")
+                offsets.append(command_at)
+            elif i < n and source[i] != "{":
+                # Formatting command: its braced arguments stay as plain text
+                out.append(" ")
+                offsets.append(command_at)
+            continue
+
+        if ch == "}" and i + 1 < n and source[i + 1] == "{":
+            # Arguments of one macro, \resumeItem{Skills}{Python}, stay separate words
+            out.append(" ")
+            offsets.append(base + i)
+            i += 1
+            continue
+
+        if ch in "{}$":
+            i += 1
+            continue
+
+        out.append(" " if ch == "~" else ch)
+        offsets.append(base + i)
+        i += 1
+
+    text = "".join(out)
+    # Collapse runs of spaces but keep paragraph breaks for the format score
+    text, offsets = _sub_tracked(_SPACES_RE, " ", text, offsets)
+    text, offsets = _sub_tracked(_LINE_SPACES_RE, "\n", text, offsets)
+    text, offsets = _sub_tracked(_BLANK_LINES_RE, "\n\n", text, offsets)
+    # Consecutive items form one list, not separate paragraphs
+    text, offsets = _sub_tracked(_SPLIT_LIST_RE, "\n- ", text, offsets)
+
+    stripped = text.strip()
+    lead = len(text) - len(text.lstrip())
+    return Projection(stripped, sections, array("l", offsets[lead:lead + len(stripped)]))
+
+
+def _project_plain(source: str) -> Projection:
+    sections = [m.group(1).strip() for m in map(_PLAIN_HEADING_RE.match, source.splitlines()) if m]
+    return Projection(source, sections)
+
+
+_cache: "OrderedDict[str, Projection]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def project_resume(text: str) -> Projection:
+    # Plain text passes through unchanged; LaTeX is projected to its content
+    text = text or ""
+    key = hashlib.sha1(text.encode("utf-8")).hexdigest()
+    with _cache_lock:
+        cached = _cache.get(key)
+        if cached is not None:
+            _cache.move_to_end(key)
+            return cached
+
+    projection = _project_latex(text) if looks_like_latex(text) else _project_plain(text)
+    with _cache_lock:
+        _cache[key] = projection
+        if len(_cache) > _CACHE_SIZE:
+            _cache.popitem(last=False)
+    return projection
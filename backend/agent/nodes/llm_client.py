@@ -1,6 +1,12 @@
-from typing import Dict
+from typing import Dict, Optional
+import math
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from openai import OpenAI
 from config import settings
+from ..deadline import DeadlineExceeded, request_timeout
 
 
 def build_groq_client(state: Dict) -> OpenAI:
@@ -10,4 +16,201 @@ def build_groq_client(state: Dict) -> OpenAI:
     return OpenAI(
         api_key=api_key,
         base_url="https://api.groq.com/openai/v1",
+        # Under a run deadline a retry would overrun the remaining budget
+        max_retries=0 if state.get("deadline_at") else 2,
     )
+
+
+class _NodeStats:
+    # Rolling latency window plus counters for one node
+    def __init__(self, window: int):
+        self.latencies = deque(maxlen=window)
+        # (timestamp, seconds, error) for time-bounded health checks
+        self.recent = deque(maxlen=window)
+        self.calls = 0
+        self.errors = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+
+
+_stats: Dict[str, _NodeStats] = {}
+_stats_lock = threading.Lock()
+_hedge_executor = ThreadPoolExecutor(
+    max_workers=settings.LLM_HEDGE_MAX_WORKERS,
+    thread_name_prefix="llm-hedge",
+)
+
+
+def _node_stats(node: str) -> _NodeStats:
+    stats = _stats.get(node)
+    if stats is None:
+        stats = _stats.setdefault(node, _NodeStats(settings.LLM_LATENCY_WINDOW))
+    return stats
+
+
+def record_llm_call(node: str, seconds: float, error: bool = False) -> None:
+    with _stats_lock:
+        stats = _node_stats(node)
+        stats.calls += 1
+        stats.recent.append((time.monotonic(), seconds, error))
+        if error:
+            stats.errors += 1
+        else:
+            stats.latencies.append(seconds)
+
+
+def _percentile(values, pct: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def latency_percentile(node: str, pct: float, min_samples: int = 1) -> Optional[float]:
+    with _stats_lock:
+        stats = _stats.get(node)
+        if stats is None or len(stats.latencies) < min_samples:
+            return None
+        return _percentile(list(stats.latencies), pct)
+
+
+def get_llm_stats() -> Dict[str, Dict]:
+    # Snapshot of per-node latency, error and hedging counters
+    with _stats_lock:
+        snapshot = {}
+        for node, stats in _stats.items():
+            latencies = list(stats.latencies)
+            snapshot[node] = {
+                "calls": stats.calls,
+                "errors": stats.errors,
+                "error_rate": round(stats.errors / stats.calls, 4) if stats.calls else 0.0,
+                "p50_seconds": _percentile(latencies, 50),
+                "p95_seconds": _percentile(latencies, 95),
+                "hedged": stats.hedged,
+                "hedge_rate": round(stats.hedged / stats.calls, 4) if stats.calls else 0.0,
+                "hedge_wins": stats.hedge_wins,
+                "hedge_win_rate": round(stats.hedge_wins / stats.hedged, 4) if stats.hedged else 0.0,
+            }
+        return snapshot
+
+
+def recent_llm_health(horizon_seconds: float, min_samples: int = 1) -> Dict[str, Dict]:
+    # p95 latency and error rate per node over the last horizon_seconds
+    cutoff = time.monotonic() - horizon_seconds
+    with _stats_lock:
+        health = {}
+        for node, stats in _stats.items():
+            window = [entry for entry in stats.recent if entry[0] >= cutoff]
+            if len(window) < min_samples:
+                continue
+            errors = sum(1 for _, _, error in window if error)
+            health[node] = {
+                "samples": len(window),
+                "p95_seconds": _percentile([s for _, s, error in window if not error], 95),
+                "error_rate": errors / len(window),
+            }
+        return health
+
+
+def reset_llm_stats() -> None:
+    with _stats_lock:
+        _stats.clear()
+
+
+def _timed_call(client: OpenAI, kwargs: Dict, running: Optional[threading.Event] = None):
+    if running is not None:
+        running.set()
+    started = time.monotonic()
+    response = client.chat.completions.create(**kwargs)
+    return response, time.monotonic() - started
+
+
+def _close_quietly(client: OpenAI) -> None:
+    # Closing the HTTP client aborts a request still in flight on it
+    try:
+        client.close()
+    except Exception:
+        pass
+
+
+def _hedged_call(state: Dict, node: str, primary_client: OpenAI, hedge_after: float, kwargs: Dict):
+    running = threading.Event()
+    primary = _hedge_executor.submit(_timed_call, primary_client, kwargs, running)
+
+    # The hedge window starts when the request is sent; time queued behind a busy
+    # pool must not trigger duplicates exactly when the pool is saturated
+    running.wait()
+    done, _ = wait([primary], timeout=hedge_after)
+    if done:
+        return primary.result()
+
+    # The duplicate only gets what is left of the run deadline
+    backup_kwargs = dict(kwargs)
+    try:
+        timeout = request_timeout(state)
+    except DeadlineExceeded:
+        return primary.result()
+    if timeout is not None:
+        backup_kwargs["timeout"] = timeout
+
+    # Primary is slower than the node's p95: race a duplicate request
+    backup_client = build_groq_client(state)
+    backup = _hedge_executor.submit(_timed_call, backup_client, backup_kwargs)
+    with _stats_lock:
+        _node_stats(node).hedged += 1
+
+    clients = {primary: primary_client, backup: backup_client}
+    pending = {primary, backup}
+    error = None
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            if future.exception() is not None:
+                error = future.exception()
+                continue
+            for loser in pending:
+                loser.cancel()
+                _close_quietly(clients[loser])
+            if future is backup:
+                with _stats_lock:
+                    _node_stats(node).hedge_wins += 1
+            response, seconds = future.result()
+            # Latency is measured from the original request, not the duplicate
+            if future is backup:
+                seconds += hedge_after
+            return response, seconds
+
+    raise error
+
+
+def create_chat_completion(state: Dict, node: str, hedge: bool = False, **kwargs):
+    # Single entry point for LLM calls so every node feeds the latency stats.
+    # hedge=True is only safe for idempotent calls: a duplicate request is sent
+    # when the first one has not answered by the node's observed p95.
+    # Per-run model overrides and token budgets (latency tiers) are applied here.
+    kwargs["model"] = (state.get("models") or {}).get(node) or kwargs.get("model")
+    if state.get("max_tokens") and "max_tokens" not in kwargs:
+        kwargs["max_tokens"] = int(state["max_tokens"])
+
+    timeout = request_timeout(state)
+    if timeout is not None:
+        kwargs["timeout"] = timeout
+
+    hedge_after = None
+    if hedge and settings.LLM_HEDGING_ENABLED:
+        hedge_after = latency_percentile(node, 95, min_samples=settings.LLM_HEDGE_MIN_SAMPLES)
+
+    client = build_groq_client(state)
+    started = time.monotonic()
+    try:
+        if hedge_after is not None:
+            response, seconds = _hedged_call(state, node, client, hedge_after, kwargs)
+        else:
+            response, seconds = _timed_call(client, kwargs)
+    except Exception:
+        record_llm_call(node, time.monotonic() - started, error=True)
+        raise
+
+    record_llm_call(node, seconds)
+    return response
@@ -0,0 +1,85 @@
+# Deterministic resume analysis built from matcher output
+# Strengths, gaps and missing keywords follow directly from which requirement
+# terms and sections the resume contains, so most runs skip the analyze_resume
+# LLM call. The LLM is only used when narrative suggestions are requested.
+
+from typing import Dict, List
+
+from .keyword_matcher import compile_requirements, SECTION_KEYS
+from .latex_text import project_resume
+from .scoring import BULLET_CHARS
+
+
+def _dedupe(values: List[str]) -> List[str]:
+    return list(dict.fromkeys(values))
+
+
+def _joined(values: List[str]) -> str:
+    return ", ".join(values)
+
+
+def build_resume_analysis(resume: str, requirements: Dict) -> Dict:
+    text = project_resume(resume).text.lower()
+    compiled = compile_requirements(requirements)
+    found = compiled.find(text)
+
+    matched_required = _dedupe([s for s in compiled.required if s in found])
+    missing_required = _dedupe([s for s in compiled.required if s not in found])
+    matched_preferred = _dedupe([s for s in compiled.preferred if s in found])
+    missing_preferred = _dedupe([s for s in compiled.preferred if s not in found])
+    missing_keywords = _dedupe(missing_required + [k for k in compiled.keywords if k not in found])
+
+    present_sections = [name for name, keys in SECTION_KEYS.items() if any(k in found for k in keys)]
+    absent_sections = [name for name in SECTION_KEYS if name not in present_sections]
+    word_count = len(text.split())
+    has_bullets = any(c in text for c in BULLET_CHARS)
+
+    strengths, weaknesses, suggestions = [], [], []
+
+    if matched_required:
+        strengths.append(
+            f"Covers {len(matched_required)} of {len(_dedupe(compiled.required))} required skills: "
+            f"{_joined(matched_required)}"
+        )
+    if matched_preferred:
+        strengths.append(f"Includes preferred skills: {_joined(matched_preferred)}")
+    if present_sections:
+        strengths.append(f"Has clear sections: {_joined(present_sections)}")
+
+    if missing_required:
+        weaknesses.append(f"Missing required skills: {_joined(missing_required)}")
+        suggestions.append(
+            f"Mention {_joined(missing_required)} in Experience or Skills where you have used them"
+        )
+    if missing_preferred:
+        weaknesses.append(f"Missing preferred skills: {_joined(missing_preferred)}")
+    if absent_sections:
+        weaknesses.append(f"No {_joined(absent_sections)} section")
+        suggestions.append(f"Add a {_joined(absent_sections)} section")
+    if word_count < 300:
+        weaknesses.append(f"Resume is short ({word_count} words)")
+        suggestions.append("Expand experience entries with concrete outcomes")
+    elif word_count > 1000:
+        weaknesses.append(f"Resume is long ({word_count} words)")
+        suggestions.append("Trim older or less relevant experience")
+    if not has_bullets:
+        weaknesses.append("Experience is not written as bullet points")
+        suggestions.append("Use bullet points for achievements")
+
+    return {
+        "strengths": strengths,
+        "weaknesses": weaknesses,
+        "missing_keywords": missing_keywords,
+        "suggestions": suggestions,
+        "matched_skills": matched_required,
+        "analysis_mode": "local",
+    }
+
+
+def analyze_resume_locally(state: Dict) -> Dict:
+    return {
+        "resume_analysis": build_resume_analysis(
+            state.get("original_resume") or "",
+            state.get("job_requirements") or {},
+        )
+    }
@@ -0,0 +1,261 @@
+# Requirement extraction without an LLM
+# Detects "Requirements:" / "Nice to have:" style headings, finds skills with a
+# token trie built from the skills dictionary and reads the minimum years of
+# experience. Lines are split into list items ("Python, Go" or "Django or
+# FastAPI"); an "X or Y" item becomes one any-of requirement. The confidence
+# value says how well the posting fit this pattern; extract_job_requirements
+# only skips the LLM when it is high.
+
+import re
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from .latex_text import project_resume
+from .skill_aliases import alias_version, get_alias_index
+from .text_index import term_tokens, tokenize
+
+# Skills recognized in job descriptions, in addition to the canonical alias names
+KNOWN_SKILLS = [
+    "python", "java", "kotlin", "scala", "rust", "ruby", "php", "swift",
+    "sql", "nosql", "mysql", "redis", "kafka", "spark", "hadoop", "airflow", "dbt", "snowflake",
+    "docker", "terraform", "ansible", "jenkins", "git", "linux", "bash",
+    "django", "flask", "fastapi", "spring", "spring boot", "rails", "ruby on rails",
+    "angular", "next.js", "graphql", "rest", "rest api",
+    "html", "css", "tailwind", "redux",
+    "pandas", "numpy", "pytorch", "tensorflow", "deep learning", "computer vision", "llm",
+    "data analysis", "data engineering", "data pipelines", "etl", "statistics", "tableau", "power bi", "excel",
+    "microservices", "distributed systems", "system design", "api design", "unit testing", "agile", "scrum",
+    "communication", "leadership", "mentoring", "stakeholder management", "project management",
+]
+
+# Skill names that are also everyday words ("go the extra mile", "excel at",
+# "spring launch"); only counted when they make up a whole list item
+AMBIGUOUS_SKILLS = {"go", "rest", "swift", "spring", "excel", "rails", "spark", "flask", "dbt"}
+
+REQUIRED = "required"
+PREFERRED = "preferred"
+OTHER = "other"
+
+# Checked in order; preferred cues first so "Preferred qualifications" is not "required"
+_HEADING_CUES = [
+    (PREFERRED, ("nice to have", "nice-to-have", "preferred", "bonus", "good to have", "desired", "a plus")),
+    (REQUIRED, ("requirement", "qualification", "must have", "must-have", "you have", "you bring",
+                "you need", "you'll need", "looking for", "skills", "experience", "what we need")),
+]
+_PREFERRED_LINE_CUES = ("nice to have", "a plus", "is a bonus", "preferred", "ideally")
+
+_BULLET_RE = re.compile(r"^\s*(?:[-*•·▪]|\d+[.)])\s+")
+_YEARS_RE = re.compile(r"(\d{1,2})\s*\+?\s*(?:-\s*\d{1,2}\s*)?(?:years?|yrs?)\b", re.IGNORECASE)
+_MAX_HEADING_WORDS = 5
+_ITEM_SPLIT_RE = re.compile(r"[,;|]|\s+(?:and|&)\s+", re.IGNORECASE)
+_ANY_OF_RE = re.compile(r"\s+or\s+", re.IGNORECASE)
+_MAX_TITLE_WORDS = 6
+# Title words that say nothing about the role's content
+_TITLE_STOPWORDS = {"senior", "junior", "lead", "staff", "principal", "mid", "level", "sr", "jr",
+                    "the", "and", "of", "for", "with", "in", "at", "to", "a", "an", "remote", "hybrid"}
+
+
+class SkillTrie:
+    # Token-level trie: longest skill starting at each token in one pass
+    def __init__(self, skills: List[str]):
+        self.root: Dict = {}
+        for skill in skills:
+            node = self.root
+            tokens = term_tokens(skill)
+            if not tokens:
+                continue
+            for token in tokens:
+                node = node.setdefault(token, {})
+            node.setdefault(None, skill)
+
+    def find(self, tokens: List[str]) -> List[str]:
+        found = []
+        i = 0
+        while i < len(tokens):
+            node = self.root
+            match, length = None, 0
+            for j in range(i, len(tokens)):
+                node = node.get(tokens[j])
+                if node is None:
+                    break
+                if None in node:
+                    match, length = node[None], j - i + 1
+            if match:
+                found.append(match)
+                i += length
+            else:
+                i += 1
+        return found
+
+
+_trie_lock = threading.Lock()
+_trie: Optional[Tuple[int, SkillTrie]] = None
+
+
+def get_skill_trie() -> SkillTrie:
+    # Rebuilt when the alias table changes, since skills are stored as aliased tokens
+    global _trie
+    version = alias_version()
+    with _trie_lock:
+        if _trie is None or _trie[0] != version:
+            skills = []
+            for skill in get_alias_index().canonical_names + KNOWN_SKILLS:
+                if skill not in skills:
+                    skills.append(skill)
+            _trie = (version, SkillTrie(skills))
+        return _trie[1]
+
+
+def extract_experience_years(text: str) -> Optional[int]:
+    years = [int(m.group(1)) for m in _YEARS_RE.finditer(text or "")]
+    return min(years) if years else None
+
+
+def _classify(label: str) -> Optional[str]:
+    label = label.strip().lower()
+    for kind, cues in _HEADING_CUES:
+        if any(cue in label for cue in cues):
+            return kind
+    return None
+
+
+def _split_heading(line: str, trie: SkillTrie) -> Tuple[Optional[str], str]:
+    # (section kind, rest of line) for heading lines such as "Requirements:" or
+    # "Nice to have: Docker, Kubernetes"; (None, line) otherwise
+    text = line.strip().strip("#*_").strip()
+    if not text or _BULLET_RE.match(line):
+        return None, line
+
+    label, colon, rest = text.partition(":")
+    if colon and len(label.split()) <= _MAX_HEADING_WORDS:
+        kind = _classify(label)
+        if kind:
+            return kind, rest
+        # "Responsibilities:" starts an unrelated section; "Languages: Go" does not
+        return (OTHER, "") if not rest.strip() else (None, rest)
+    if len(text.split()) <= _MAX_HEADING_WORDS:
+        kind = _classify(text)
+        # "Python experience" is a requirement line, not a heading
+        if kind and not trie.find([token for token, _, _ in tokenize(text.lower())]):
+            return kind, ""
+    return None, line
+
+
+def _item_tokens(text: str) -> Tuple[str, ...]:
+    return tuple(token for token, _, _ in tokenize(text.lower()))
+
+
+def _find_skills(line: str, trie: SkillTrie) -> List[str]:
+    # Skills named in a line, one entry per list item; alternatives joined by
+    # "or" within an item stay together as a single any-of requirement
+    text = _BULLET_RE.sub("", line)
+    label, colon, rest = text.partition(":")
+    if colon and len(label.split()) <= _MAX_HEADING_WORDS:
+        # "Languages: Go, Rust" lists the part after the label
+        text = rest
+
+    found = []
+    for item in _ITEM_SPLIT_RE.split(text):
+        tokens = _item_tokens(item)
+        # An ambiguous word counts only as a whole item or a whole alternative
+        whole = [_item_tokens(part) for part in _ANY_OF_RE.split(item)]
+        skills = [
+            skill for skill in trie.find(list(tokens))
+            if skill not in AMBIGUOUS_SKILLS or term_tokens(skill) in whole
+        ]
+        if len(skills) > 1 and len(whole) > 1:
+            found.append(" or ".join(_dedupe(skills)))
+        else:
+            found.extend(skills)
+    return found
+
+
+def _title_keywords(text: str) -> List[str]:
+    # Role words from a short first line such as "Senior Backend Engineer"
+    for line in text.splitlines():
+        line = line.strip().strip("#*_").strip()
+        if not line:
+            continue
+        words = line.split()
+        if len(words) > _MAX_TITLE_WORDS or ":" in line or _classify(line):
+            return []
+        return [token for token in _item_tokens(line) if token not in _TITLE_STOPWORDS and len(token) > 1]
+    return []
+
+
+def _dedupe(values: List[str], exclude: Optional[set] = None) -> List[str]:
+    seen = set(exclude or ())
+    result = []
+    for value in values:
+        if value not in seen:
+            seen.add(value)
+            result.append(value)
+    return result
+
+
+def extract_requirements_locally(job_description: str) -> Tuple[Dict, float]:
+    # (requirements in the LLM extractor's shape, confidence in [0, 1])
+    text = project_resume(job_description).text
+    trie = get_skill_trie()
+
+    skills = {REQUIRED: [], PREFERRED: [], OTHER: []}
+    section = OTHER
+    saw_required_heading = False
+    requirement_bullets = 0
+    covered_bullets = 0
+    # Skills from bullets or "Label: a, b" lists in a requirements section, as
+    # opposed to loose mentions in prose
+    anchored = set()
+    years_in_requirements = []
+
+    for line in text.splitlines():
+        kind, rest = _split_heading(line, trie)
+        if kind:
+            section = kind
+            saw_required_heading = saw_required_heading or kind == REQUIRED
+            line = rest
+        if not line.strip():
+            continue
+
+        found = _find_skills(line, trie)
+        target = section
+        if section == REQUIRED and any(cue in line.lower() for cue in _PREFERRED_LINE_CUES):
+            target = PREFERRED
+        skills[target].extend(found)
+
+        if section != OTHER:
+            years = extract_experience_years(line)
+            if years is not None:
+                years_in_requirements.append(years)
+            if _BULLET_RE.match(line):
+                requirement_bullets += 1
+                covered_bullets += bool(found)
+            if _BULLET_RE.match(line) or kind:
+                anchored.update(found)
+
+    if saw_required_heading:
+        required = _dedupe(skills[REQUIRED])
+    else:
+        # No structure to go on: everything named is treated as required
+        required = _dedupe(skills[REQUIRED] + skills[PREFERRED] + skills[OTHER])
+    preferred = _dedupe(skills[PREFERRED], exclude=set(required))
+    keywords = _dedupe(required + preferred + skills[OTHER] + _title_keywords(text))
+
+    experience_years = min(years_in_requirements) if years_in_requirements else extract_experience_years(text)
+
+    # Structure, enough skills listed under it, and requirement bullets that
+    # name a known skill; skills only mentioned in prose add nothing
+    confidence = 0.4 if saw_required_heading else 0.0
+    confidence += 0.3 * min(1.0, len([skill for skill in required if skill in anchored]) / 4)
+    if requirement_bullets:
+        confidence += 0.3 * covered_bullets / requirement_bullets
+    elif saw_required_heading:
+        confidence += 0.15
+
+    requirements = {
+        "required_skills": required,
+        "preferred_skills": preferred,
+        "experience_years": experience_years,
+        "key_keywords": keywords,
+    }
+    return requirements, round(confidence, 2)
@@ -1,6 +1,8 @@
 from typing import Dict
 import json
-from .llm_client import build_groq_client
+from concurrent.futures import ThreadPoolExecutor
+from .llm_client import create_chat_completion
+from .scoring import _score_resume_text
 from config import settings
 
 _LATEX_TYPO_FIXES = {
@@ -31,6 +33,27 @@ def _sanitize_latex(latex: str) -> str:
     return latex
 
 
+def _generate_candidate(state: Dict, prompt: str) -> str:
+    response = create_chat_completion(
+        state,
+        "modify_resume",
+        model=settings.MODIFICATION_MODEL,
+        messages=[{"role": "user", "content": prompt}],
+        temperature=0.3
+    )
+
+    raw_output = response.choices[0].message.content.strip()
+
+    if raw_output.startswith("```"):
+        lines = raw_output.split("\n")
+        lines = lines[1:]
+        if lines and lines[-1].strip() == "```":
+            lines = lines[:-1]
+        raw_output = "\n".join(lines).strip()
+
+    return _sanitize_latex(raw_output)
+
+
 def modify_resume(state: Dict) -> Dict:
     if "original_resume" not in state:
         raise ValueError("original_resume missing from state")
@@ -42,8 +65,6 @@ def modify_resume(state: Dict) -> Dict:
     plan = state["improvement_plan"]
     job_requirements = state.get("job_requirements", {})
 
-    client = build_groq_client(state)
-
     prompt = f"""You are an expert resume writer and LaTeX typesetter.
 
 Your task: Convert and optimize the resume below into a professional LaTeX document that is tailored to the job requirements.
@@ -76,27 +97,20 @@ Improvement Plan:
 Return ONLY the complete LaTeX code. No explanations, no markdown code blocks, no backticks.
 Start directly with \\documentclass and end with \\end{{document}}."""
 
-    response = client.chat.completions.create(
-        model=settings.MODIFICATION_MODEL,
-        messages=[{"role": "user", "content": prompt}],
-        temperature=0.3
-    )
-
-    raw_output = response.choices[0].message.content.strip()
-
-    if raw_output.startswith("```"):
-        lines = raw_output.split("\n")
-        lines = lines[1:]
-        if lines and lines[-1].strip() == "```":
-            lines = lines[:-1]
-        raw_output = "\n".join(lines).strip()
-
-    modified_resume = _sanitize_latex(raw_output)
+    candidate_count = max(1, int(state.get("modification_candidates") or 1))
+    if candidate_count == 1:
+        modified_resume = _generate_candidate(state, prompt)
+    else:
+        # Generate several rewrites in parallel and keep the best scoring one
+        with ThreadPoolExecutor(max_workers=candidate_count) as executor:
+            candidates = list(executor.map(lambda _: _generate_candidate(state, prompt), range(candidate_count)))
+        modified_resume = max(candidates, key=lambda c: _score_resume_text(c, job_requirements)[0])
 
     decision = {
         "node": "modify_resume",
         "action": "resume_modified_as_latex",
-        "changes_applied": len(plan.get("priority_changes", []))
+        "changes_applied": len(plan.get("priority_changes", [])),
+        "candidates": candidate_count,
     }
 
     return {
@@ -1,6 +1,6 @@
 from typing import Dict
 import json
-from .llm_client import build_groq_client
+from .llm_client import create_chat_completion
 from config import settings
 
 
@@ -34,8 +34,6 @@ def plan_improvements(state: Dict) -> Dict:
         if field not in state or state[field] is None:
             raise ValueError(f"Missing required state field: {field}")
 
-    client = build_groq_client(state)
-
     prompt = f"""
 You are an expert ATS optimization strategist.
 
@@ -76,7 +74,10 @@ Rules:
 - Return ONLY valid JSON
 """
 
-    response = client.chat.completions.create(
+    response = create_chat_completion(
+        state,
+        "plan_improvements",
+        hedge=True,
         model=settings.PLANNING_MODEL,
         messages=[{"role": "user", "content": prompt}],
         temperature=settings.DEFAULT_TEMPERATURE
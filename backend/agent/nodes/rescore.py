@@ -1,4 +1,5 @@
 from typing import Dict
+from config import settings
 from .scoring import _score_resume_text
 
 
@@ -9,13 +10,15 @@ def rescore_modified_resume(state: Dict) -> Dict:
         return {
             "ats_score_after": None,
             "ats_breakdown_after": None,
+            "match_spans_after": None,
             "improvement_delta": 0.0,
             "last_iteration_delta": 0.0,
         }
 
-    ats_score_after, ats_breakdown_after = _score_resume_text(
+    ats_score_after, ats_breakdown_after, spans_after = _score_resume_text(
         resume_text=modified_resume,
         requirements=state.get("job_requirements", {}),
+        with_spans=True,
     )
 
     ats_score_before = float(state.get("ats_score_before") or 0.0)
@@ -38,6 +41,7 @@ def rescore_modified_resume(state: Dict) -> Dict:
     return {
         "ats_score_after": ats_score_after,
         "ats_breakdown_after": ats_breakdown_after,
+        "match_spans_after": spans_after if settings.MATCH_SPANS_ENABLED else None,
         "improvement_delta": improvement_delta,
         "last_iteration_delta": last_iteration_delta,
         "iteration_count": int(state.get("iteration_count", 0)) + 1,
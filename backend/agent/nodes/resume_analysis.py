@@ -1,17 +1,127 @@
-from typing import Dict
+from typing import Dict, List, Optional, Tuple
 import json
-from .llm_client import build_groq_client
+import re
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from .keyword_matcher import compile_requirements
+from .latex_text import project_resume
+from .llm_client import create_chat_completion
 from config import settings
 
+# Lines that look like a section heading: "\section{Experience}", "Experience:" or "EXPERIENCE"
+_HEADING_RE = re.compile(
+    r"^\s*(\\section\*?\{[^}]+\}|[A-Z][A-Za-z/&\- ]{1,40}:|[A-Z][A-Z/&\- ]{2,40})\s*$"
+)
+
+_LIST_FIELDS = ["strengths", "weaknesses", "missing_keywords", "suggestions"]
+
+
+def _parse_json(content: str) -> Dict:
+    if "```json" in content:
+        content = content.split("```json")[1].split("```")[0].strip()
+    elif "```" in content:
+        content = content.split("```")[1].split("```")[0].strip()
+
+    return json.loads(content)
+
+
+def _split_sections(resume: str) -> List[str]:
+    # Split on section headings and page breaks, keeping each heading with its body
+    sections: List[str] = []
+    current: List[str] = []
+
+    for line in resume.replace("\f", "\n\f\n").split("\n"):
+        if line == "\f" or _HEADING_RE.match(line):
+            if current and "".join(current).strip():
+                sections.append("\n".join(current))
+            current = [] if line == "\f" else [line]
+        else:
+            current.append(line)
+
+    if current and "".join(current).strip():
+        sections.append("\n".join(current))
+
+    return sections
+
+
+def _split_oversized(section: str, max_chars: int) -> List[str]:
+    # A single section larger than the budget is cut on line boundaries
+    pieces: List[str] = []
+    current = ""
+    for line in section.split("\n"):
+        while len(line) > max_chars:
+            if current:
+                pieces.append(current)
+                current = ""
+            pieces.append(line[:max_chars])
+            line = line[max_chars:]
+        if current and len(current) + len(line) + 1 > max_chars:
+            pieces.append(current)
+            current = line
+        else:
+            current = f"{current}\n{line}" if current else line
+    if current.strip():
+        pieces.append(current)
+    return pieces
+
+
+def _chunk_resume(resume: str, max_chars: int) -> List[str]:
+    # Greedily pack whole sections into chunks of at most max_chars
+    if len(resume) <= max_chars:
+        return [resume]
+
+    chunks: List[str] = []
+    current = ""
+    for section in _split_sections(resume):
+        for piece in _split_oversized(section, max_chars):
+            if current and len(current) + len(piece) + 1 > max_chars:
+                chunks.append(current)
+                current = piece
+            else:
+                current = f"{current}\n{piece}" if current else piece
+    if current.strip():
+        chunks.append(current)
+
+    return chunks
 
-def analyze_resume(state: Dict) -> Dict:
-    client = build_groq_client(state)
-    
-    resume = state["original_resume"]
-    job_requirements = state["job_requirements"]
-    
-    prompt = f"""Analyze this resume against the job requirements.
 
+@lru_cache(maxsize=64)
+def resume_chunks(resume: str, max_chars: int) -> Tuple[str, ...]:
+    # Shared by runs of the same resume against different postings
+    return tuple(_chunk_resume(resume, max_chars))
+
+
+def _merge_analyses(analyses: List[Dict], resume: str) -> Dict:
+    # Reduce per-chunk analyses into one, de-duplicating list entries
+    merged: Dict = {field: [] for field in _LIST_FIELDS}
+    seen: Dict[str, set] = {field: set() for field in _LIST_FIELDS}
+
+    for analysis in analyses:
+        for field in _LIST_FIELDS:
+            for item in analysis.get(field) or []:
+                key = str(item).strip().lower()
+                if key and key not in seen[field]:
+                    seen[field].add(key)
+                    merged[field].append(item)
+
+    # A keyword missing from one chunk may still appear in another one; matched on
+    # token boundaries so "Go" is not found inside "good"
+    present = compile_requirements({"key_keywords": merged["missing_keywords"]}).find(
+        project_resume(resume).text.lower()
+    )
+    merged["missing_keywords"] = [
+        k for k in merged["missing_keywords"] if str(k).strip().lower() not in present
+    ]
+    merged["chunk_count"] = len(analyses)
+
+    return merged
+
+
+def _analyze_chunk(state: Dict, resume: str, job_requirements: Dict, part: Optional[str] = None) -> Dict:
+    part_note = f"\nThis is {part} of a longer resume; only judge the content shown.\n" if part else ""
+
+    prompt = f"""Analyze this resume against the job requirements.
+{part_note}
 Resume:
 {resume}
 
@@ -26,19 +136,33 @@ Return JSON with:
 
 Return ONLY valid JSON, no other text."""
 
-    response = client.chat.completions.create(
+    response = create_chat_completion(
+        state,
+        "analyze_resume",
+        hedge=True,
         model=settings.RESUME_ANALYSIS_MODEL,
         messages=[{"role": "user", "content": prompt}],
         temperature=0
     )
-    
-    content = response.choices[0].message.content
-    
-    if "```json" in content:
-        content = content.split("```json")[1].split("```")[0].strip()
-    elif "```" in content:
-        content = content.split("```")[1].split("```")[0].strip()
-    
-    analysis = json.loads(content)
-    
-    return {"resume_analysis": analysis}
+
+    return _parse_json(response.choices[0].message.content)
+
+
+def analyze_resume(state: Dict) -> Dict:
+    resume = state["original_resume"]
+    job_requirements = state["job_requirements"]
+
+    chunks = resume_chunks(resume, settings.RESUME_CHUNK_CHARS)
+    if len(chunks) == 1:
+        return {"resume_analysis": _analyze_chunk(state, resume, job_requirements)}
+
+    # Long resume: analyze sections concurrently (map), then merge (reduce)
+    total = len(chunks)
+    workers = max(1, min(settings.RESUME_ANALYSIS_MAX_WORKERS, total))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        analyses = list(executor.map(
+            lambda item: _analyze_chunk(state, item[1], job_requirements, f"part {item[0] + 1} of {total}"),
+            enumerate(chunks),
+        ))
+
+    return {"resume_analysis": _merge_analyses(analyses, resume)}
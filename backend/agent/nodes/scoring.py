@@ -1,57 +1,75 @@
-from typing import Dict, Tuple
+from typing import Container, Dict, List, Tuple
+from config import settings
+from .keyword_matcher import compile_requirements, CompiledRequirements, SECTION_KEYS
+from .latex_text import project_resume, Projection
+from .text_index import build_index
 
+BULLET_CHARS = ("-", "•", "*")
 
-def _score_resume_text(resume_text: str, requirements: Dict) -> Tuple[float, Dict[str, float]]:
-    resume = (resume_text or "").lower()
-    requirements = requirements or {}
+# Bump when scores change for the same input; stored runs are stamped with it
+# and python -m agent.rescoring brings older ones up to date
+SCORE_VERSION = 2
 
-    keyword_score = 0.0
-    skills_score = 0.0
+
+def _format_points(word_count: int, has_bullets: bool, has_blank_line: bool) -> float:
+    # format quality (15 points), independent of the job posting
     format_score = 0.0
-    section_score = 0.0
-
-    # keywords matching (40 points)
-    keywords = requirements.get("key_keywords", [])
-    matched_keywords = [k for k in keywords if k.lower() in resume]
-
-    if keywords:
-        keyword_score = (len(matched_keywords) / len(keywords)) * 40
-
-    # required skills matching (30 points)
-    required_skills = requirements.get("required_skills", [])
-    matched_skills = [s for s in required_skills if s.lower() in resume]
-
-    if required_skills:
-        skills_score = (len(matched_skills) / len(required_skills)) * 30
-
-    # format quality (15 points)
-    word_count = len(resume.split())
 
     if 300 <= word_count <= 1000:
         format_score += 8
     elif 200 <= word_count <= 1200:
         format_score += 4
 
-    if "-" in resume or "•" in resume or "*" in resume:
+    if has_bullets:
         format_score += 4
 
-    if "\n\n" in resume:
+    if has_blank_line:
         format_score += 3
 
-    # section presence (15 points)
-    sections = {
-        "experience": ["experience", "work history"],
-        "skills": ["skills", "technical skills"],
-        "education": ["education", "degree"],
-        "summary": ["summary", "profile", "objective"]
-    }
+    return format_score
+
 
+def _format_score(resume: str) -> float:
+    return _format_points(
+        len(resume.split()),
+        any(c in resume for c in BULLET_CHARS),
+        "\n\n" in resume,
+    )
+
+
+def _section_score(found: Container[str]) -> float:
+    # section presence (15 points)
     found_sections = 0
-    for keys in sections.values():
-        if any(k in resume for k in keys):
+    for keys in SECTION_KEYS.values():
+        if any(k in found for k in keys):
             found_sections += 1
 
-    section_score = (found_sections / len(sections)) * 15
+    return (found_sections / len(SECTION_KEYS)) * 15
+
+
+def _score_matches(
+    compiled: CompiledRequirements,
+    found: Container[str],
+    format_score: float,
+) -> Tuple[float, Dict[str, float]]:
+    keyword_score = 0.0
+    skills_score = 0.0
+
+    # keywords matching (40 points)
+    keywords = compiled.keywords
+    matched_keywords = [k for k in keywords if k in found]
+
+    if keywords:
+        keyword_score = (len(matched_keywords) / len(keywords)) * 40
+
+    # required skills matching (30 points)
+    required_skills = compiled.required
+    matched_skills = [s for s in required_skills if s in found]
+
+    if required_skills:
+        skills_score = (len(matched_skills) / len(required_skills)) * 30
+
+    section_score = _section_score(found)
 
     total_score = round(
         min(keyword_score + skills_score + format_score + section_score, 100),
@@ -68,10 +86,44 @@ def _score_resume_text(resume_text: str, requirements: Dict) -> Tuple[float, Dic
     return total_score, breakdown
 
 
+def _match_spans(
+    compiled: CompiledRequirements,
+    located: Dict[str, List[Tuple[int, int]]],
+    projection: Projection,
+) -> Dict[str, List[int]]:
+    # Requirement term -> flat [start, end, start, end, ...] offsets into the
+    # submitted document (the LaTeX source for LaTeX resumes)
+    spans = {}
+    for term in compiled.required + compiled.preferred + compiled.keywords:
+        if term in located and term not in spans:
+            flat = []
+            for start, end in located[term]:
+                flat.extend(projection.source_span(start, end))
+            spans[term] = flat
+    return spans
+
+
+def _score_resume_text(resume_text: str, requirements: Dict, with_spans: bool = False) -> Tuple:
+    # (score, breakdown), plus match spans when with_spans is set
+    # LaTeX markup is projected away so commands and braces are not scored as content
+    projection = project_resume(resume_text)
+    resume = projection.text.lower()
+    compiled = compile_requirements(requirements)
+    if not with_spans:
+        return _score_matches(compiled, compiled.find(resume), _format_score(resume))
+
+    # A few characters change length when lowercased; offsets need the unlowered text then
+    index = build_index(resume if len(resume) == len(projection.text) else projection.text)
+    located = compiled.locate_in_index(index)
+    score, breakdown = _score_matches(compiled, located, _format_score(resume))
+    return score, breakdown, _match_spans(compiled, located, projection)
+
+
 def score_resume(state: Dict) -> Dict:
-    score_value, breakdown = _score_resume_text(
+    score_value, breakdown, spans = _score_resume_text(
         resume_text=state.get("original_resume", ""),
         requirements=state.get("job_requirements", {}),
+        with_spans=True,
     )
 
     existing_history = state.get("score_history", []) or []
@@ -86,6 +138,7 @@ def score_resume(state: Dict) -> Dict:
     return {
         "ats_score_before": score_value,
         "ats_breakdown_before": breakdown,
+        "match_spans_before": spans if settings.MATCH_SPANS_ENABLED else None,
         "score_history": updated_history,
         "decision_log": state.get("decision_log", []) + [decision],
     }
@@ -0,0 +1,174 @@
+# Skill alias index: surface forms like "k8s" or "postgres" map to one canonical skill
+# Applied inside tokenization, so requirement terms and resume text are both
+# normalized the same way. In indexed text a multi-word form keeps its words and
+# the canonical token is added alongside them, so "sql" still matches in
+# "sql server". Extra aliases can be loaded from a JSON file
+# ({"canonical": ["alias", ...]}) that is re-read when it changes on disk.
+
+import json
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from config import settings
+
+# canonical skill -> other ways of writing it
+DEFAULT_ALIASES: Dict[str, List[str]] = {
+    "kubernetes": ["k8s", "kube"],
+    "postgresql": ["postgres", "psql", "pgsql"],
+    "javascript": ["js", "ecmascript"],
+    "typescript": ["ts"],
+    "go": ["golang"],
+    "node.js": ["nodejs", "node js"],
+    "react": ["react.js", "reactjs"],
+    "vue": ["vue.js", "vuejs"],
+    "mongodb": ["mongo"],
+    "c++": ["cpp"],
+    "c#": ["csharp", "c sharp"],
+    ".net": ["dotnet", "dot net"],
+    "aws": ["amazon web services"],
+    "gcp": ["google cloud platform", "google cloud"],
+    "azure": ["microsoft azure"],
+    "ci/cd": ["cicd", "ci cd"],
+    "machine learning": ["ml"],
+    "artificial intelligence": ["ai"],
+    "natural language processing": ["nlp"],
+    "sql server": ["mssql", "ms sql"],
+    "elasticsearch": ["elastic search"],
+    "scikit-learn": ["sklearn", "scikit learn"],
+}
+
+
+class AliasIndex:
+    # Hash map from surface token tuples to a canonical token; one lookup per
+    # token unless it starts a known multi-word form
+    def __init__(self, table: Dict[str, List[str]]):
+        from .text_index import scan_tokens
+
+        def terms(value: str) -> Tuple[str, ...]:
+            return tuple(token for token, _, _ in scan_tokens(value))
+
+        self.canonical_names = list(table)
+        self.forms: Dict[Tuple[str, ...], str] = {}
+        for canonical, aliases in table.items():
+            key = " ".join(terms(canonical))
+            if not key:
+                continue
+            for surface in [canonical] + list(aliases or []):
+                tokens = terms(surface)
+                if tokens:
+                    self.forms[tokens] = key
+
+        self.first_tokens = {form[0] for form in self.forms}
+        self.max_length = max((len(form) for form in self.forms), default=1)
+
+    def _match(self, tokens: List[Tuple[str, int, int]], i: int) -> Optional[Tuple[str, int]]:
+        # (canonical, size) of the longest form starting at tokens[i]
+        if tokens[i][0] not in self.first_tokens:
+            return None
+        for size in range(min(self.max_length, len(tokens) - i), 0, -1):
+            canonical = self.forms.get(tuple(t[0] for t in tokens[i:i + size]))
+            if canonical is not None:
+                return canonical, size
+        return None
+
+    def apply(self, tokens: List[Tuple[str, int, int]]) -> List[Tuple[str, int, int]]:
+        # Greedy longest match; a multi-word form becomes one token spanning all of it
+        result = []
+        i = 0
+        while i < len(tokens):
+            match = self._match(tokens, i)
+            if match is None:
+                result.append(tokens[i])
+                i += 1
+                continue
+            canonical, size = match
+            result.append((canonical, tokens[i][1], tokens[i + size - 1][2]))
+            i += size
+        return result
+
+    def overlay(self, tokens: List[Tuple[str, int, int]]) -> Tuple[List[Tuple[str, int, int]], List[Tuple[int, str, int]]]:
+        # Like apply, but a multi-word form keeps its words in the stream and is
+        # returned separately as (position, canonical, size)
+        result = []
+        overlays = []
+        i = 0
+        while i < len(tokens):
+            match = self._match(tokens, i)
+            if match is None:
+                result.append(tokens[i])
+                i += 1
+                continue
+            canonical, size = match
+            if size == 1:
+                result.append((canonical, tokens[i][1], tokens[i][2]))
+            else:
+                overlays.append((len(result), canonical, size))
+                result.extend(tokens[i:i + size])
+            i += size
+        return result, overlays
+
+
+def _load_table(path: str) -> Dict[str, List[str]]:
+    table = {canonical: list(aliases) for canonical, aliases in DEFAULT_ALIASES.items()}
+    if not path:
+        return table
+    try:
+        with open(path, encoding="utf-8") as f:
+            extra = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"[SKILL_ALIASES] Could not load {path}: {e}")
+        return table
+
+    for canonical, aliases in extra.items():
+        canonical = str(canonical).strip().lower()
+        if isinstance(aliases, str):
+            aliases = [aliases]
+        table.setdefault(canonical, []).extend(str(a).strip().lower() for a in aliases)
+    return table
+
+
+def _file_mtime(path: str):
+    try:
+        return os.path.getmtime(path) if path else None
+    except OSError:
+        return None
+
+
+_lock = threading.Lock()
+_index = None
+_loaded_mtime = None
+_checked_at = 0.0
+_version = 0
+
+
+def reload_aliases() -> AliasIndex:
+    global _index, _loaded_mtime, _checked_at, _version
+    path = settings.SKILL_ALIASES_PATH
+    with _lock:
+        _loaded_mtime = _file_mtime(path)
+        _checked_at = time.monotonic()
+        _index = AliasIndex(_load_table(path))
+        _version += 1
+    return _index
+
+
+def get_alias_index() -> AliasIndex:
+    # The alias file is stat'ed at most once per reload interval
+    global _checked_at
+    if _index is None:
+        return reload_aliases()
+    path = settings.SKILL_ALIASES_PATH
+    if path and time.monotonic() - _checked_at >= settings.SKILL_ALIASES_RELOAD_SECONDS:
+        _checked_at = time.monotonic()
+        if _file_mtime(path) != _loaded_mtime:
+            print(f"[SKILL_ALIASES] Reloading {path}")
+            return reload_aliases()
+    return _index
+
+
+def alias_version() -> int:
+    # Bumped on every reload; caches of tokenized text key on it
+    get_alias_index()
+    return _version
@@ -0,0 +1,133 @@
+# Tokenized view of resume text used for keyword matching
+# Terms match on token boundaries, so "go" no longer hits "good" and "java"
+# no longer hits "javascript". Tech tokens like "c++", "c#" and "node.js"
+# are kept intact; "/" and "-" split tokens so "ci/cd" equals "ci cd".
+# Skill aliases ("k8s" -> kubernetes) are folded in during tokenization; a
+# multi-word alias is indexed next to its words rather than replacing them.
+
+import re
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+from .skill_aliases import alias_version, get_alias_index
+
+# Alphanumeric runs with inner dots (node.js, asp.net) and trailing + or # (c++, c#),
+# or a leading dot for names like .net
+_TOKEN_RE = re.compile(r"(?<![a-z0-9])\.?[a-z0-9]+(?:\.[a-z0-9]+)*[+#]*", re.IGNORECASE)
+
+_INDEX_CACHE_SIZE = 256
+
+
+def stem(token: str) -> str:
+    # Light plural folding only; tokens with digits or symbols are left alone
+    if len(token) <= 3 or not token.isalpha():
+        return token
+    if token.endswith("ies") and len(token) > 4:
+        return token[:-3] + "y"
+    if token.endswith("s") and not token.endswith(("ss", "us", "sis")):
+        return token[:-1]
+    return token
+
+
+def scan_tokens(text: str) -> List[Tuple[str, int, int]]:
+    # (normalized token, start, end) with offsets into the original text
+    return [(stem(m.group().lower()), m.start(), m.end()) for m in _TOKEN_RE.finditer(text or "")]
+
+
+def tokenize(text: str) -> List[Tuple[str, int, int]]:
+    # Scanned tokens with skill aliases mapped to their canonical form
+    return get_alias_index().apply(scan_tokens(text))
+
+
+def term_tokens(term: str) -> Tuple[str, ...]:
+    return tuple(token for token, _, _ in tokenize(term))
+
+
+class TextIndex:
+    # Token stream plus a positional inverted index: token -> positions.
+    # A multi-word term is an n-gram lookup: positions of its first token
+    # whose following tokens match the rest of the term. The canonical token of
+    # a multi-word alias sits at the position of its first word and, when
+    # matched, moves past all of its words.
+    def __init__(self, text: str):
+        self._build(scan_tokens(text))
+
+    @classmethod
+    def from_tokens(cls, scanned: List[Tuple[str, int, int]]) -> "TextIndex":
+        # Index tokens already scanned, e.g. pieces of a document scanned line by line
+        index = cls.__new__(cls)
+        index._build(scanned)
+        return index
+
+    def _build(self, scanned: List[Tuple[str, int, int]]) -> None:
+        self.tokens, overlays = get_alias_index().overlay(scanned)
+        self.positions: Dict[str, List[int]] = {}
+        for position, (token, _, _) in enumerate(self.tokens):
+            self.positions.setdefault(token, []).append(position)
+
+        self.alias_sizes: Dict[Tuple[int, str], int] = {}
+        for position, canonical, size in overlays:
+            self.alias_sizes[(position, canonical)] = size
+            positions = self.positions.setdefault(canonical, [])
+            if position not in positions:
+                positions.append(position)
+                positions.sort()
+
+    def _ends(self, position: int, token: str) -> List[int]:
+        ends = []
+        if position < len(self.tokens) and self.tokens[position][0] == token:
+            ends.append(position + 1)
+        size = self.alias_sizes.get((position, token))
+        if size:
+            ends.append(position + size)
+        return ends
+
+    def match_end(self, position: int, phrase: Tuple[str, ...]) -> Optional[int]:
+        # Position after phrase matched from position, or None when it does not match there
+        frontier = [position]
+        for token in phrase:
+            frontier = [end for p in frontier for end in self._ends(p, token)]
+            if not frontier:
+                return None
+        return max(frontier)
+
+    def find_positions(self, phrase: Tuple[str, ...]) -> List[int]:
+        if not phrase:
+            return []
+        starts = self.positions.get(phrase[0], [])
+        if len(phrase) == 1:
+            return starts
+        if not self.alias_sizes:
+            tokens = self.tokens
+            size = len(phrase)
+            return [
+                p for p in starts
+                if p + size <= len(tokens) and all(tokens[p + i][0] == phrase[i] for i in range(1, size))
+            ]
+        return [p for p in starts if self.match_end(p, phrase) is not None]
+
+    def contains(self, phrase: Tuple[str, ...]) -> bool:
+        return bool(self.find_positions(phrase))
+
+    def span(self, position: int, size: int) -> Optional[Tuple[int, int]]:
+        if position + size > len(self.tokens):
+            return None
+        return self.tokens[position][1], self.tokens[position + size - 1][2]
+
+    def phrase_span(self, position: int, phrase: Tuple[str, ...]) -> Optional[Tuple[int, int]]:
+        # Character span of phrase matched at position, covering the words of any alias in it
+        end = self.match_end(position, phrase)
+        if end is None:
+            return None
+        return self.span(position, end - position)
+
+
+@lru_cache(maxsize=_INDEX_CACHE_SIZE)
+def _build_index(text: str, version: int) -> TextIndex:
+    return TextIndex(text)
+
+
+def build_index(text: str) -> TextIndex:
+    # Memoized so the same document is tokenized once across nodes and iterations;
+    # keyed on the alias version so a reloaded alias table re-tokenizes
+    return _build_index(text, alias_version())
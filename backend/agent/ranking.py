@@ -0,0 +1,79 @@
+# Rank many job postings for one resume
+# Requirements come from the caller, the extraction cache or the local
+# extractor; ATS scores for all postings are one batch_scoring pass and fit
+# uses the same matcher and relevance engine as the workflow. Only the top_k
+# postings get an LLM analyze_resume pass, run concurrently.
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+from config import settings
+from .instant_score import resolve_requirements
+from .nodes.batch_scoring import score_batch
+from .nodes.fit_check import assess_job_fit
+from .nodes.local_analysis import build_resume_analysis
+from .nodes.resume_analysis import analyze_resume
+
+
+def _analyze(resume: str, requirements: Dict, user_llm_api_key: Optional[str]) -> Dict:
+    state = {
+        "original_resume": resume,
+        "job_requirements": requirements,
+        "user_llm_api_key": user_llm_api_key,
+    }
+    try:
+        return analyze_resume(state)["resume_analysis"]
+    except Exception as e:
+        # One failed call should not fail the ranking; fall back to the local analysis
+        print(f"[RANK] analyze_resume failed, using local analysis: {e}")
+        return build_resume_analysis(resume, requirements)
+
+
+def rank_postings(
+    resume: str,
+    postings: List[Dict],
+    top_k: int = 0,
+    user_llm_api_key: Optional[str] = None,
+) -> List[Dict]:
+    # postings: [{"job_description", "job_requirements"?, "id"?}], best match first
+    resolved = [resolve_requirements(p["job_description"], p.get("job_requirements")) for p in postings]
+    requirements = [req for req, _ in resolved]
+    scores = score_batch([resume], requirements)
+
+    results = []
+    for index, (posting, (req, source)) in enumerate(zip(postings, resolved)):
+        ats_score, breakdown = scores.result(0, index)
+        fit = assess_job_fit({"job_requirements": req, "original_resume": resume}, quiet=True)
+        fit_details = fit["decision_log"][-1]
+        results.append({
+            "index": index,
+            "id": posting.get("id"),
+            "ats_score": ats_score,
+            "ats_breakdown": breakdown,
+            "fit_decision": fit["fit_decision"],
+            "fit_score": fit_details["fit_score"],
+            "relevance_score": fit["relevance_score"],
+            "matched_required_count": fit_details["matched_required_count"],
+            "required_count": fit_details["required_count"],
+            "job_requirements": req,
+            "requirements_source": source,
+            "resume_analysis": None,
+        })
+
+    # Fit decides the order; the ATS score breaks ties
+    results.sort(key=lambda item: (item["fit_score"], item["ats_score"]), reverse=True)
+    for rank, item in enumerate(results, start=1):
+        item["rank"] = rank
+
+    top = results[:top_k]
+    if top:
+        workers = max(1, min(settings.RANK_ANALYSIS_MAX_WORKERS, len(top)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            analyses = executor.map(
+                lambda item: _analyze(resume, item["job_requirements"], user_llm_api_key),
+                top,
+            )
+            for item, analysis in zip(top, analyses):
+                item["resume_analysis"] = analysis
+
+    return results
@@ -0,0 +1,142 @@
+# Local BM25 relevance between job requirements and a resume
+# Document frequencies come from every job description and resume in the runs
+# table, persisted in relevance_corpus, loaded at startup and updated as new
+# runs are saved, so rare skills weigh more than ones every posting lists.
+# No LLM call is involved.
+
+import math
+import threading
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .nodes.keyword_matcher import compile_requirements
+from .nodes.latex_text import project_resume
+from .nodes.text_index import build_index, TextIndex
+
+# Standard BM25 parameters
+K1 = 1.2
+B = 0.75
+
+# Preferred skills count for less than required skills and keywords
+_PREFERRED_WEIGHT = 0.5
+
+
+class CorpusStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.document_count = 0
+        self.total_length = 0
+        self.document_frequency: Counter = Counter()
+
+    def add_document(self, text: Optional[str]) -> None:
+        if not text:
+            return
+        # Same tokens the matcher sees, canonical forms of multi-word aliases included
+        index = TextIndex(project_resume(text).text)
+        with self._lock:
+            self.document_count += 1
+            self.total_length += len(index.tokens)
+            self.document_frequency.update(index.positions.keys())
+
+    def add_documents(self, texts: Iterable[Optional[str]]) -> int:
+        added = 0
+        for text in texts:
+            if text:
+                self.add_document(text)
+                added += 1
+        return added
+
+    def idf(self, token: str) -> float:
+        # BM25 idf, always positive; with an empty corpus every token weighs the same
+        n = self.document_count
+        df = self.document_frequency.get(token, 0)
+        return math.log(1 + (n - df + 0.5) / (df + 0.5))
+
+    def average_length(self) -> float:
+        if not self.document_count:
+            return 0.0
+        return self.total_length / self.document_count
+
+    def relevance(self, requirements: Dict, resume_text: str) -> float:
+        # Normalized BM25 in [0, 1]: idf-weighted, length-normalized term coverage
+        compiled = compile_requirements(requirements)
+        weighted_terms: Dict[str, float] = {}
+        for term in compiled.required + compiled.keywords:
+            weighted_terms[term] = 1.0
+        for term in compiled.preferred:
+            weighted_terms.setdefault(term, _PREFERRED_WEIGHT)
+        if not weighted_terms:
+            return 0.0
+
+        index = build_index(project_resume(resume_text).text.lower())
+        length = len(index.tokens)
+        avg_length = self.average_length() or float(length) or 1.0
+        norm = K1 * (1 - B + B * length / avg_length)
+
+        achieved = 0.0
+        possible = 0.0
+        for term, weight in weighted_terms.items():
+            phrases = [phrase for phrase in compiled.phrases[term] if phrase]
+            if not phrases:
+                continue
+            # A phrase is as informative as its rarest token
+            term_weight = weight * max(self.idf(token) for phrase in phrases for token in phrase)
+            possible += term_weight
+            tf = sum(len(index.find_positions(phrase)) for phrase in phrases)
+            if tf:
+                # One mention in an average-length resume earns the full weight;
+                # more mentions cannot make up for missing terms
+                achieved += term_weight * min(1.0, tf * (K1 + 1) / (tf + norm))
+
+        if possible <= 0:
+            return 0.0
+        return round(achieved / possible, 4)
+
+    def rank(self, requirements: Dict, resumes: Sequence[str]) -> List[Tuple[int, float]]:
+        # (position, relevance) pairs, most relevant first
+        scored = [(i, self.relevance(requirements, text)) for i, text in enumerate(resumes)]
+        return sorted(scored, key=lambda item: item[1], reverse=True)
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            return {
+                "documents": self.document_count,
+                "vocabulary": len(self.document_frequency),
+                "average_length": round(self.average_length(), 1),
+            }
+
+    def dump(self) -> Dict:
+        # Raw statistics, e.g. for seeding worker processes
+        with self._lock:
+            return {
+                "document_count": self.document_count,
+                "total_length": self.total_length,
+                "document_frequency": dict(self.document_frequency),
+            }
+
+    def load(self, data: Dict) -> None:
+        with self._lock:
+            self.document_count = data["document_count"]
+            self.total_length = data["total_length"]
+            self.document_frequency = Counter(data["document_frequency"])
+
+    def merge(self, data: Dict) -> None:
+        # Add statistics dumped from another instance to these
+        with self._lock:
+            self.document_count += data["document_count"]
+            self.total_length += data["total_length"]
+            self.document_frequency.update(data["document_frequency"])
+
+    def reset(self) -> None:
+        with self._lock:
+            self.document_count = 0
+            self.total_length = 0
+            self.document_frequency = Counter()
+
+
+corpus_stats = CorpusStats()
+
+
+def record_run_documents(job_description: Optional[str], resume: Optional[str]) -> None:
+    # Called when a run is saved so the statistics track the runs table
+    corpus_stats.add_documents([job_description, resume])
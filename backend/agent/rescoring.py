@@ -0,0 +1,222 @@
+# Bulk rescoring of stored runs after a scoring or fit-threshold change
+# Runs are streamed in primary-key order (keyset pagination), rescored in a
+# process pool and written back in batched JSONB updates stamped with
+# SCORE_VERSION and the fit settings. Progress is checkpointed after every
+# batch, and rows already stamped with the current version and settings are
+# skipped, so an interrupted job can simply rerun and a threshold change picks
+# up every run.
+# Workers fit-check with relevance statistics loaded from the runs table, as
+# the server does.
+#
+#   python -m agent.rescoring --batch-size 500 --workers 4
+
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from config import settings
+from .nodes.fit_check import assess_job_fit, fit_settings
+from .nodes.scoring import SCORE_VERSION, _score_resume_text
+from .relevance import CorpusStats, corpus_stats
+
+DEFAULT_CHECKPOINT = ".rescore_checkpoint.json"
+
+_SELECT_BATCH = """
+SELECT id, original_resume_text, result_json -> 'job_requirements', result_json ->> 'modified_resume',
+       result_json ->> 'final_status', result_json -> 'score_history'
+FROM runs
+WHERE id > CAST(:after AS uuid)
+  AND result_json IS NOT NULL
+  AND result_json ? 'job_requirements'
+  AND (COALESCE((result_json ->> 'score_version')::int, 0) <> :version
+       OR (result_json ->> 'fit_settings') IS DISTINCT FROM :fit_settings)
+ORDER BY id
+LIMIT :limit
+"""
+
+# The denormalized summary columns follow the rescored values
+_UPDATE_RUN = """
+UPDATE runs
+SET result_json = result_json || CAST(:patch AS jsonb),
+    ats_score_before = :ats_score_before,
+    ats_score_after = COALESCE(CAST(:ats_score_after AS double precision), ats_score_after),
+    fit_decision = COALESCE(CAST(:fit_decision AS varchar), fit_decision)
+WHERE id = CAST(:id AS uuid)
+"""
+
+_SELECT_DOCUMENTS = "SELECT job_description, original_resume_text FROM runs"
+
+_MIN_UUID = "00000000-0000-0000-0000-000000000000"
+
+
+def rescore_result(resume: Optional[str], requirements: Optional[Dict], modified_resume: Optional[str],
+                   final_status: Optional[str] = None, score_history: Optional[List] = None) -> Dict:
+    # Fields of result_json that depend on the scoring algorithm and fit thresholds
+    requirements = requirements or {}
+    with_spans = settings.MATCH_SPANS_ENABLED
+    before, breakdown_before, *spans_before = _score_resume_text(resume or "", requirements, with_spans)
+    patch = {
+        "ats_score_before": before,
+        "ats_breakdown_before": breakdown_before,
+        "match_spans_before": spans_before[0] if with_spans else None,
+        "score_version": SCORE_VERSION,
+        "fit_settings": fit_settings(),
+    }
+    # Only the original and final resumes are stored; intermediate iterations keep their scores
+    history = list(score_history or [])
+    if history:
+        history[0] = before
+
+    if modified_resume:
+        after, breakdown_after, *spans_after = _score_resume_text(modified_resume, requirements, with_spans)
+        patch.update({
+            "ats_score_after": after,
+            "ats_breakdown_after": breakdown_after,
+            "match_spans_after": spans_after[0] if with_spans else None,
+            "improvement_delta": round(after - before, 2),
+        })
+        if len(history) > 1:
+            history[-1] = after
+    if history:
+        patch["score_history"] = history
+
+    fit = assess_job_fit({"job_requirements": requirements, "original_resume": resume or ""}, quiet=True)
+    # A finished run keeps the fit decision that chose its path: one rejected as
+    # a poor fit is not relabelled good_fit, nor an optimized one poor_fit
+    if final_status and (fit["fit_decision"] == "poor_fit") != (final_status == "rejected_poor_fit"):
+        return patch
+    patch.update({
+        "fit_decision": fit["fit_decision"],
+        "fit_reason": fit["fit_reason"],
+        "fit_confidence": fit["fit_confidence"],
+    })
+    return patch
+
+
+def _init_worker(corpus: Dict) -> None:
+    corpus_stats.load(corpus)
+
+
+def _load_corpus(engine) -> Dict:
+    # Same documents the server seeds its relevance statistics with
+    from sqlalchemy import text
+
+    stats = CorpusStats()
+    with engine.connect().execution_options(stream_results=True) as conn:
+        rows = conn.execute(text(_SELECT_DOCUMENTS))
+        added = stats.add_documents(value for row in rows for value in row)
+    print(f"[RESCORE] Relevance corpus loaded with {added} documents")
+    return stats.dump()
+
+
+def _rescore_row(row: Tuple) -> Tuple[str, Dict]:
+    run_id, resume, requirements, modified_resume, final_status, score_history = row
+    if isinstance(requirements, str):
+        requirements = json.loads(requirements)
+    if isinstance(score_history, str):
+        score_history = json.loads(score_history)
+    return str(run_id), rescore_result(resume, requirements, modified_resume, final_status, score_history)
+
+
+def _load_checkpoint(path: str) -> str:
+    try:
+        with open(path, encoding="utf-8") as f:
+            checkpoint = json.load(f)
+    except (OSError, ValueError):
+        return _MIN_UUID
+    # A checkpoint from an older scoring version or other fit settings does not cover this one
+    if checkpoint.get("score_version") != SCORE_VERSION or checkpoint.get("fit_settings") != fit_settings():
+        return _MIN_UUID
+    return checkpoint.get("last_id") or _MIN_UUID
+
+
+def _save_checkpoint(path: str, last_id: str, processed: int) -> None:
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({
+            "last_id": last_id,
+            "score_version": SCORE_VERSION,
+            "fit_settings": fit_settings(),
+            "processed": processed,
+        }, f)
+    os.replace(tmp, path)
+
+
+def rescore_runs(engine, batch_size: int = 500, workers: int = 4,
+                 checkpoint_path: str = DEFAULT_CHECKPOINT, restart: bool = False,
+                 limit: Optional[int] = None) -> int:
+    from sqlalchemy import text
+
+    last_id = _MIN_UUID if restart else _load_checkpoint(checkpoint_path)
+    processed = 0
+    started = time.monotonic()
+    print(f"[RESCORE] Score version {SCORE_VERSION}, fit settings {fit_settings()}, starting after {last_id}")
+
+    corpus = _load_corpus(engine)
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(corpus,)) as pool:
+        while limit is None or processed < limit:
+            size = batch_size if limit is None else min(batch_size, limit - processed)
+            with engine.connect() as conn:
+                rows: List[Tuple] = [
+                    tuple(row) for row in conn.execute(
+                        text(_SELECT_BATCH),
+                        {"after": last_id, "version": SCORE_VERSION, "fit_settings": fit_settings(), "limit": size},
+                    )
+                ]
+            if not rows:
+                break
+
+            chunksize = max(1, len(rows) // (workers * 4))
+            patches = list(pool.map(_rescore_row, rows, chunksize=chunksize))
+
+            with engine.begin() as conn:
+                conn.execute(
+                    text(_UPDATE_RUN),
+                    [
+                        {
+                            "id": run_id,
+                            "patch": json.dumps(patch),
+                            "ats_score_before": patch["ats_score_before"],
+                            "ats_score_after": patch.get("ats_score_after"),
+                            "fit_decision": patch.get("fit_decision"),
+                        }
+                        for run_id, patch in patches
+                    ],
+                )
+
+            last_id = str(rows[-1][0])
+            processed += len(rows)
+            _save_checkpoint(checkpoint_path, last_id, processed)
+            rate = processed / max(time.monotonic() - started, 1e-6)
+            print(f"[RESCORE] {processed} runs rescored ({rate:.0f}/s), last id {last_id}")
+
+    print(f"[RESCORE] Done: {processed} runs")
+    return processed
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Rescore stored runs with the current scoring algorithm")
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2)
+    parser.add_argument("--checkpoint", default=DEFAULT_CHECKPOINT)
+    parser.add_argument("--restart", action="store_true", help="ignore the checkpoint and start from the first run")
+    parser.add_argument("--limit", type=int, default=None, help="stop after this many runs")
+    args = parser.parse_args(argv)
+
+    from database.connection import engine
+
+    rescore_runs(
+        engine,
+        batch_size=args.batch_size,
+        workers=args.workers,
+        checkpoint_path=args.checkpoint,
+        restart=args.restart,
+        limit=args.limit,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+# Recruiter screening: many resumes against one job description
+# Requirements are extracted once. PDF text extraction, scoring and the fit
+# check run in a process pool shared by all requests; only candidates at or
+# above the fit threshold go on to the full optimization workflow.
+
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Dict, Iterator, List, Optional
+
+from config import settings
+from .batch import run_bounded
+from .instant_score import resolve_requirements
+from .nodes.fit_check import assess_job_fit
+from .nodes.job_requirements import extract_job_requirements
+from .nodes.scoring import _score_resume_text
+from .relevance import corpus_stats
+
+
+# Workers are restarted with fresh statistics once the corpus has grown this much
+_CORPUS_REFRESH_GROWTH = 0.1
+
+_pool_lock = threading.Lock()
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_documents = 0
+
+
+def _init_worker(corpus: Dict) -> None:
+    # Workers fit-check with the same relevance statistics as the server
+    corpus_stats.load(corpus)
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    # One pool of SCREENING_PROCESSES workers however many requests are screening
+    global _pool, _pool_documents
+    documents = corpus_stats.document_count
+    with _pool_lock:
+        if _pool is not None and documents > _pool_documents * (1 + _CORPUS_REFRESH_GROWTH):
+            # Work already queued on the old pool still finishes
+            _pool.shutdown(wait=False)
+            _pool = None
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers=max(1, settings.SCREENING_PROCESSES),
+                # Spawned, not forked from the threaded server process
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(corpus_stats.dump(),),
+            )
+            _pool_documents = documents
+        return _pool
+
+
+def _discard_pool(pool: ProcessPoolExecutor) -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def shutdown_pool() -> None:
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def screen_candidate(index: int, name: str, requirements: Dict,
+                     text: Optional[str] = None, pdf: Optional[bytes] = None) -> Dict:
+    # Score and fit-check one resume; runs inside a worker process
+    result = {"index": index, "name": name}
+    try:
+        if pdf is not None:
+            from services.pdf_service import extract_text_from_pdf
+            text = extract_text_from_pdf(pdf)["text"]
+        if not (text or "").strip():
+            raise ValueError("Resume is empty")
+
+        ats_score, breakdown = _score_resume_text(text, requirements)
+        fit = assess_job_fit({"job_requirements": requirements, "original_resume": text}, quiet=True)
+        result.update({
+            "resume": text,
+            "ats_score": ats_score,
+            "ats_breakdown": breakdown,
+            "fit_decision": fit["fit_decision"],
+            "fit_score": fit["decision_log"][-1]["fit_score"],
+            "relevance_score": fit["relevance_score"],
+        })
+    except Exception as e:
+        result["error"] = str(e)
+    return result
+
+
+def _screen_all(candidates: List[Dict], requirements: Dict) -> Iterator[Dict]:
+    if not candidates:
+        return
+    pool = _get_pool()
+    futures = []
+    try:
+        for i, c in enumerate(candidates):
+            futures.append(pool.submit(screen_candidate, i, c.get("name") or f"candidate-{i + 1}",
+                                       requirements, c.get("text"), c.get("pdf")))
+        for future in as_completed(futures):
+            yield future.result()
+    except BrokenProcessPool:
+        # A crashed worker breaks the pool; the next request starts a new one
+        _discard_pool(pool)
+        raise
+    finally:
+        # A client that disconnects leaves its unstarted candidates unscreened
+        for future in futures:
+            future.cancel()
+
+
+def _public(result: Dict) -> Dict:
+    return {key: value for key, value in result.items() if key != "resume"}
+
+
+def screen_candidates(
+    job_description: str,
+    candidates: List[Dict],
+    optimize: Callable[[str], Dict],
+    fit_threshold: float,
+    max_optimizations: int,
+    user_llm_api_key: Optional[str] = None,
+) -> Iterator[Dict]:
+    # candidates: [{"name"?, "text"? | "pdf"?}]. Yields events:
+    # {"type": "screened", ...} per candidate as scoring finishes,
+    # {"type": "ranking", "candidates": [...]} best first once all are scored,
+    # {"type": "optimized", "resume", "state", ...} / {"type": "error", ...} per selected
+    # candidate as its workflow finishes; the caller saves and trims optimized events.
+    # A failed requirement extraction ends the stream with one {"type": "error"}.
+    # Without the user's key the posting is parsed locally, as /score does, so
+    # screening never falls back to the server's key.
+    if user_llm_api_key is None:
+        requirements, _ = resolve_requirements(job_description)
+    else:
+        state = {"job_description": job_description, "user_llm_api_key": user_llm_api_key, "decision_log": []}
+        try:
+            requirements = extract_job_requirements(state)["job_requirements"]
+        except Exception as e:
+            yield {"type": "error", "error": f"Requirement extraction failed: {e}"}
+            return
+
+    screened = []
+    for result in _screen_all(candidates, requirements):
+        screened.append(result)
+        yield {"type": "screened", **_public(result)}
+
+    scored = [r for r in screened if "error" not in r]
+    scored.sort(key=lambda r: (r["fit_score"], r["ats_score"]), reverse=True)
+    selected = [r for r in scored if r["fit_score"] >= fit_threshold][:max_optimizations]
+    selected_ids = {r["index"] for r in selected}
+    yield {
+        "type": "ranking",
+        "job_requirements": requirements,
+        "candidates": [
+            {"rank": rank, "selected": r["index"] in selected_ids, **_public(r)}
+            for rank, r in enumerate(scored, start=1)
+        ],
+    }
+
+    # Best candidates are submitted first, so they also tend to finish first
+    for candidate, result, error in run_bounded(
+        lambda r: optimize(r["resume"]),
+        selected,
+        settings.BATCH_MAX_CONCURRENCY,
+    ):
+        if error is not None:
+            yield {"type": "error", "index": candidate["index"], "name": candidate["name"], "error": str(error)}
+        else:
+            yield {
+                "type": "optimized",
+                "index": candidate["index"],
+                "name": candidate["name"],
+                "resume": candidate["resume"],
+                "state": result,
+            }
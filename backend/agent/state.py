@@ -1,6 +1,8 @@
 from typing import TypedDict, Optional
 from datetime import datetime
 from config import settings
+from .deadline import compute_deadline
+from .tiers import get_tier_config
 
 
 class ResumeAgentState(TypedDict):
@@ -10,29 +12,48 @@ class ResumeAgentState(TypedDict):
     original_resume: str
     modified_resume: Optional[str]
     cover_letter: Optional[str]
+    generate_cover_letter: bool
+    narrative_analysis: bool
     
     ats_score_before: Optional[float]
     ats_score_after: Optional[float]
     ats_breakdown_before: Optional[dict]
     ats_breakdown_after: Optional[dict]
+    match_spans_before: Optional[dict]
+    match_spans_after: Optional[dict]
     improvement_delta: Optional[float]
     last_iteration_delta: Optional[float]
 
     job_requirements: Optional[dict]
     resume_analysis: Optional[dict]
     improvement_plan: Optional[dict]
+    # Plan for the unmodified resume, the one a near-duplicate run can reuse
+    initial_improvement_plan: Optional[dict]
     decision_log: Optional[list]
     score_history: Optional[list]
     fit_decision: str
     fit_reason: Optional[str]
     fit_confidence: Optional[float]
+    relevance_score: Optional[float]
 
     iteration_count: int
     max_iterations: int
     target_score: float
     min_iteration_gain: float
+    tier: str
+    models: Optional[dict]
+    modification_candidates: int
+    max_tokens: Optional[int]
+    degradation_level: int
     status: str
     created_at: str
+    deadline_at: Optional[float]
+    # Fixed plan + modify estimate for tiers on other models than the observed latencies
+    cycle_estimate_seconds: Optional[float]
+    fingerprints: Optional[dict]
+    reuse: Optional[dict]
+    score_version: Optional[int]
+    fit_settings: Optional[str]
 
 
 def create_initial_state(
@@ -40,7 +61,15 @@ def create_initial_state(
     job_description: str,
     original_resume: str,
     user_llm_api_key: Optional[str] = None,
+    generate_cover_letter: Optional[bool] = None,
+    deadline_seconds: Optional[float] = None,
+    tier: Optional[str] = None,
+    narrative_analysis: Optional[bool] = None,
 ) -> ResumeAgentState:
+    tier_config = get_tier_config(tier)
+    if deadline_seconds is None:
+        deadline_seconds = tier_config["deadline_seconds"]
+
     return {
         "user_id": user_id,
         "user_llm_api_key": user_llm_api_key,
@@ -48,24 +77,45 @@ def create_initial_state(
         "original_resume": original_resume,
         "modified_resume": None,
         "cover_letter": None,
+        "generate_cover_letter": (
+            settings.GENERATE_COVER_LETTER if generate_cover_letter is None else generate_cover_letter
+        ),
+        "narrative_analysis": (
+            settings.NARRATIVE_ANALYSIS if narrative_analysis is None else narrative_analysis
+        ),
         "ats_score_before": None,
         "ats_score_after": None,
         "ats_breakdown_before": None,
         "ats_breakdown_after": None,
+        "match_spans_before": None,
+        "match_spans_after": None,
         "improvement_delta": None,
         "last_iteration_delta": None,
         "job_requirements": None,
         "resume_analysis": None,
         "improvement_plan": None,
+        "initial_improvement_plan": None,
         "decision_log": [],
         "score_history": [],
         "fit_decision": "unknown",
         "fit_reason": None,
         "fit_confidence": None,
+        "relevance_score": None,
         "iteration_count": 0,
-        "max_iterations": settings.MAX_ITERATIONS,
-        "target_score": settings.TARGET_SCORE,
-        "min_iteration_gain": settings.MIN_ITERATION_GAIN,
+        "max_iterations": tier_config["max_iterations"],
+        "target_score": tier_config["target_score"],
+        "min_iteration_gain": tier_config["min_iteration_gain"],
+        "tier": tier_config["tier"],
+        "models": tier_config["models"],
+        "modification_candidates": tier_config["modification_candidates"],
+        "max_tokens": tier_config["max_tokens"],
+        "degradation_level": 0,
         "status": "pending",
-        "created_at": datetime.utcnow().isoformat()
+        "created_at": datetime.utcnow().isoformat(),
+        "deadline_at": compute_deadline(deadline_seconds),
+        "cycle_estimate_seconds": tier_config["cycle_estimate_seconds"],
+        "fingerprints": None,
+        "reuse": None,
+        "score_version": None,
+        "fit_settings": None,
     }
@@ -0,0 +1,77 @@
+# Latency tiers: bundles of loop limits, models and budgets selectable per request
+
+from typing import Dict, Any, Optional
+from config import settings
+
+FAST = "fast"
+BALANCED = "balanced"
+THOROUGH = "thorough"
+
+
+def _balanced() -> Dict[str, Any]:
+    # The default tier keeps the behavior configured through environment settings
+    return {
+        "max_iterations": settings.MAX_ITERATIONS,
+        "target_score": settings.TARGET_SCORE,
+        "min_iteration_gain": settings.MIN_ITERATION_GAIN,
+        "models": {},
+        "modification_candidates": 1,
+        "max_tokens": None,
+        "deadline_seconds": None,
+        "cycle_estimate_seconds": None,
+        "local_analysis": False,
+    }
+
+
+def _fast() -> Dict[str, Any]:
+    # One cycle on small models with a capped output budget and the resume
+    # analysis computed locally instead of by an LLM call
+    return {
+        "max_iterations": 1,
+        "target_score": settings.TARGET_SCORE,
+        "min_iteration_gain": settings.MIN_ITERATION_GAIN,
+        "models": {
+            "extract_requirements": settings.FAST_TIER_MODEL,
+            "plan_improvements": settings.FAST_TIER_MODEL,
+            "modify_resume": settings.FAST_TIER_MODEL,
+            "write_cover_letter": settings.FAST_TIER_MODEL,
+        },
+        "modification_candidates": 1,
+        "max_tokens": min(settings.MAX_TOKENS, 3000),
+        "deadline_seconds": settings.FAST_TIER_DEADLINE_SECONDS,
+        "cycle_estimate_seconds": settings.FAST_TIER_CYCLE_ESTIMATE_SECONDS,
+        "local_analysis": True,
+    }
+
+
+def _thorough() -> Dict[str, Any]:
+    # More cycles, a higher bar and several rewrite candidates per cycle
+    return {
+        "max_iterations": max(settings.MAX_ITERATIONS, 5),
+        "target_score": max(settings.TARGET_SCORE, 85.0),
+        "min_iteration_gain": min(settings.MIN_ITERATION_GAIN, 0.5),
+        "models": {},
+        "modification_candidates": 3,
+        "max_tokens": None,
+        "deadline_seconds": None,
+        "cycle_estimate_seconds": None,
+        "local_analysis": False,
+    }
+
+
+_TIERS = {
+    FAST: _fast,
+    BALANCED: _balanced,
+    THOROUGH: _thorough,
+}
+
+TIER_NAMES = tuple(_TIERS)
+
+
+def get_tier_config(tier: Optional[str] = None) -> Dict[str, Any]:
+    name = tier or settings.DEFAULT_LATENCY_TIER
+    if name not in _TIERS:
+        raise ValueError(f"Unknown latency tier: {name}. Expected one of {', '.join(TIER_NAMES)}")
+    config = _TIERS[name]()
+    config["tier"] = name
+    return config
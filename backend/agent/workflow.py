@@ -1,5 +1,6 @@
 # Resume optimization workflow using LangGraph
 # Checks if resume fits the job, then iteratively improves it until target score reached
+# An optional cover letter is written in a parallel branch and joined before END
 
 import uuid
 from typing import Callable, Dict, Any, Optional
@@ -7,20 +8,58 @@ from langgraph.graph import StateGraph, END
 from config import settings
 
 from .state import ResumeAgentState, create_initial_state
+from .tiers import get_tier_config
+from .load_shedding import load_shedder, apply_degradation
+from .dedup import duplicate_index, fingerprint, reusable_payload
+from .deadline import (
+    remaining_seconds,
+    with_deadline_fallback,
+    fallback_requirements,
+    fallback_analysis,
+    fallback_plan,
+    fallback_modification,
+)
 
 # Nodes
 from .nodes.job_requirements import extract_job_requirements
 from .nodes.resume_analysis import analyze_resume
-from .nodes.scoring import score_resume
+from .nodes.local_analysis import analyze_resume_locally
+from .nodes.scoring import score_resume, SCORE_VERSION
 from .nodes.planning import plan_improvements
 from .nodes.modification import modify_resume
 from .nodes.rescore import rescore_modified_resume
-from .nodes.fit_check import assess_job_fit
+from .nodes.fit_check import assess_job_fit, fit_settings
+from .nodes.cover_letter import generate_cover_letter
+from .nodes.llm_client import latency_percentile
+
+
+def _passthrough(state: ResumeAgentState) -> dict:
+    # No-op node used to give the loop a single exit that the join can wait on
+    return {}
+
+
+def _cycle_estimate_seconds(state: ResumeAgentState) -> float:
+    # Time one more plan/modify cycle is expected to take, from observed p95 latencies.
+    # Those are pooled over the default models, so smaller-model tiers bring their own.
+    if state.get("cycle_estimate_seconds") is not None:
+        return float(state["cycle_estimate_seconds"])
+    plan = latency_percentile("plan_improvements", 95)
+    modify = latency_percentile("modify_resume", 95)
+    if plan is None or modify is None:
+        return settings.DEADLINE_CYCLE_ESTIMATE_SECONDS
+    return plan + modify
+
+
+def _has_time_for_cycle(state: ResumeAgentState) -> bool:
+    remaining = remaining_seconds(state)
+    return remaining is None or remaining >= _cycle_estimate_seconds(state)
 
 
 def _route_after_fit(state: ResumeAgentState) -> str:
     if state.get("fit_decision") == "poor_fit":
         return "stop"
+    if not _has_time_for_cycle(state):
+        return "stop"
     return "proceed"
 
 
@@ -40,21 +79,72 @@ def _route_after_rescore(state: ResumeAgentState) -> str:
     if last_gain is not None and float(last_gain) < min_gain:
         return "stop"
 
+    # Return what we have rather than start a cycle that would overrun the deadline
+    if not _has_time_for_cycle(state):
+        return "stop"
+
     return "iterate"
 
 
-def create_agent_workflow():
-    # Build and compile LangGraph workflow
+def _analyze(state: ResumeAgentState) -> Dict[str, Any]:
+    # The LLM analysis only adds narrative; gaps and strengths come from the matcher
+    if state.get("narrative_analysis"):
+        return analyze_resume(state)
+    return analyze_resume_locally(state)
+
+
+def _reuse_or(field: str, node: Callable[[ResumeAgentState], Dict[str, Any]]):
+    # Take the field from a near-duplicate earlier run when one was found.
+    # Plans are only reused for the first iteration; later ones react to new scores.
+    def wrapped(state: ResumeAgentState) -> Dict[str, Any]:
+        reuse = state.get("reuse") or {}
+        first_plan = field == "improvement_plan" and not state.get("iteration_count")
+        if reuse.get(field) and (field != "improvement_plan" or first_plan):
+            duplicate_index.record_reuse(field)
+            decision = {
+                "node": field,
+                "action": "reused_previous_run",
+                "run_id": reuse.get("run_id"),
+            }
+            result = {field: reuse[field], "decision_log": state.get("decision_log", []) + [decision]}
+        else:
+            result = node(state)
+        if first_plan:
+            # Later plans are written against the modified resume and are not reusable
+            result["initial_improvement_plan"] = result.get(field)
+        return result
+
+    return wrapped
+
+
+def create_agent_workflow(tier: Optional[str] = None):
+    # Build and compile LangGraph workflow for a latency tier
+    tier_config = get_tier_config(tier)
     graph = StateGraph(ResumeAgentState)
 
+    # Fast tier derives the resume analysis locally instead of calling the LLM
+    if tier_config["local_analysis"]:
+        analyze_node = fallback_analysis
+    else:
+        analyze_node = with_deadline_fallback(_analyze, fallback_analysis)
+
     # Add all the agent nodes to the graph
-    graph.add_node("extract_requirements", extract_job_requirements)
-    graph.add_node("analyze_resume", analyze_resume)
+    graph.add_node(
+        "extract_requirements",
+        with_deadline_fallback(extract_job_requirements, fallback_requirements),
+    )
+    graph.add_node("analyze_resume", _reuse_or("resume_analysis", analyze_node))
     graph.add_node("score_initial", score_resume)
     graph.add_node("check_fit", assess_job_fit)
-    graph.add_node("plan_improvements", plan_improvements)
-    graph.add_node("modify_resume", modify_resume)
+    graph.add_node(
+        "plan_improvements",
+        _reuse_or("improvement_plan", with_deadline_fallback(plan_improvements, fallback_plan)),
+    )
+    graph.add_node("modify_resume", with_deadline_fallback(modify_resume, fallback_modification))
     graph.add_node("score_modified", rescore_modified_resume)
+    graph.add_node("write_cover_letter", generate_cover_letter)
+    graph.add_node("finish_loop", _passthrough)
+    graph.add_node("join_branches", _passthrough)
 
     # Wire up the execution flow
     graph.set_entry_point("extract_requirements")
@@ -63,11 +153,14 @@ def create_agent_workflow():
     graph.add_edge("analyze_resume", "check_fit")
     graph.add_edge("check_fit", "score_initial")
 
+    # Cover letter branch runs alongside the improvement loop
+    graph.add_edge("score_initial", "write_cover_letter")
+
     graph.add_conditional_edges(
         "score_initial",
         _route_after_fit,
         {
-            "stop": END,
+            "stop": "finish_loop",
             "proceed": "plan_improvements",
         },
     )
@@ -79,16 +172,31 @@ def create_agent_workflow():
         "score_modified",
         _route_after_rescore,
         {
-            "stop": END,
+            "stop": "finish_loop",
             "iterate": "plan_improvements",
         },
     )
 
+    # Wait for both the loop and the cover letter branch before finishing
+    graph.add_edge(["write_cover_letter", "finish_loop"], "join_branches")
+    graph.add_edge("join_branches", END)
+
     return graph.compile()
 
 
-# Create the workflow once at module load
-agent_app = create_agent_workflow()
+# Compiled graphs are cached per tier
+_compiled_apps: Dict[str, Any] = {}
+
+
+def get_agent_app(tier: Optional[str] = None):
+    name = get_tier_config(tier)["tier"]
+    if name not in _compiled_apps:
+        _compiled_apps[name] = create_agent_workflow(name)
+    return _compiled_apps[name]
+
+
+# Create the default workflow once at module load
+agent_app = get_agent_app()
 
 
 def run_optimization_with_events(
@@ -97,6 +205,10 @@ def run_optimization_with_events(
     user_id: str = "anonymous",
     user_llm_api_key: Optional[str] = None,
     run_id: Optional[str] = None,
+    include_cover_letter: Optional[bool] = None,
+    deadline_seconds: Optional[float] = None,
+    tier: Optional[str] = None,
+    narrative_analysis: Optional[bool] = None,
     event_callback: Optional[Callable[[str, Dict[str, Any]], None]] = None,
 ) -> ResumeAgentState:
     # Run optimization workflow with event callbacks
@@ -109,7 +221,20 @@ def run_optimization_with_events(
         job_description=job_description,
         original_resume=resume,
         user_llm_api_key=user_llm_api_key,
+        generate_cover_letter=include_cover_letter,
+        deadline_seconds=deadline_seconds,
+        tier=tier,
+        narrative_analysis=narrative_analysis,
     )
+    # Near-duplicate of an earlier run by this user: reuse its analysis and first plan
+    if settings.DEDUP_ENABLED:
+        initial_state["fingerprints"] = fingerprint(resume, job_description)
+        match = duplicate_index.lookup(user_id, initial_state["fingerprints"])
+        if match:
+            initial_state["reuse"] = {"run_id": match[0], **match[1]}
+    # Under provider pressure new runs are degraded instead of queueing up
+    graph_tier = apply_degradation(initial_state, load_shedder.evaluate())
+    app = get_agent_app(graph_tier or initial_state["tier"])
 
     if event_callback:
         event_callback("run_started", {"run_id": run_id})
@@ -119,7 +244,7 @@ def run_optimization_with_events(
     
     try:
         # Stream through the workflow execution
-        for event in agent_app.stream(initial_state):
+        for event in app.stream(initial_state):
             # LangGraph stream returns dict with node name as key
             for node_name, updated_state in event.items():
                 if event_callback:
@@ -142,11 +267,13 @@ def run_optimization_with_events(
         
         # If no events occurred, run invoke as fallback
         if final_state is None:
-            final_state = agent_app.invoke(initial_state)
+            final_state = app.invoke(initial_state)
     
     except Exception as e:
-        # If streaming fails, fall back to invoke
-        final_state = agent_app.invoke(initial_state)
+        # Re-running the graph would repeat every LLM call made so far
+        if event_callback:
+            event_callback("run_failed", {"run_id": run_id, "error": str(e)})
+        raise
     
     # Set final status
     if final_state.get("fit_decision") == "poor_fit":
@@ -154,6 +281,14 @@ def run_optimization_with_events(
     else:
         final_state["final_status"] = "completed"
     final_state["status"] = final_state["final_status"]
+    final_state["score_version"] = SCORE_VERSION
+    final_state["fit_settings"] = fit_settings()
+
+    if final_state["final_status"] == "completed":
+        duplicate_index.add(run_id, user_id, final_state.get("fingerprints"), reusable_payload(final_state))
+    # Keep only the reference in the stored result, not the copied payload
+    if final_state.get("reuse"):
+        final_state["reuse"] = {"run_id": final_state["reuse"].get("run_id")}
 
     if event_callback:
         event_callback(
@@ -177,6 +312,10 @@ def run_optimization(
     user_id: str = "anonymous",
     user_llm_api_key: Optional[str] = None,
     run_id: Optional[str] = None,
+    include_cover_letter: Optional[bool] = None,
+    deadline_seconds: Optional[float] = None,
+    tier: Optional[str] = None,
+    narrative_analysis: Optional[bool] = None,
 ) -> ResumeAgentState:
     # Wrapper to run workflow without event callbacks
     return run_optimization_with_events(
@@ -185,5 +324,9 @@ def run_optimization(
         user_id=user_id,
         user_llm_api_key=user_llm_api_key,
         run_id=run_id,
+        include_cover_letter=include_cover_letter,
+        deadline_seconds=deadline_seconds,
+        tier=tier,
+        narrative_analysis=narrative_analysis,
         event_callback=None,
     )
@@ -1,19 +1,43 @@
 
 # Resume optimization API endpoints
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, WebSocket, WebSocketDisconnect
+from fastapi import File, Form, Query, UploadFile
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from sqlalchemy import desc
-from typing import List
+from sqlalchemy import desc, func, tuple_
+from typing import List, Optional
+import base64
+import binascii
+import json
 import uuid
 from datetime import datetime
 
-from database.connection import get_db
+from config import settings
+from database.connection import get_db, SessionLocal
 from database.models import User
 from database.models.run import ResumeRun
-from auth.dependencies import get_current_user
-from schemas.agent import OptimizeRequest, OptimizeResponse, RunListItem, RunDetailResponse
+from auth.dependencies import get_current_user, get_user_from_token
+from schemas.agent import (
+    OptimizeRequest,
+    OptimizeResponse,
+    BatchOptimizeRequest,
+    RunListItem,
+    RunListPage,
+    RunDetailResponse,
+    ScoreRequest,
+    ScoreResponse,
+    RankRequest,
+    RankResponse,
+)
 from core.security import decrypt_api_key
+from agent.relevance import record_run_documents
+from agent.instant_score import instant_score, resolve_requirements
+from agent.live_scoring import LiveScoringSession, apply_changes
+from agent.ranking import rank_postings
+from agent.batch import prepare_resume, run_bounded
+from agent.screening import screen_candidates
 
 # Import agent workflow using proper package path
 try:
@@ -27,28 +51,64 @@ except ImportError as e:
 router = APIRouter(prefix="/api/agent", tags=["agent"])
 
 
-@router.post("/run", response_model=OptimizeResponse)
-def run_agent_workflow(
-    request: OptimizeRequest,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
-):
-    # Run agent optimization workflow
-    # Check if user has set their API key
-    if not current_user.encrypted_api_key:
+def _require_user_api_key(user: User, action: str = "running optimization") -> str:
+    # Decrypted LLM key of the user, or an HTTP error telling them to set one
+    if not user.encrypted_api_key:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Set your API key in Settings before running optimization.",
+            detail=f"Set your API key in Settings before {action}.",
         )
 
     try:
-        user_llm_api_key = decrypt_api_key(current_user.encrypted_api_key)
+        return decrypt_api_key(user.encrypted_api_key)
     except Exception:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Stored API key is invalid. Please set your API key again in Settings.",
         )
 
+
+def _save_run(db: Session, user_id, job_description: str, resume: str, result: dict) -> ResumeRun:
+    # Save to database (AG-37)
+    # Store all results in result_json JSONB field
+    db_run = ResumeRun(
+        user_id=user_id,
+        job_description=job_description,
+        original_resume_text=resume,
+        status=result.get("final_status", "completed"),
+        result_json=result,  # Store the entire result in JSONB
+        **ResumeRun.summary_columns(result),
+    )
+
+    db.add(db_run)
+    db.commit()
+    db.refresh(db_run)
+    record_run_documents(job_description, resume)
+    return db_run
+
+
+def _run_summary(db_run: ResumeRun, result: dict) -> dict:
+    # Compact per-run line for the streaming endpoints
+    return {
+        "run_id": str(db_run.id),
+        "final_status": result.get("final_status"),
+        "fit_decision": result.get("fit_decision"),
+        "ats_score_before": result.get("ats_score_before"),
+        "ats_score_after": result.get("ats_score_after"),
+        "improvement_delta": result.get("improvement_delta"),
+        "iteration_count": result.get("iteration_count", 0),
+    }
+
+
+@router.post("/run", response_model=OptimizeResponse)
+def run_agent_workflow(
+    request: OptimizeRequest,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    # Run agent optimization workflow
+    user_llm_api_key = _require_user_api_key(current_user)
+
     try:
         # Generate run ID
         run_id = f"run-{uuid.uuid4()}"
@@ -61,24 +121,16 @@ def run_agent_workflow(
             resume=request.resume,
             user_id=str(current_user.id),
             user_llm_api_key=user_llm_api_key,
-            run_id=run_id
+            run_id=run_id,
+            include_cover_letter=request.include_cover_letter,
+            deadline_seconds=request.deadline_seconds,
+            tier=request.tier,
+            narrative_analysis=request.narrative_analysis,
         )
         
         print(f"Agent completed: {result['final_status']}")
         
-        # Save to database (AG-37)
-        # Store all results in result_json JSONB field
-        db_run = ResumeRun(
-            user_id=current_user.id,
-            job_description=request.job_description,
-            original_resume_text=request.resume,
-            status=result.get("final_status", "completed"),
-            result_json=result  # Store the entire result in JSONB
-        )
-        
-        db.add(db_run)
-        db.commit()
-        db.refresh(db_run)
+        db_run = _save_run(db, current_user.id, request.job_description, request.resume, result)
         
         # Return response
         return OptimizeResponse(
@@ -92,6 +144,8 @@ def run_agent_workflow(
             improvement_delta=result.get("improvement_delta"),
             ats_breakdown_before=result.get("ats_breakdown_before"),
             ats_breakdown_after=result.get("ats_breakdown_after"),
+            match_spans_before=result.get("match_spans_before"),
+            match_spans_after=result.get("match_spans_after"),
             iteration_count=result.get("iteration_count", 0),
             final_status=result.get("final_status", "completed"),
             fit_decision=result.get("fit_decision", "unknown"),
@@ -100,7 +154,9 @@ def run_agent_workflow(
             job_requirements=result.get("job_requirements"),
             resume_analysis=result.get("resume_analysis"),
             improvement_plan=result.get("improvement_plan"),
-            decision_log=result.get("decision_log")
+            decision_log=result.get("decision_log"),
+            score_history=result.get("score_history"),
+            cover_letter=result.get("cover_letter"),
         )
         
     except Exception as e:
@@ -113,6 +169,227 @@ def run_agent_workflow(
         )
 
 
+@router.post("/batch")
+def run_agent_batch(
+    request: BatchOptimizeRequest,
+    current_user: User = Depends(get_current_user),
+):
+    # Optimize one resume against several postings, streamed as NDJSON
+    # <- {"index", "run_id", "final_status", "fit_decision", "ats_score_before", ...} as each run finishes
+    # <- {"index", "error"} for a failed run, then {"done": true, "completed", "failed"}
+    user_llm_api_key = _require_user_api_key(current_user)
+    user_id = current_user.id
+    prepare_resume(request.resume)
+
+    def optimize(job):
+        _, job_description = job
+        return run_optimization(
+            job_description=job_description,
+            resume=request.resume,
+            user_id=str(user_id),
+            user_llm_api_key=user_llm_api_key,
+            run_id=f"run-{uuid.uuid4()}",
+            include_cover_letter=request.include_cover_letter,
+            deadline_seconds=request.deadline_seconds,
+            tier=request.tier,
+            narrative_analysis=request.narrative_analysis,
+        )
+
+    def stream():
+        # The request's session is closed once streaming starts, so use our own
+        db = SessionLocal()
+        completed = failed = 0
+        try:
+            jobs = enumerate(request.job_descriptions)
+            for (index, job_description), result, error in run_bounded(optimize, jobs, settings.BATCH_MAX_CONCURRENCY):
+                if error is None:
+                    try:
+                        db_run = _save_run(db, user_id, job_description, request.resume, result)
+                    except Exception as e:
+                        db.rollback()
+                        error = e
+                if error is not None:
+                    print(f"Batch run {index} failed: {error}")
+                    failed += 1
+                    yield json.dumps({"index": index, "error": str(error)}) + "\n"
+                    continue
+                completed += 1
+                yield json.dumps({"index": index, **_run_summary(db_run, result)}) + "\n"
+            yield json.dumps({"done": True, "completed": completed, "failed": failed}) + "\n"
+        finally:
+            db.close()
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+
+@router.post("/screen")
+async def screen_resumes(
+    job_description: str = Form(..., min_length=50),
+    resumes: List[str] = Form([]),
+    files: List[UploadFile] = File([]),
+    fit_threshold: Optional[float] = Form(None, ge=0, le=1),
+    optimize: bool = Form(True),
+    current_user: User = Depends(get_current_user),
+):
+    # Recruiter mode: screen many resumes (text fields or PDF files) for one posting
+    # and optimize only the candidates at or above fit_threshold, streamed as NDJSON
+    # <- {"type": "screened", "index", "name", "ats_score", "fit_score", ...} per resume
+    # <- {"type": "ranking", "candidates": [...]} best first, with "selected" flags
+    # <- {"type": "optimized", "index", "name", "run_id", ...} or {"type": "error", ...}
+    # <- {"type": "done", "screened", "optimized", "failed"}
+    if not resumes and not files:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Send resumes or PDF files")
+    if len(resumes) + len(files) > settings.SCREENING_MAX_RESUMES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {settings.SCREENING_MAX_RESUMES} resumes per request",
+        )
+
+    user_llm_api_key = _require_user_api_key(current_user) if optimize else None
+    user_id = current_user.id
+
+    candidates = [{"text": text} for text in resumes]
+    for upload in files:
+        if not (upload.filename or "").endswith(".pdf"):
+            raise HTTPException(status_code=400, detail=f"Only PDF files are allowed: {upload.filename}")
+        file_bytes = await upload.read()
+        if len(file_bytes) > 5 * 1024 * 1024:
+            raise HTTPException(status_code=400, detail=f"File too large (max 5MB): {upload.filename}")
+        candidates.append({"name": upload.filename, "pdf": file_bytes})
+
+    def run_candidate(resume: str) -> dict:
+        return run_optimization(
+            job_description=job_description,
+            resume=resume,
+            user_id=str(user_id),
+            user_llm_api_key=user_llm_api_key,
+            run_id=f"run-{uuid.uuid4()}",
+        )
+
+    def stream():
+        db = SessionLocal()
+        counts = {"screened": 0, "optimized": 0, "failed": 0}
+        try:
+            for event in screen_candidates(
+                job_description,
+                candidates,
+                optimize=run_candidate,
+                fit_threshold=settings.SCREENING_FIT_THRESHOLD if fit_threshold is None else fit_threshold,
+                max_optimizations=settings.SCREENING_MAX_OPTIMIZATIONS if optimize else 0,
+                user_llm_api_key=user_llm_api_key,
+            ):
+                if event["type"] == "optimized":
+                    resume, result = event.pop("resume"), event.pop("state")
+                    try:
+                        db_run = _save_run(db, user_id, job_description, resume, result)
+                        event.update(_run_summary(db_run, result))
+                    except Exception as e:
+                        db.rollback()
+                        event = {"type": "error", "index": event["index"], "name": event["name"], "error": str(e)}
+                if event["type"] == "screened":
+                    counts["screened"] += 1
+                elif event["type"] == "optimized":
+                    counts["optimized"] += 1
+                elif event["type"] == "error":
+                    counts["failed"] += 1
+                yield json.dumps(event) + "\n"
+        except Exception as e:
+            # The response has already started; report the failure in the stream
+            counts["failed"] += 1
+            yield json.dumps({"type": "error", "error": str(e)}) + "\n"
+        finally:
+            db.close()
+        yield json.dumps({"type": "done", **counts}) + "\n"
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+
+@router.post("/score", response_model=ScoreResponse)
+def score_resume_only(
+    request: ScoreRequest,
+    current_user: User = Depends(get_current_user),
+):
+    # ATS score and fit check only - no LLM calls, nothing stored
+    return ScoreResponse(**instant_score(
+        job_description=request.job_description,
+        resume=request.resume,
+        job_requirements=request.job_requirements,
+        include_spans=request.include_spans,
+    ))
+
+
+@router.post("/rank", response_model=RankResponse)
+def rank_job_postings(
+    request: RankRequest,
+    current_user: User = Depends(get_current_user),
+):
+    # Rank postings for one resume locally; LLM analysis only for the top_k
+    user_llm_api_key = None
+    if request.top_k:
+        user_llm_api_key = _require_user_api_key(current_user, "analyzing top postings")
+
+    results = rank_postings(
+        resume=request.resume,
+        postings=[posting.model_dump() for posting in request.postings],
+        top_k=request.top_k,
+        user_llm_api_key=user_llm_api_key,
+    )
+    return RankResponse(results=results)
+
+
+def _user_for_token(token: Optional[str]) -> Optional[User]:
+    db = SessionLocal()
+    try:
+        return get_user_from_token(token, db)
+    finally:
+        db.close()
+
+
+@router.websocket("/live")
+async def live_scoring(websocket: WebSocket, token: Optional[str] = None):
+    # Live ATS score for an editor session
+    # -> {"type": "init", "job_description", "resume", "job_requirements"?}
+    # -> {"type": "edit", "changes": [{"start", "end", "text"}, ...]}
+    # -> {"type": "replace", "resume"}
+    # <- {"type": "score", "version", "ats_score", "ats_breakdown", ...} after each message
+    # <- {"type": "error", "detail"} for a message that cannot be applied; the session stays open
+    user = await run_in_threadpool(_user_for_token, token)
+    if not user:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    await websocket.accept()
+    session = None
+    try:
+        while True:
+            try:
+                message = json.loads(await websocket.receive_text())
+                if not isinstance(message, dict):
+                    raise ValueError("Messages must be JSON objects")
+                kind = message.get("type")
+                if kind == "init":
+                    requirements, source = resolve_requirements(
+                        message.get("job_description") or "",
+                        message.get("job_requirements"),
+                    )
+                    session = LiveScoringSession(requirements, message.get("resume") or "")
+                    await websocket.send_json({"type": "score", "requirements_source": source, **session.snapshot()})
+                    continue
+                if session is None:
+                    raise ValueError("Send an init message first")
+                if kind == "edit":
+                    apply_changes(session, message.get("changes"))
+                elif kind == "replace":
+                    session.reset(message.get("resume") or "")
+                else:
+                    raise ValueError(f"Unknown message type: {kind}")
+                await websocket.send_json({"type": "score", **session.snapshot()})
+            except (KeyError, TypeError, ValueError) as e:
+                await websocket.send_json({"type": "error", "detail": str(e)})
+    except WebSocketDisconnect:
+        return
+
+
 @router.get("/runs/{run_id}", response_model=RunDetailResponse)
 def get_run(
     run_id: str,
@@ -164,6 +441,8 @@ def get_run(
         improvement_delta=improvement_delta,
         ats_breakdown_before=result_json.get("ats_breakdown_before"),
         ats_breakdown_after=result_json.get("ats_breakdown_after"),
+        match_spans_before=result_json.get("match_spans_before"),
+        match_spans_after=result_json.get("match_spans_after"),
         
         iteration_count=result_json.get("iteration_count", 0),
         final_status=final_status,
@@ -180,27 +459,58 @@ def get_run(
     )
 
 
-@router.get("/runs", response_model=List[RunListItem])
+def _encode_cursor(created_at: datetime, run_id) -> str:
+    # Opaque token for the (created_at, id) position of the last run on a page
+    raw = json.dumps([created_at.isoformat(), str(run_id)]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, run_id = json.loads(raw)
+        return datetime.fromisoformat(created_at), uuid.UUID(run_id)
+    except (binascii.Error, ValueError, TypeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+
+@router.get("/runs", response_model=RunListPage)
 def get_user_runs(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
-    limit: int = 10,
-    skip: int = 0
+    limit: int = Query(10, ge=1, le=100),
+    cursor: Optional[str] = None,
 ):
-    # Get user's run history with pagination
-    runs = db.query(ResumeRun)\
-        .filter(ResumeRun.user_id == current_user.id)\
-        .order_by(desc(ResumeRun.created_at))\
-        .offset(skip)\
-        .limit(limit)\
+    # Get user's run history, newest first, one keyset page at a time
+    # Each page seeks past the previous page's last (created_at, id) on the
+    # history index, so deep pages cost the same as the first and runs added
+    # meanwhile never shift rows between pages.
+    # Only the summary columns are read, never result_json or the full job description
+    query = db.query(
+        ResumeRun.id,
+        ResumeRun.created_at,
+        func.substr(ResumeRun.job_description, 1, 101).label("job_description"),
+        ResumeRun.ats_score_before,
+        ResumeRun.ats_score_after,
+        ResumeRun.fit_decision,
+        ResumeRun.iteration_count,
+        ResumeRun.status,
+    )\
+        .filter(ResumeRun.user_id == current_user.id)
+    if cursor:
+        query = query.filter(tuple_(ResumeRun.created_at, ResumeRun.id) < tuple_(*_decode_cursor(cursor)))
+    # One extra row tells whether another page follows
+    runs = query\
+        .order_by(desc(ResumeRun.created_at), desc(ResumeRun.id))\
+        .limit(limit + 1)\
         .all()
-        
+    next_cursor = _encode_cursor(runs[limit - 1].created_at, runs[limit - 1].id) if len(runs) > limit else None
+    runs = runs[:limit]
+
     result_list = []
     for run in runs:
-        # Extract scores from result_json if available
-        result_json = run.result_json or {}
-        ats_score_before = result_json.get("ats_score_before")
-        ats_score_after = result_json.get("ats_score_after")
+        ats_score_before = run.ats_score_before
+        ats_score_after = run.ats_score_after
         
         # Calculate improvement delta if both scores are available
         improvement_delta = None
@@ -219,11 +529,13 @@ def get_user_runs(
                 ats_score_before=ats_score_before,
                 ats_score_after=ats_score_after,
                 improvement_delta=improvement_delta,
+                fit_decision=run.fit_decision,
+                iteration_count=run.iteration_count,
                 status=run.status.value if hasattr(run.status, 'value') else str(run.status)
             )
         )
     
-    return result_list
+    return RunListPage(items=result_list, next_cursor=next_cursor)
 
 
 @router.delete("/runs/{run_id}")
@@ -168,3 +168,34 @@ def get_current_user_optional(
     except (AuthenticationError, HTTPException):
         # Silently fail for optional authentication
         return None
+
+
+def get_user_from_token(token: Optional[str], db: Session) -> Optional[User]:
+    """
+    Resolve a raw JWT to its user, for connections that cannot send headers.
+
+    Browsers cannot set an Authorization header on a WebSocket handshake,
+    so the token arrives as a query parameter instead.
+
+    Args:
+        token: JWT access token, possibly missing
+        db: Database session
+
+    Returns:
+        User object if the token is valid, None otherwise
+    """
+    if not token:
+        return None
+
+    payload = decode_access_token(token)
+    if not payload or not payload.get("sub"):
+        logger.warning("WebSocket authentication failed: Invalid or expired token")
+        return None
+
+    try:
+        user_uuid = uuid.UUID(payload["sub"])
+    except ValueError:
+        logger.warning("WebSocket authentication failed: Invalid UUID format")
+        return None
+
+    return db.query(User).filter(User.id == user_uuid).first()
@@ -52,16 +52,79 @@ class Settings:
         "MODIFICATION_MODEL",
         "llama-3.3-70b-versatile"
     )
+    COVER_LETTER_MODEL: str = os.getenv(
+        "COVER_LETTER_MODEL",
+        "llama-3.3-70b-versatile"
+    )
     
     DEFAULT_TEMPERATURE: float = float(os.getenv("DEFAULT_TEMPERATURE", "0.2"))
     MAX_TOKENS: int = int(os.getenv("MAX_TOKENS", "4000"))
+
+    # Hedged requests: resend idempotent calls that outlive the node's p95 latency
+    LLM_HEDGING_ENABLED: bool = os.getenv("LLM_HEDGING_ENABLED", "false").lower() == "true"
+    LLM_HEDGE_MIN_SAMPLES: int = int(os.getenv("LLM_HEDGE_MIN_SAMPLES", "20"))
+    LLM_HEDGE_MAX_WORKERS: int = int(os.getenv("LLM_HEDGE_MAX_WORKERS", "16"))
+    LLM_LATENCY_WINDOW: int = int(os.getenv("LLM_LATENCY_WINDOW", "200"))
     
     # Agent tuning
     MAX_ITERATIONS: int = int(os.getenv("MAX_ITERATIONS", "3"))
     TARGET_SCORE: float = float(os.getenv("TARGET_SCORE", "75.0"))
     MIN_ITERATION_GAIN: float = float(os.getenv("MIN_ITERATION_GAIN", "1.0"))
+    # Overall time budget per run; 0 (the default) disables the deadline.
+    # Runs under a deadline make no client-side LLM retries.
+    RUN_DEADLINE_SECONDS: float = float(os.getenv("RUN_DEADLINE_SECONDS", "0"))
+    DEADLINE_MIN_REQUEST_SECONDS: float = float(os.getenv("DEADLINE_MIN_REQUEST_SECONDS", "2"))
+    DEADLINE_CYCLE_ESTIMATE_SECONDS: float = float(os.getenv("DEADLINE_CYCLE_ESTIMATE_SECONDS", "30"))
+    # Adaptive load shedding: degrade new runs while provider latency/errors are high
+    LOAD_SHEDDING_ENABLED: bool = os.getenv("LOAD_SHEDDING_ENABLED", "true").lower() == "true"
+    LOAD_SHED_P95_SECONDS: float = float(os.getenv("LOAD_SHED_P95_SECONDS", "20"))
+    LOAD_SHED_ERROR_RATE: float = float(os.getenv("LOAD_SHED_ERROR_RATE", "0.2"))
+    LOAD_SHED_WINDOW_SECONDS: float = float(os.getenv("LOAD_SHED_WINDOW_SECONDS", "120"))
+    LOAD_SHED_MIN_SAMPLES: int = int(os.getenv("LOAD_SHED_MIN_SAMPLES", "5"))
+    LOAD_SHED_COOLDOWN_SECONDS: float = float(os.getenv("LOAD_SHED_COOLDOWN_SECONDS", "30"))
+
+    # Latency tier used when a request does not pick one: fast, balanced or thorough
+    DEFAULT_LATENCY_TIER: str = os.getenv("DEFAULT_LATENCY_TIER", "balanced")
+    FAST_TIER_MODEL: str = os.getenv("FAST_TIER_MODEL", "llama-3.1-8b-instant")
+    FAST_TIER_DEADLINE_SECONDS: float = float(os.getenv("FAST_TIER_DEADLINE_SECONDS", "15"))
+    # Expected plan + modify time on FAST_TIER_MODEL; the pooled node latencies reflect the default models
+    FAST_TIER_CYCLE_ESTIMATE_SECONDS: float = float(os.getenv("FAST_TIER_CYCLE_ESTIMATE_SECONDS", "8"))
+    GENERATE_COVER_LETTER: bool = os.getenv("GENERATE_COVER_LETTER", "false").lower() == "true"
+    # LLM-written resume analysis; otherwise it is derived locally from keyword matches
+    NARRATIVE_ANALYSIS: bool = os.getenv("NARRATIVE_ANALYSIS", "false").lower() == "true"
     FIT_THRESHOLD_POOR: float = float(os.getenv("FIT_THRESHOLD_POOR", "0.15"))
     FIT_THRESHOLD_PARTIAL: float = float(os.getenv("FIT_THRESHOLD_PARTIAL", "0.40"))
+    # BM25 relevance joins the fit score once the runs corpus has this many documents
+    RELEVANCE_MIN_DOCUMENTS: int = int(os.getenv("RELEVANCE_MIN_DOCUMENTS", "20"))
+    RELEVANCE_FIT_WEIGHT: float = float(os.getenv("RELEVANCE_FIT_WEIGHT", "0.25"))
+    # Reuse analysis and first plan from a near-duplicate earlier run (MinHash similarity)
+    DEDUP_ENABLED: bool = os.getenv("DEDUP_ENABLED", "true").lower() == "true"
+    DEDUP_RESUME_THRESHOLD: float = float(os.getenv("DEDUP_RESUME_THRESHOLD", "0.9"))
+    DEDUP_JOB_THRESHOLD: float = float(os.getenv("DEDUP_JOB_THRESHOLD", "0.8"))
+    DEDUP_INDEX_SIZE: int = int(os.getenv("DEDUP_INDEX_SIZE", "5000"))
+    # Store character offsets of matched requirement terms for highlighting
+    MATCH_SPANS_ENABLED: bool = os.getenv("MATCH_SPANS_ENABLED", "true").lower() == "true"
+    # Optional JSON file of extra skill aliases, re-read when it changes
+    SKILL_ALIASES_PATH: str = os.getenv("SKILL_ALIASES_PATH", "")
+    SKILL_ALIASES_RELOAD_SECONDS: float = float(os.getenv("SKILL_ALIASES_RELOAD_SECONDS", "30"))
+
+    # Opt-in rule-based requirement extraction; the LLM is only called below this confidence
+    LOCAL_REQUIREMENTS_ENABLED: bool = os.getenv("LOCAL_REQUIREMENTS_ENABLED", "false").lower() == "true"
+    LOCAL_REQUIREMENTS_MIN_CONFIDENCE: float = float(os.getenv("LOCAL_REQUIREMENTS_MIN_CONFIDENCE", "0.75"))
+
+    # Long resumes are analyzed in chunks of at most this many characters
+    RESUME_CHUNK_CHARS: int = int(os.getenv("RESUME_CHUNK_CHARS", "6000"))
+    RESUME_ANALYSIS_MAX_WORKERS: int = int(os.getenv("RESUME_ANALYSIS_MAX_WORKERS", "4"))
+    # Concurrent analyze_resume calls for the top postings of a ranking
+    RANK_ANALYSIS_MAX_WORKERS: int = int(os.getenv("RANK_ANALYSIS_MAX_WORKERS", "4"))
+    # Workflows run at once for one /api/agent/batch request
+    BATCH_MAX_CONCURRENCY: int = int(os.getenv("BATCH_MAX_CONCURRENCY", "3"))
+    # Recruiter screening: size of the scoring process pool all requests share,
+    # and who goes on to full optimization
+    SCREENING_PROCESSES: int = int(os.getenv("SCREENING_PROCESSES") or os.cpu_count() or 2)
+    SCREENING_MAX_RESUMES: int = int(os.getenv("SCREENING_MAX_RESUMES", "200"))
+    SCREENING_FIT_THRESHOLD: float = float(os.getenv("SCREENING_FIT_THRESHOLD", "0.40"))
+    SCREENING_MAX_OPTIMIZATIONS: int = int(os.getenv("SCREENING_MAX_OPTIMIZATIONS", "10"))
     
     # External services
     LATEX_COMPILE_URL: str = os.getenv(
@@ -55,13 +55,47 @@ def ensure_user_api_key_columns():
             conn.execute(text(stmt))
 
 
+# Run columns added after the table was first created
+_RUN_SUMMARY_COLUMNS = {
+    "ats_score_before": "DOUBLE PRECISION",
+    "ats_score_after": "DOUBLE PRECISION",
+    "fit_decision": "VARCHAR",
+    "iteration_count": "INTEGER",
+}
+
+
+def ensure_run_summary_columns():
+    inspector = inspect(engine)
+    if "runs" not in inspector.get_table_names():
+        return
+
+    existing = {col["name"] for col in inspector.get_columns("runs")}
+    statements = [
+        f"ALTER TABLE runs ADD COLUMN {name} {sql_type}"
+        for name, sql_type in _RUN_SUMMARY_COLUMNS.items()
+        if name not in existing
+    ]
+    if statements:
+        with engine.begin() as conn:
+            for stmt in statements:
+                conn.execute(text(stmt))
+
+
 def ensure_runtime_schema():
     # Import models lazily to avoid circular import at module load time.
     from database.models.user import User
     from database.models.run import Run
+    from database.models.relevance_corpus import RelevanceCorpus
 
     # Ensure core tables exist (safe with checkfirst behavior).
-    Base.metadata.create_all(bind=engine, tables=[User.__table__, Run.__table__])
+    Base.metadata.create_all(
+        bind=engine,
+        tables=[User.__table__, Run.__table__, RelevanceCorpus.__table__],
+    )
 
     # Ensure incremental user columns exist for BYOK.
     ensure_user_api_key_columns()
+
+    # Denormalized run summary columns; the history index on existing
+    # tables is built by migrate_run_summaries.py, outside app startup.
+    ensure_run_summary_columns()
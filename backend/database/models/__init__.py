@@ -1,5 +1,6 @@
 # database models
 from .user import User
 from .run import Run, RunStatus, ResumeRun
+from .relevance_corpus import RelevanceCorpus
 
-__all__ = ["User", "Run", "RunStatus", "ResumeRun"]
+__all__ = ["User", "Run", "RunStatus", "ResumeRun", "RelevanceCorpus"]
@@ -0,0 +1,23 @@
+from sqlalchemy import BigInteger, Column, DateTime, Integer
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.sql import func
+
+from database.connection import Base
+
+
+class RelevanceCorpus(Base):
+    # BM25 statistics of every runs document created up to last_run_created_at,
+    # so startup only tokenizes the runs saved since they were written
+    __tablename__ = "relevance_corpus"
+
+    # Single row
+    id = Column(Integer, primary_key=True)
+
+    document_count = Column(Integer, nullable=False)
+    total_length = Column(BigInteger, nullable=False)
+    document_frequency = Column(JSONB, nullable=False)
+    last_run_created_at = Column(DateTime(timezone=True), nullable=True)
+
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    SINGLETON_ID = 1
@@ -1,7 +1,7 @@
 import enum
 import uuid
 
-from sqlalchemy import Column, DateTime, Enum, ForeignKey, String, Text
+from sqlalchemy import Column, DateTime, Enum, Float, ForeignKey, Index, Integer, String, Text
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -34,12 +34,35 @@ class Run(Base):
     optimized_resume_path = Column(String, nullable=True)
     result_json = Column(JSONB, nullable=True)
 
+    # Copied out of result_json when the run is saved, so the history list
+    # never has to read the JSONB document
+    ats_score_before = Column(Float, nullable=True)
+    ats_score_after = Column(Float, nullable=True)
+    fit_decision = Column(String, nullable=True)
+    iteration_count = Column(Integer, nullable=True)
+
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
     # Relationships
     user = relationship("User", backref="runs")
 
+    __table_args__ = (
+        # Run history: one user's runs, newest first; id breaks ties for the keyset cursor
+        Index("ix_runs_user_history", "user_id", created_at.desc(), id.desc()),
+    )
+
+    @staticmethod
+    def summary_columns(result: dict) -> dict:
+        # Values of the denormalized columns for a workflow result
+        iteration_count = result.get("iteration_count")
+        return {
+            "ats_score_before": result.get("ats_score_before"),
+            "ats_score_after": result.get("ats_score_after"),
+            "fit_decision": result.get("fit_decision"),
+            "iteration_count": int(iteration_count) if iteration_count is not None else None,
+        }
+
 
 # Backward compatible alias if any older code still imports ResumeRun.
 ResumeRun = Run
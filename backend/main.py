@@ -5,6 +5,11 @@ from api.routes.auth import router as auth_router
 from api.routes.user import router as user_router
 from database.connection import ensure_runtime_schema
 from config import settings
+from agent.nodes.llm_client import get_llm_stats
+from agent.load_shedding import load_shedder
+from agent.relevance import corpus_stats
+from agent.dedup import duplicate_index, reusable_payload
+from agent.nodes.skill_aliases import reload_aliases
 
 try:
     from api.routes.pdf import router as pdf_router
@@ -60,18 +65,116 @@ if AGENT_AVAILABLE:
 def startup():
     import threading
 
+    reload_aliases()
+
     def _migrate():
         try:
             ensure_runtime_schema()
             logger.info("Runtime schema ensured successfully")
         except Exception as exc:
             logger.exception("Failed to ensure runtime schema: %s", exc)
+            return
+
+        try:
+            _load_relevance_corpus()
+        except Exception as exc:
+            logger.exception("Failed to load relevance corpus: %s", exc)
+
+        try:
+            _load_duplicate_index()
+        except Exception as exc:
+            logger.exception("Failed to load duplicate index: %s", exc)
 
     # Run in a daemon thread so server starts immediately
     thread = threading.Thread(target=_migrate, daemon=True)
     thread.start()
 
 
+@app.on_event("shutdown")
+def shutdown():
+    from agent.screening import shutdown_pool
+
+    shutdown_pool()
+
+
+def _load_relevance_corpus():
+    # Seed BM25 document frequencies from the persisted statistics plus the runs saved
+    # since they were written, then persist the result; new runs are added as they are saved
+    from database.connection import SessionLocal
+    from database.models.run import Run
+    from database.models.relevance_corpus import RelevanceCorpus
+    from agent.relevance import CorpusStats
+
+    db = SessionLocal()
+    try:
+        stored = db.get(RelevanceCorpus, RelevanceCorpus.SINGLETON_ID)
+        # Built apart from corpus_stats, which already counts runs saved since startup
+        stats = CorpusStats()
+        watermark = None
+        if stored is not None:
+            stats.load({
+                "document_count": stored.document_count,
+                "total_length": stored.total_length,
+                "document_frequency": stored.document_frequency,
+            })
+            watermark = stored.last_run_created_at
+
+        query = db.query(Run.job_description, Run.original_resume_text, Run.created_at)
+        if watermark is not None:
+            query = query.filter(Run.created_at > watermark)
+        added = 0
+        for job_description, resume, created_at in query.order_by(Run.created_at).yield_per(500):
+            added += stats.add_documents([job_description, resume])
+            watermark = created_at or watermark
+
+        if stored is None or added:
+            data = stats.dump()
+            db.merge(RelevanceCorpus(
+                id=RelevanceCorpus.SINGLETON_ID,
+                document_count=data["document_count"],
+                total_length=data["total_length"],
+                document_frequency=data["document_frequency"],
+                last_run_created_at=watermark,
+            ))
+            db.commit()
+
+        corpus_stats.merge(stats.dump())
+        logger.info(
+            "Relevance corpus loaded with %s documents (%s tokenized at startup)",
+            stats.document_count, added,
+        )
+    finally:
+        db.close()
+
+
+def _load_duplicate_index():
+    # Index the most recent fingerprinted runs so resubmissions hit after a restart
+    from database.connection import SessionLocal
+    from database.models.run import Run
+    from sqlalchemy import desc
+
+    db = SessionLocal()
+    try:
+        # Only the JSON fields the index needs, not whole results
+        rows = db.query(
+            Run.id,
+            Run.user_id,
+            Run.result_json["fingerprints"],
+            Run.result_json["resume_analysis"],
+            Run.result_json["initial_improvement_plan"],
+        )\
+            .filter(Run.result_json["fingerprints"].isnot(None))\
+            .order_by(desc(Run.created_at))\
+            .limit(settings.DEDUP_INDEX_SIZE)\
+            .all()
+        # Oldest first so the index evicts in age order
+        for run_id, user_id, fingerprints, analysis, plan in reversed(rows):
+            payload = reusable_payload({"resume_analysis": analysis, "initial_improvement_plan": plan})
+            duplicate_index.add(str(run_id), str(user_id), fingerprints, payload)
+        logger.info("Duplicate index loaded with %s runs", duplicate_index.snapshot()["indexed_runs"])
+    finally:
+        db.close()
+
 
 @app.get("/")
 def root():
@@ -86,3 +189,14 @@ def root():
 @app.get("/health")
 def health():
     return {"status": "ok"}
+
+
+@app.get("/metrics")
+def metrics():
+    # Per-node LLM latency, error and hedging counters for this process
+    return {
+        "llm": get_llm_stats(),
+        "load_shedding": load_shedder.snapshot(),
+        "relevance_corpus": corpus_stats.snapshot(),
+        "dedup": duplicate_index.snapshot(),
+    }
@@ -0,0 +1,97 @@
+# Backfill the denormalized run summary columns from result_json and build
+# the run history index on an existing runs table
+# Walks the runs table in id order, one short transaction per batch, so it
+# can run against a live database and be stopped and restarted at any time.
+#
+#   python migrate_run_summaries.py --batch-size 1000
+
+import argparse
+import time
+
+from sqlalchemy import text
+
+from database.connection import engine, ensure_run_summary_columns
+
+_SELECT_IDS = """
+SELECT id FROM runs
+WHERE id > CAST(:after AS uuid)
+ORDER BY id
+LIMIT :limit
+"""
+
+# Rows already holding summary values (new runs, earlier backfills) are left alone
+_BACKFILL = """
+UPDATE runs
+SET ats_score_before = (result_json ->> 'ats_score_before')::double precision,
+    ats_score_after = (result_json ->> 'ats_score_after')::double precision,
+    fit_decision = result_json ->> 'fit_decision',
+    iteration_count = (result_json ->> 'iteration_count')::numeric::integer
+WHERE id = ANY(CAST(:ids AS uuid[]))
+  AND result_json IS NOT NULL
+  AND ats_score_before IS NULL
+  AND fit_decision IS NULL
+"""
+
+_MIN_UUID = "00000000-0000-0000-0000-000000000000"
+
+_HISTORY_INDEX = "ix_runs_user_history"
+_CREATE_HISTORY_INDEX = "CREATE INDEX {}IF NOT EXISTS ix_runs_user_history ON runs (user_id, created_at DESC, id DESC)"
+# Replaced by the history index; present where an early build of it ran
+_LEGACY_INDEX = "ix_runs_user_id_created_at"
+
+_INDEX_VALID = """
+SELECT i.indisvalid FROM pg_index i
+JOIN pg_class c ON c.oid = i.indexrelid
+WHERE c.relname = :name
+"""
+
+
+def ensure_history_index() -> None:
+    if engine.dialect.name != "postgresql":
+        with engine.begin() as conn:
+            conn.execute(text(_CREATE_HISTORY_INDEX.format("")))
+            conn.execute(text(f"DROP INDEX IF EXISTS {_LEGACY_INDEX}"))
+        return
+
+    # Built without blocking writes; CONCURRENTLY cannot run inside a transaction
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        valid = conn.execute(text(_INDEX_VALID), {"name": _HISTORY_INDEX}).scalar()
+        if valid is False:
+            # A failed concurrent build leaves an INVALID index behind under the same name
+            print(f"Rebuilding invalid index {_HISTORY_INDEX}")
+            conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {_HISTORY_INDEX}"))
+        if not valid:
+            print(f"Building index {_HISTORY_INDEX}")
+            conn.execute(text(_CREATE_HISTORY_INDEX.format("CONCURRENTLY ")))
+        conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {_LEGACY_INDEX}"))
+
+
+def backfill(batch_size: int = 1000, pause: float = 0.0) -> int:
+    ensure_run_summary_columns()
+    ensure_history_index()
+
+    last_id = _MIN_UUID
+    scanned = updated = 0
+    while True:
+        with engine.begin() as conn:
+            ids = [str(row[0]) for row in conn.execute(text(_SELECT_IDS), {"after": last_id, "limit": batch_size})]
+            if not ids:
+                break
+            updated += conn.execute(text(_BACKFILL), {"ids": ids}).rowcount
+        last_id = ids[-1]
+        scanned += len(ids)
+        print(f"Scanned {scanned} runs, updated {updated} (last id {last_id})")
+        if pause:
+            # Give the primary room between batches on busy databases
+            time.sleep(pause)
+
+    print(f"Backfill finished: {updated} of {scanned} runs updated")
+    return updated
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Backfill run summary columns from result_json")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--pause", type=float, default=0.0, help="seconds to sleep between batches")
+    args = parser.parse_args()
+    backfill(args.batch_size, args.pause)
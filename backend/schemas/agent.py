@@ -1,12 +1,82 @@
 
 # schemas for agent API endpoints
 from pydantic import BaseModel, Field
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Literal, Annotated
 
 
 class OptimizeRequest(BaseModel):
     job_description: str = Field(..., min_length=50)
     resume: str = Field(..., min_length=100)
+    include_cover_letter: Optional[bool] = None
+    deadline_seconds: Optional[float] = Field(None, gt=0, le=600)
+    tier: Optional[Literal["fast", "balanced", "thorough"]] = None
+    narrative_analysis: Optional[bool] = None
+
+
+class BatchOptimizeRequest(BaseModel):
+    resume: str = Field(..., min_length=100)
+    job_descriptions: List[Annotated[str, Field(min_length=50)]] = Field(..., min_length=1, max_length=20)
+    include_cover_letter: Optional[bool] = None
+    deadline_seconds: Optional[float] = Field(None, gt=0, le=600)
+    tier: Optional[Literal["fast", "balanced", "thorough"]] = None
+    narrative_analysis: Optional[bool] = None
+
+
+class ScoreRequest(BaseModel):
+    job_description: str = Field(..., min_length=1)
+    resume: str = Field(..., min_length=1)
+    # Requirements from an earlier run for this posting; skips extraction entirely
+    job_requirements: Optional[Dict[str, Any]] = None
+    # Return character offsets of matched terms for highlighting
+    include_spans: bool = False
+
+
+class ScoreResponse(BaseModel):
+    ats_score: float
+    ats_breakdown: Dict[str, float]
+    fit_decision: str
+    fit_reason: Optional[str] = None
+    fit_confidence: Optional[float] = None
+    fit_score: float
+    relevance_score: Optional[float] = None
+    job_requirements: Dict[str, Any]
+    requirements_source: Literal["request", "cache", "local"]
+    # Matched term -> flat [start, end, start, end, ...] offsets into the resume
+    match_spans: Optional[Dict[str, List[int]]] = None
+
+
+class RankPosting(BaseModel):
+    job_description: str = Field(..., min_length=1)
+    job_requirements: Optional[Dict[str, Any]] = None
+    # Caller's own label for the posting, echoed back
+    id: Optional[str] = None
+
+
+class RankRequest(BaseModel):
+    resume: str = Field(..., min_length=1)
+    postings: List[RankPosting] = Field(..., min_length=1, max_length=100)
+    # LLM analysis for this many of the best-ranked postings
+    top_k: int = Field(0, ge=0, le=10)
+
+
+class RankedPosting(BaseModel):
+    rank: int
+    index: int
+    id: Optional[str] = None
+    ats_score: float
+    ats_breakdown: Dict[str, float]
+    fit_decision: str
+    fit_score: float
+    relevance_score: Optional[float] = None
+    matched_required_count: int
+    required_count: int
+    job_requirements: Dict[str, Any]
+    requirements_source: Literal["request", "cache", "local"]
+    resume_analysis: Optional[Dict[str, Any]] = None
+
+
+class RankResponse(BaseModel):
+    results: List[RankedPosting]
 
 
 class OptimizeResponse(BaseModel):
@@ -26,6 +96,9 @@ class OptimizeResponse(BaseModel):
     improvement_delta: Optional[float] = None
     ats_breakdown_before: Optional[Dict[str, float]] = None
     ats_breakdown_after: Optional[Dict[str, float]] = None
+    # Matched term -> flat [start, end, ...] offsets into original / modified resume
+    match_spans_before: Optional[Dict[str, List[int]]] = None
+    match_spans_after: Optional[Dict[str, List[int]]] = None
 
     # Agent details
     iteration_count: int
@@ -58,9 +131,17 @@ class RunListItem(BaseModel):
     ats_score_before: Optional[float] = None
     ats_score_after: Optional[float] = None
     improvement_delta: Optional[float] = None
+    fit_decision: Optional[str] = None
+    iteration_count: Optional[int] = None
     status: str
 
 
+class RunListPage(BaseModel):
+    items: List[RunListItem]
+    # Pass back as ?cursor= for the next (older) page; None on the last page
+    next_cursor: Optional[str] = None
+
+
 class RunDetailResponse(OptimizeResponse):
     """Full detail of a run (same fields as optimize response)."""
     id: str
@@ -0,0 +1,43 @@
+import random
+
+from agent.nodes.batch_scoring import score_batch
+from agent.nodes.scoring import _score_resume_text
+
+
+VOCABULARY = [
+    "python", "go", "java", "javascript", "kubernetes", "docker", "sql", "c++", "node.js",
+    "machine learning", "ci/cd", "aws", "react", "apis", "data pipelines", "leadership",
+]
+FILLER = ["built", "led", "shipped", "team", "services", "experience", "skills", "education", "summary"]
+
+
+def _resume(rng):
+    lines = []
+    for _ in range(rng.randint(1, 60)):
+        words = rng.sample(VOCABULARY + FILLER, rng.randint(3, 9))
+        lines.append(rng.choice(["- ", "", "* "]) + " ".join(words))
+    return rng.choice(["\n", "\n\n"]).join(lines)
+
+
+def _posting(rng):
+    return {
+        "required_skills": rng.sample(VOCABULARY, rng.randint(0, 6)),
+        "preferred_skills": rng.sample(VOCABULARY, rng.randint(0, 3)),
+        "key_keywords": [rng.choice(VOCABULARY) for _ in range(rng.randint(0, 7))],
+    }
+
+
+def test_batch_matches_scalar_scorer_exactly():
+    rng = random.Random(7)
+    resumes = [_resume(rng) for _ in range(25)] + ["", r"\section{Skills} \textbf{Python}, Go"]
+    postings = [_posting(rng) for _ in range(12)] + [{}]
+
+    scores = score_batch(resumes, postings)
+
+    assert scores.shape == (len(resumes), len(postings))
+    totals = scores.rounded_totals()
+    for i, resume in enumerate(resumes):
+        for j, requirements in enumerate(postings):
+            expected = _score_resume_text(resume, requirements)
+            assert scores.result(i, j) == expected
+            assert totals[i][j] == expected[0]
@@ -0,0 +1,42 @@
+from agent.nodes.keyword_matcher import compile_requirements
+from agent.nodes.text_index import build_index, scan_tokens, term_tokens
+
+
+def test_terms_match_on_token_boundaries():
+    compiled = compile_requirements({"required_skills": ["Go", "Java", "SQL"]})
+
+    assert compiled.find("good javascript and postgresql") == set()
+    assert compiled.find("Go, Java and SQL") == {"go", "java", "sql"}
+
+
+def test_tech_tokens_keep_punctuation():
+    tokens = [t for t, _, _ in scan_tokens("C++, C#, Node.js and .NET; CI/CD.")]
+
+    assert tokens == ["c++", "c#", "node.js", "and", ".net", "ci", "cd"]
+    assert term_tokens("CI/CD") == term_tokens("ci cd")
+
+
+def test_multi_word_and_plural_terms():
+    compiled = compile_requirements({"key_keywords": ["REST API", "machine learning", "databases"]})
+
+    found = compiled.find("Built REST APIs, machine-learning models and a database layer")
+
+    assert found == {"rest api", "machine learning", "databases"}
+
+
+def test_index_offsets_point_into_original_text():
+    text = "Senior Python developer"
+    index = build_index(text)
+    start, end = index.span(index.find_positions(("python",))[0], 1)
+
+    assert text[start:end] == "Python"
+
+
+def test_compiled_requirements_are_cached_and_normalized():
+    requirements = {"required_skills": [" Python ", "FastAPI"], "key_keywords": ["API", ""]}
+
+    compiled = compile_requirements(requirements)
+
+    assert compiled is compile_requirements(dict(requirements))
+    assert compiled.required == ["python", "fastapi"]
+    assert compiled.keywords == ["api"]
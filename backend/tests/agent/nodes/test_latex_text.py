@@ -0,0 +1,68 @@
+from agent.nodes.latex_text import project_resume, looks_like_latex
+from agent.nodes.fit_check import assess_job_fit
+from agent.nodes.scoring import _score_resume_text
+
+
+LATEX_RESUME = r"""\documentclass{article}
+\usepackage[margin=1in]{geometry}
+\begin{document}
+% internal note: mention golang
+\textbf{Jane Doe} \href{https://example.com/javascript}{Portfolio}
+\section*{Experience}
+\begin{itemize}[leftmargin=*]
+  \item Ran \textbf{Kubernetes} clusters with Go \& Python, 50\% faster
+  \item Shipped C++ services
+\end{itemize}
+\section{Skills}
+Python, SQL
+\end{document}"""
+
+
+def test_projection_keeps_content_and_sections():
+    projection = project_resume(LATEX_RESUME)
+
+    assert projection.sections == ["Experience", "Skills"]
+    assert "Kubernetes clusters with Go & Python, 50% faster" in projection.text
+    assert "- Shipped C++ services" in projection.text
+    assert "\n\n" in projection.text
+    # Preamble, comments, URLs and command names are dropped
+    for dropped in ("documentclass", "geometry", "golang", "javascript", "textbf", "itemize"):
+        assert dropped not in projection.text
+
+
+def test_plain_text_is_unchanged_and_cached():
+    plain = "Summary\nBackend engineer - Python, SQL\n\nExperience\nAcme Corp, 2020 - 2024"
+    assert not looks_like_latex(plain)
+
+    projection = project_resume(plain)
+    assert projection.text == plain
+    assert projection.sections == ["Summary", "Experience"]
+    assert project_resume(plain) is projection
+
+
+def test_markup_is_not_scored_as_content():
+    requirements = {"required_skills": ["javascript", "kubernetes"], "key_keywords": ["geometry"]}
+
+    _, breakdown = _score_resume_text(LATEX_RESUME, requirements)
+    assert breakdown["skills"] == 15.0
+    assert breakdown["keywords"] == 0.0
+    assert breakdown["format"] >= 7
+
+    fit = assess_job_fit({"job_requirements": requirements, "original_resume": LATEX_RESUME})
+    assert fit["decision_log"][-1]["matched_required_count"] == 1
+
+
+def test_multi_argument_macro_arguments_stay_separate():
+    resume = r"""\begin{document}
+\resumeSubheading{Backend Engineer}{2020 -- 2024}{Acme}{Remote}
+\resumeItem{Skills}{Python, Docker}
+\end{document}"""
+    projection = project_resume(resume)
+
+    assert "Backend Engineer 2020 -- 2024 Acme Remote" in projection.text
+    assert "Skills Python, Docker" in projection.text
+    start = projection.text.index("Python")
+    assert resume[slice(*projection.source_span(start, start + 6))] == "Python"
+
+    score, breakdown = _score_resume_text(resume, {"required_skills": ["python"], "key_keywords": ["python"]})
+    assert breakdown["skills"] == 30
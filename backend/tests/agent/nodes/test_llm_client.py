@@ -0,0 +1,104 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from agent.nodes import llm_client
+from config import settings
+
+
+class FakeClient:
+    def __init__(self, delay, content):
+        self.delay = delay
+        self.content = content
+        self.closed = False
+        self.requests = []
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    def _create(self, **kwargs):
+        self.requests.append(kwargs)
+        time.sleep(self.delay)
+        message = SimpleNamespace(content=self.content)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+    def close(self):
+        self.closed = True
+
+
+def _seed_latency(node, seconds, count):
+    for _ in range(count):
+        llm_client.record_llm_call(node, seconds)
+
+
+def test_stats_track_latency_and_errors():
+    llm_client.reset_llm_stats()
+    _seed_latency("node_a", 0.1, 19)
+    llm_client.record_llm_call("node_a", 2.0)
+    llm_client.record_llm_call("node_a", 5.0, error=True)
+
+    stats = llm_client.get_llm_stats()["node_a"]
+
+    assert stats["calls"] == 21
+    assert stats["errors"] == 1
+    assert stats["p50_seconds"] == 0.1
+    assert stats["p95_seconds"] == 0.1
+
+
+def test_slow_primary_is_hedged_and_backup_wins():
+    llm_client.reset_llm_stats()
+    _seed_latency("node_b", 0.05, settings.LLM_HEDGE_MIN_SAMPLES)
+    clients = [FakeClient(1.0, "slow"), FakeClient(0.0, "fast")]
+
+    with patch.object(settings, "LLM_HEDGING_ENABLED", True), \
+            patch.object(llm_client, "build_groq_client", side_effect=clients):
+        response = llm_client.create_chat_completion({}, "node_b", hedge=True, model="m", messages=[])
+
+    stats = llm_client.get_llm_stats()["node_b"]
+    assert response.choices[0].message.content == "fast"
+    assert clients[0].closed
+    assert stats["hedged"] == 1
+    assert stats["hedge_wins"] == 1
+
+
+def test_no_hedge_without_enough_samples():
+    llm_client.reset_llm_stats()
+    clients = [FakeClient(0.0, "only")]
+
+    with patch.object(settings, "LLM_HEDGING_ENABLED", True), \
+            patch.object(llm_client, "build_groq_client", side_effect=clients):
+        response = llm_client.create_chat_completion({}, "node_c", hedge=True, model="m", messages=[])
+
+    assert response.choices[0].message.content == "only"
+    assert llm_client.get_llm_stats()["node_c"]["hedged"] == 0
+
+
+def test_time_queued_in_pool_does_not_trigger_hedge():
+    llm_client.reset_llm_stats()
+    _seed_latency("node_d", 0.05, settings.LLM_HEDGE_MIN_SAMPLES)
+    clients = [FakeClient(0.0, "queued")]
+    busy_pool = ThreadPoolExecutor(max_workers=1)
+    busy_pool.submit(time.sleep, 0.3)
+
+    with patch.object(settings, "LLM_HEDGING_ENABLED", True), \
+            patch.object(llm_client, "_hedge_executor", busy_pool), \
+            patch.object(llm_client, "build_groq_client", side_effect=clients):
+        response = llm_client.create_chat_completion({}, "node_d", hedge=True, model="m", messages=[])
+
+    busy_pool.shutdown()
+    assert response.choices[0].message.content == "queued"
+    assert llm_client.get_llm_stats()["node_d"]["hedged"] == 0
+
+
+def test_backup_timeout_is_what_is_left_of_the_deadline():
+    llm_client.reset_llm_stats()
+    _seed_latency("node_e", 0.05, settings.LLM_HEDGE_MIN_SAMPLES)
+    clients = [FakeClient(0.5, "slow"), FakeClient(0.0, "fast")]
+
+    with patch.object(settings, "LLM_HEDGING_ENABLED", True), \
+            patch.object(llm_client, "build_groq_client", side_effect=clients):
+        llm_client.create_chat_completion(
+            {"deadline_at": time.time() + 30}, "node_e", hedge=True, model="m", messages=[]
+        )
+
+    primary, backup = (client.requests[0]["timeout"] for client in clients)
+    assert backup < primary - 0.04
@@ -0,0 +1,47 @@
+from unittest.mock import patch
+
+from agent import workflow
+from agent.nodes.local_analysis import build_resume_analysis
+from agent.state import create_initial_state
+
+
+REQUIREMENTS = {
+    "required_skills": ["Python", "Kubernetes", "Terraform"],
+    "preferred_skills": ["Docker"],
+    "key_keywords": ["python", "microservices"],
+}
+
+RESUME = """Summary
+Backend engineer.
+
+Experience
+- Built Python services on k8s
+
+Skills
+Python, Docker"""
+
+
+def test_analysis_is_derived_from_matches():
+    analysis = build_resume_analysis(RESUME, REQUIREMENTS)
+
+    assert analysis["analysis_mode"] == "local"
+    assert analysis["matched_skills"] == ["python", "kubernetes"]
+    assert analysis["missing_keywords"] == ["terraform", "microservices"]
+    assert analysis["strengths"][0] == "Covers 2 of 3 required skills: python, kubernetes"
+    assert "Missing required skills: terraform" in analysis["weaknesses"]
+    assert "No education section" in analysis["weaknesses"]
+    assert any("terraform" in s for s in analysis["suggestions"])
+
+
+def test_llm_analysis_only_when_narrative_requested():
+    state = create_initial_state("u", "job", RESUME, narrative_analysis=False)
+    state["job_requirements"] = REQUIREMENTS
+
+    with patch.object(workflow, "analyze_resume", return_value={"resume_analysis": {"narrative": True}}) as llm:
+        local = workflow._analyze(state)
+        assert llm.call_count == 0
+        assert local["resume_analysis"]["analysis_mode"] == "local"
+
+        state["narrative_analysis"] = True
+        assert workflow._analyze(state) == {"resume_analysis": {"narrative": True}}
+        assert llm.call_count == 1
@@ -0,0 +1,92 @@
+from unittest.mock import MagicMock, patch
+
+from agent.nodes import job_requirements
+from agent.nodes.fit_check import assess_job_fit
+from agent.nodes.job_requirements import extract_job_requirements
+from agent.nodes.local_requirements import extract_requirements_locally
+
+
+STRUCTURED_JOB = """
+Senior Backend Engineer
+
+Requirements:
+- 5+ years Python experience
+- Django or FastAPI
+- PostgreSQL
+- REST API design
+- AWS
+
+Nice to have:
+- Docker
+- CI/CD
+"""
+
+DESIGN_JOB = """
+Product Designer
+
+You go the extra mile and excel at visual craft. Swift turnaround on feedback
+means the team can rest easy before the spring launch.
+
+Requirements:
+- 3+ years of product design
+- Strong communication skills
+- Figma
+"""
+
+PROSE_JOB = "We want a rockstar who loves building things and has 3 years of startup experience."
+
+
+def test_structured_posting_is_parsed_with_high_confidence():
+    requirements, confidence = extract_requirements_locally(STRUCTURED_JOB)
+
+    assert requirements["required_skills"] == ["python", "django or fastapi", "postgresql", "rest api", "aws"]
+    assert requirements["preferred_skills"] == ["docker", "ci/cd"]
+    assert requirements["experience_years"] == 5
+    assert requirements["key_keywords"][-4:] == ["docker", "ci/cd", "backend", "engineer"]
+    assert confidence == 1.0
+
+
+def test_everyday_words_are_not_skills():
+    requirements, confidence = extract_requirements_locally(DESIGN_JOB)
+
+    assert requirements["required_skills"] == ["communication"]
+    assert confidence < 0.75
+
+    listed, _ = extract_requirements_locally("Requirements:\n- Languages: Go, Swift\n- Java or Go\n- Excel")
+    assert listed["required_skills"] == ["go", "swift", "java or go", "excel"]
+
+
+def test_any_of_requirement_is_met_by_either_alternative():
+    requirements, _ = extract_requirements_locally(STRUCTURED_JOB)
+    resume = "Skills\nPython, FastAPI, Git"
+
+    result = assess_job_fit({"job_requirements": requirements, "original_resume": resume}, with_spans=True)
+
+    assert result["decision_log"][-1]["matched_required_count"] == 2
+    assert resume[slice(*result["match_spans_before"]["django or fastapi"])] == "FastAPI"
+
+
+def test_heading_cues_inline_labels_and_aliases():
+    requirements, _ = extract_requirements_locally("""## What you'll need
+* Python experience
+* Languages: Go, Rust
+## Preferred Qualifications
+* k8s""")
+
+    assert requirements["required_skills"] == ["python", "go", "rust"]
+    assert requirements["preferred_skills"] == ["kubernetes"]
+
+
+def test_llm_only_called_for_low_confidence_postings():
+    llm_response = MagicMock()
+    llm_response.choices[0].message.content = '{"required_skills": ["grit"], "key_keywords": []}'
+
+    with patch.object(job_requirements.settings, "LOCAL_REQUIREMENTS_ENABLED", True), \
+            patch.object(job_requirements, "create_chat_completion", return_value=llm_response) as llm:
+        structured = extract_job_requirements({"job_description": STRUCTURED_JOB + "\n", "decision_log": []})
+        assert llm.call_count == 0
+        assert structured["decision_log"][-1]["action"] == "extracted_locally"
+
+        prose = extract_job_requirements({"job_description": PROSE_JOB, "decision_log": []})
+        assert llm.call_count == 1
+        assert prose["job_requirements"]["required_skills"] == ["grit"]
@@ -0,0 +1,57 @@
+from agent.nodes.fit_check import assess_job_fit
+from agent.nodes.scoring import _score_resume_text
+
+
+REQUIREMENTS = {
+    "required_skills": ["python", "kubernetes"],
+    "preferred_skills": ["aws"],
+    "key_keywords": ["python", "ci/cd", "terraform"],
+}
+
+PLAIN = """Summary
+Python developer running k8s on Amazon Web Services.
+
+Experience
+- Built CI/CD pipelines in Python"""
+
+LATEX = r"""\documentclass{article}
+\begin{document}
+\section{Experience}
+\begin{itemize}
+  \item Ran \textbf{Kubernetes} with Python \& CI/CD
+\end{itemize}
+\end{document}"""
+
+
+def _texts(document, spans):
+    return {term: [document[s:e] for s, e in zip(flat[::2], flat[1::2])] for term, flat in spans.items()}
+
+
+def test_spans_point_into_plain_resume():
+    score, breakdown, spans = _score_resume_text(PLAIN, REQUIREMENTS, with_spans=True)
+
+    assert (score, breakdown) == _score_resume_text(PLAIN, REQUIREMENTS)
+    assert _texts(PLAIN, spans) == {
+        "python": ["Python", "Python"],
+        "kubernetes": ["k8s"],
+        "aws": ["Amazon Web Services"],
+        "ci/cd": ["CI/CD"],
+    }
+
+
+def test_spans_point_into_latex_source():
+    _, _, spans = _score_resume_text(LATEX, REQUIREMENTS, with_spans=True)
+
+    assert _texts(LATEX, spans) == {
+        "python": ["Python"],
+        "kubernetes": ["Kubernetes"],
+        "ci/cd": ["CI/CD"],
+    }
+
+
+def test_fit_check_spans_match_scoring():
+    _, _, spans = _score_resume_text(PLAIN, REQUIREMENTS, with_spans=True)
+
+    fit = assess_job_fit({"job_requirements": REQUIREMENTS, "original_resume": PLAIN}, with_spans=True)
+    assert fit["match_spans_before"] == spans
+    assert "match_spans_before" not in assess_job_fit({"job_requirements": REQUIREMENTS, "original_resume": PLAIN})
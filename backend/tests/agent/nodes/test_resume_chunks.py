@@ -0,0 +1,42 @@
+from agent.nodes.resume_analysis import _chunk_resume, _merge_analyses
+
+
+LONG_RESUME = "\n".join(
+    [f"Section{i}:\n" + "\n".join(f"- Built service {i}.{j} with Python" for j in range(40)) for i in range(6)]
+)
+
+
+def test_short_resume_is_single_chunk():
+    resume = "Skills:\nPython, FastAPI"
+    assert _chunk_resume(resume, 6000) == [resume]
+
+
+def test_long_resume_splits_on_sections():
+    chunks = _chunk_resume(LONG_RESUME, 2000)
+
+    assert len(chunks) > 1
+    assert all(len(c) <= 2000 for c in chunks)
+    # Every section heading starts a chunk or stays with its body
+    assert sum(c.count("Section") for c in chunks) == 6
+
+
+def test_merge_drops_keywords_found_in_other_chunks():
+    analyses = [
+        {"strengths": ["Python"], "missing_keywords": ["Docker", "Kubernetes"], "suggestions": ["Add metrics"]},
+        {"strengths": ["python", "APIs"], "missing_keywords": ["Kubernetes"], "weaknesses": ["No cloud"]},
+    ]
+
+    merged = _merge_analyses(analyses, "Python developer. Docker and APIs.")
+
+    assert merged["strengths"] == ["Python", "APIs"]
+    assert merged["missing_keywords"] == ["Kubernetes"]
+    assert merged["weaknesses"] == ["No cloud"]
+    assert merged["chunk_count"] == 2
+
+
+def test_merge_keeps_short_keywords_found_only_inside_longer_words():
+    analyses = [{"missing_keywords": ["Go", "R", "Java", "Docker"]}]
+
+    merged = _merge_analyses(analyses, "A good engineer. JavaScript and Docker.")
+
+    assert merged["missing_keywords"] == ["Go", "R", "Java"]
@@ -0,0 +1,59 @@
+import json
+import os
+from unittest.mock import patch
+
+from agent.nodes import skill_aliases
+from agent.nodes.keyword_matcher import compile_requirements
+from agent.nodes.text_index import build_index, term_tokens
+from config import settings
+
+
+def test_aliases_match_in_both_directions():
+    compiled = compile_requirements({"required_skills": ["Kubernetes", "PostgreSQL", "Machine Learning", "golang"]})
+
+    found = compiled.find("Ran k8s clusters backed by Postgres; ML models written in Go")
+    assert found == {"kubernetes", "postgresql", "machine learning", "golang"}
+
+
+def test_multi_word_alias_keeps_original_span():
+    text = "Deployed on Amazon Web Services daily"
+    index = build_index(text)
+    phrase = term_tokens("AWS")
+    position = index.find_positions(phrase)[0]
+
+    start, end = index.phrase_span(position, phrase)
+    assert text[start:end] == "Amazon Web Services"
+
+
+def test_alias_file_extends_table_and_reloads(tmp_path):
+    path = tmp_path / "aliases.json"
+    path.write_text(json.dumps({"terraform": ["tf"]}))
+
+    try:
+        with patch.object(settings, "SKILL_ALIASES_PATH", str(path)), \
+                patch.object(settings, "SKILL_ALIASES_RELOAD_SECONDS", 0):
+            skill_aliases.reload_aliases()
+            assert compile_requirements({"required_skills": ["Terraform"]}).find("tf modules") == {"terraform"}
+
+            path.write_text(json.dumps({"terraform": ["hcl"]}))
+            os.utime(path, (1, 1))
+            compiled = compile_requirements({"required_skills": ["Terraform"]})
+            assert compiled.find("hcl modules") == {"terraform"}
+            assert compiled.find("tf modules") == set()
+    finally:
+        skill_aliases.reload_aliases()
+
+
+def test_multi_word_alias_keeps_its_words_matchable():
+    pairs = [
+        ("SQL", "Tuned SQL Server and MS SQL databases"),
+        ("Node", "Backend in Node JS"),
+        ("Google", "Worked on the Google Cloud team"),
+        ("Amazon", "Certified in Amazon Web Services"),
+    ]
+    for term, text in pairs:
+        assert compile_requirements({"required_skills": [term]}).find(text.lower()) == {term.lower()}, term
+
+    compiled = compile_requirements({"required_skills": ["SQL Server", "GCP", "AWS Lambda"]})
+    found = compiled.find("ms sql reports on google cloud, amazon web services lambda jobs")
+    assert found == {"sql server", "gcp", "aws lambda"}
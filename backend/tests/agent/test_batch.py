@@ -0,0 +1,133 @@
+import json
+import threading
+import time
+from unittest.mock import patch
+
+from agent import batch
+from agent.dedup import _minhash
+from agent.nodes.text_index import _build_index
+
+
+def test_results_arrive_in_completion_order():
+    def slow_first(item):
+        time.sleep(0.2 if item == 0 else 0.0)
+        return item * 10
+
+    results = list(batch.run_bounded(slow_first, range(3), max_concurrency=3))
+
+    assert [item for item, _, _ in results][-1] == 0
+    assert sorted((item, result) for item, result, _ in results) == [(0, 0), (1, 10), (2, 20)]
+
+
+def test_concurrency_is_bounded_and_input_read_lazily():
+    lock = threading.Lock()
+    running = {"now": 0, "max": 0}
+    consumed = []
+
+    def work(item):
+        with lock:
+            running["now"] += 1
+            running["max"] = max(running["max"], running["now"])
+        time.sleep(0.01)
+        with lock:
+            running["now"] -= 1
+        return item
+
+    def items():
+        for i in range(20):
+            consumed.append(i)
+            yield i
+
+    stream = batch.run_bounded(work, items(), max_concurrency=2)
+    next(stream)
+    # Only the in-flight items plus one refill have been pulled from the input
+    assert len(consumed) <= 3
+
+    rest = list(stream)
+    assert len(rest) == 19
+    assert running["max"] <= 2
+
+
+def test_errors_are_yielded_not_raised():
+    def fail_on_odd(item):
+        if item % 2:
+            raise ValueError(f"bad {item}")
+        return item
+
+    results = {item: (result, error) for item, result, error in batch.run_bounded(fail_on_odd, range(4), 2)}
+
+    assert results[0] == (0, None)
+    assert str(results[1][1]) == "bad 1"
+
+
+def test_prepare_resume_fills_shared_caches():
+    resume = "Summary\nPython engineer preparing a batch of runs.\n\nExperience\n- Built APIs"
+    hits = _build_index.cache_info().hits
+    minhash_hits = _minhash.cache_info().hits
+
+    batch.prepare_resume(resume)
+    batch.prepare_resume(resume)
+
+    assert _build_index.cache_info().hits >= hits + 2
+    assert _minhash.cache_info().hits >= minhash_hits + 1
+
+
+def _write_jsonl(path, records):
+    path.write_text("".join(json.dumps(r) + "\n" for r in records))
+
+
+def test_cli_writes_results_and_resumes_from_partial_output(tmp_path):
+    input_path = tmp_path / "jobs.jsonl"
+    output_path = tmp_path / "results.jsonl"
+    _write_jsonl(input_path, [
+        {"id": "a", "resume": "Resume A", "job_description": "Job A", "tier": "fast"},
+        {"id": "b", "resume": "Resume B"},
+        {"id": "c", "resume": "Resume C", "job_description": "Job C"},
+    ])
+    # A finished line plus a line torn by a crash
+    output_path.write_text(json.dumps({"line": 1, "id": "a", "result": {}}) + "\n" + '{"line": 3, "id"')
+
+    def fake_run(job_description, resume, **kwargs):
+        return {"final_status": "completed", "job": job_description, "tier": kwargs.get("tier")}
+
+    with patch("agent.workflow.run_optimization", side_effect=fake_run) as run:
+        exit_code = batch.main([str(input_path), "--output", str(output_path), "-c", "2"])
+
+    assert exit_code == 1
+    assert run.call_count == 1
+    lines = [json.loads(line) for line in output_path.read_text().splitlines()]
+    by_line = {line["line"]: line for line in lines}
+    assert sorted(by_line) == [1, 2, 3]
+    assert "required" in by_line[2]["error"]
+    assert by_line[3]["result"]["job"] == "Job C"
+
+    # Only the failed line is retried
+    with patch("agent.workflow.run_optimization", side_effect=fake_run) as run:
+        batch.main([str(input_path), "--output", str(output_path), "--retry-failed"])
+    assert run.call_count == 0
+    assert len(output_path.read_text().splitlines()) == 4
+
+
+def test_cli_reports_lines_that_are_not_objects(tmp_path):
+    input_path = tmp_path / "jobs.jsonl"
+    output_path = tmp_path / "results.jsonl"
+    input_path.write_text('[1, 2]\n"resume"\n{"resume": "Resume A", "job_description": "Job A"}\nnot json\n')
+
+    with patch("agent.workflow.run_optimization", return_value={"final_status": "completed"}) as run:
+        exit_code = batch.main([str(input_path), "--output", str(output_path)])
+
+    assert exit_code == 1
+    assert run.call_count == 1
+    by_line = {line["line"]: line for line in map(json.loads, output_path.read_text().splitlines())}
+    assert "list" in by_line[1]["error"]
+    assert "str" in by_line[2]["error"]
+    assert by_line[3]["result"] == {"final_status": "completed"}
+    assert "Invalid JSON" in by_line[4]["error"]
+
+
+def test_line_set():
+    lines = batch._LineSet()
+    for n in (1, 9, 1000):
+        lines.add(n)
+
+    assert [n for n in range(1100) if n in lines] == [1, 9, 1000]
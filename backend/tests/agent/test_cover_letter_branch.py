@@ -0,0 +1,90 @@
+"""
+Cover letter branch: runs next to the improvement loop and is joined before END.
+LLM nodes are replaced with local fakes so the graph wiring can be checked offline.
+"""
+
+from unittest.mock import patch
+
+from agent import workflow
+from agent.state import create_initial_state
+
+
+RESUME = """
+Summary: Backend developer.
+Experience:
+- Built APIs with Python and FastAPI
+Skills: Python, FastAPI, PostgreSQL
+Education: BSc Computer Science
+"""
+
+
+def _fake_requirements(state):
+    return {"job_requirements": {
+        "required_skills": ["Python", "FastAPI", "PostgreSQL"],
+        "preferred_skills": ["Docker"],
+        "key_keywords": ["backend", "api"],
+    }}
+
+
+def _fake_analysis(state):
+    return {"resume_analysis": {"strengths": ["Python"], "missing_keywords": ["Docker"]}}
+
+
+def _fake_plan(state):
+    return {"improvement_plan": {"priority_changes": ["Add Docker"]}}
+
+
+def _fake_modify(state):
+    return {"modified_resume": state["original_resume"] + "\nDocker backend api"}
+
+
+def _fake_cover_letter(state):
+    if not state.get("generate_cover_letter"):
+        return {}
+    return {"cover_letter": "Dear hiring manager"}
+
+
+def _run(generate_cover_letter):
+    with patch.object(workflow, "extract_job_requirements", _fake_requirements), \
+            patch.object(workflow, "analyze_resume", _fake_analysis), \
+            patch.object(workflow, "plan_improvements", _fake_plan), \
+            patch.object(workflow, "modify_resume", _fake_modify), \
+            patch.object(workflow, "generate_cover_letter", _fake_cover_letter):
+        app = workflow.create_agent_workflow()
+
+    state = create_initial_state(
+        user_id="branch-test",
+        job_description="Backend engineer with Python",
+        original_resume=RESUME,
+        generate_cover_letter=generate_cover_letter,
+    )
+    return app.invoke(state)
+
+
+def test_cover_letter_is_joined_with_loop_result():
+    result = _run(generate_cover_letter=True)
+
+    assert result["cover_letter"] == "Dear hiring manager"
+    assert result["modified_resume"] is not None
+    assert result["ats_score_after"] is not None
+
+
+def test_cover_letter_skipped_when_not_requested():
+    result = _run(generate_cover_letter=False)
+
+    assert result["cover_letter"] is None
+    assert result["modified_resume"] is not None
+
+
+def test_request_without_cover_letter_flag_uses_setting():
+    from config import settings
+    from schemas.agent import OptimizeRequest
+
+    job = "Backend developer with Python, FastAPI and PostgreSQL experience wanted."
+    request = OptimizeRequest(job_description=job, resume=RESUME)
+    assert request.include_cover_letter is None
+
+    for enabled in (True, False):
+        with patch.object(settings, "GENERATE_COVER_LETTER", enabled):
+            state = create_initial_state("user", job, RESUME, generate_cover_letter=request.include_cover_letter)
+        assert state["generate_cover_letter"] is enabled
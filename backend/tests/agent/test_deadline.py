@@ -0,0 +1,106 @@
+import time
+
+from agent.deadline import DeadlineExceeded, request_timeout, with_deadline_fallback, fallback_plan
+from agent.workflow import _route_after_fit, _route_after_rescore
+
+
+def _loop_state(deadline_at):
+    return {
+        "ats_score_after": 50.0,
+        "iteration_count": 1,
+        "max_iterations": 3,
+        "target_score": 75.0,
+        "last_iteration_delta": 10.0,
+        "min_iteration_gain": 1.0,
+        "fit_decision": "good_fit",
+        "deadline_at": deadline_at,
+    }
+
+
+def test_routers_iterate_without_deadline():
+    state = _loop_state(None)
+    assert _route_after_rescore(state) == "iterate"
+    assert _route_after_fit(state) == "proceed"
+
+
+def test_routers_stop_when_cycle_does_not_fit():
+    state = _loop_state(time.time() + 1)
+    assert _route_after_rescore(state) == "stop"
+    assert _route_after_fit(state) == "stop"
+
+
+def test_request_timeout_uses_remaining_budget():
+    assert request_timeout({"deadline_at": None}) is None
+    assert 50 < request_timeout({"deadline_at": time.time() + 60}) <= 60
+
+    try:
+        request_timeout({"deadline_at": time.time() - 1})
+        assert False, "expected DeadlineExceeded"
+    except DeadlineExceeded:
+        pass
+
+
+def test_node_falls_back_after_deadline():
+    def plan_improvements(state):
+        raise DeadlineExceeded("out of time")
+
+    guarded = with_deadline_fallback(plan_improvements, fallback_plan)
+    result = guarded({
+        "deadline_at": time.time() - 1,
+        "job_requirements": {"key_keywords": ["api"]},
+        "resume_analysis": {"missing_keywords": ["Docker"]},
+        "decision_log": [],
+    })
+
+    assert result["improvement_plan"]["keyword_insertions"] == ["Docker"]
+    assert result["decision_log"][-1]["action"] == "deadline_fallback"
+
+
+def test_runs_have_no_deadline_and_keep_retries_by_default():
+    from agent.nodes.llm_client import build_groq_client
+    from agent.state import create_initial_state
+
+    state = create_initial_state("user", "Job description", "Resume", user_llm_api_key="key")
+
+    assert state["deadline_at"] is None
+    assert build_groq_client(state).max_retries == 2
+
+
+def test_requirement_extraction_falls_back_locally_after_deadline():
+    from unittest.mock import patch
+    from agent import workflow
+    from agent.state import create_initial_state
+
+    def extract_job_requirements(state):
+        raise DeadlineExceeded("out of time")
+
+    with patch.object(workflow, "extract_job_requirements", extract_job_requirements):
+        app = workflow.create_agent_workflow()
+
+    job = "Requirements:\n- Python\n- PostgreSQL\n"
+    state = create_initial_state("user", job, "Skills: Python", deadline_seconds=0.5)
+    result = app.invoke(state)
+
+    assert result["job_requirements"]["required_skills"] == ["python", "postgresql"]
+    assert result["decision_log"][0] == {"node": "extract_job_requirements", "action": "deadline_fallback"}
+
+
+def test_failed_run_is_not_run_again():
+    from unittest.mock import MagicMock, patch
+    from agent import workflow
+
+    app = MagicMock()
+    app.stream.side_effect = RuntimeError("provider down")
+    events = []
+
+    with patch.object(workflow, "get_agent_app", return_value=app):
+        try:
+            workflow.run_optimization_with_events(
+                "job", "resume", run_id="r1", event_callback=lambda name, data: events.append((name, data))
+            )
+            assert False, "expected RuntimeError"
+        except RuntimeError:
+            pass
+
+    app.invoke.assert_not_called()
+    assert events[-1] == ("run_failed", {"run_id": "r1", "error": "provider down"})
@@ -0,0 +1,103 @@
+import random
+from unittest.mock import patch
+
+from agent import workflow
+from agent.dedup import DuplicateIndex, fingerprint, minhash, reusable_payload, similarity
+from agent.state import create_initial_state
+
+
+_words = "built shipped led designed python postgresql docker services apis team data platform scale latency users".split()
+_rng = random.Random(5)
+RESUME = "\n".join("- " + " ".join(_rng.choice(_words) for _ in range(12)) + f" in {2000 + i}" for i in range(40))
+JOB = "Backend engineer. Requirements: Python, PostgreSQL, Docker, Kubernetes. Nice to have: Terraform."
+PAYLOAD = {"resume_analysis": {"missing_keywords": ["kubernetes"]}, "improvement_plan": {"keyword_insertions": ["kubernetes"]}}
+
+
+def test_minhash_similarity_tracks_edits():
+    base = minhash(RESUME)
+    assert similarity(base, minhash(RESUME)) == 1.0
+    assert similarity(base, minhash(RESUME.replace("in 2003", "in 2033"))) > 0.9
+    assert similarity(base, minhash("Nurse with ten years of ICU experience and patient care")) < 0.2
+    assert minhash("") is None
+
+
+def test_lookup_is_per_user_and_needs_similar_posting():
+    index = DuplicateIndex()
+    index.add("run-1", "alice", fingerprint(RESUME, JOB), PAYLOAD)
+
+    edited = fingerprint(RESUME.replace("in 2007", "during 2007"), JOB + " ")
+    assert index.lookup("alice", edited) == ("run-1", PAYLOAD)
+    assert index.lookup("bob", edited) is None
+    assert index.lookup("alice", fingerprint(RESUME, "Data scientist for pricing models in R and Stan")) is None
+
+    stats = index.snapshot()
+    assert (stats["lookups"], stats["hits"], stats["hit_rate"]) == (3, 1, 0.333)
+
+
+def test_reused_fields_skip_nodes():
+    state = create_initial_state("alice", JOB, RESUME)
+    state["reuse"] = {"run_id": "run-1", **PAYLOAD}
+
+    def never(state):
+        raise AssertionError("node should not run")
+
+    plan_node = workflow._reuse_or("improvement_plan", never)
+    result = plan_node(state)
+    assert result["improvement_plan"] == PAYLOAD["improvement_plan"]
+    assert result["decision_log"][-1]["action"] == "reused_previous_run"
+
+    # Later iterations plan against new scores
+    state["iteration_count"] = 1
+    with patch.object(workflow.duplicate_index, "record_reuse"):
+        fresh = workflow._reuse_or("improvement_plan", lambda s: {"improvement_plan": {"fresh": True}})(state)
+    assert fresh["improvement_plan"] == {"fresh": True}
+
+
+def test_first_plan_is_indexed_not_the_last():
+    state = create_initial_state("alice", JOB, RESUME)
+    plan_node = workflow._reuse_or("improvement_plan", lambda s: {"improvement_plan": {"iteration": s["iteration_count"]}})
+
+    state.update(plan_node(state))
+    state["iteration_count"] = 1
+    state.update(plan_node(state))
+
+    assert state["improvement_plan"] == {"iteration": 1}
+    assert reusable_payload(state)["improvement_plan"] == {"iteration": 0}
+
+
+def test_index_reloaded_from_runs_table_reuses_first_plan(tmp_path):
+    # The runs table is Postgres-typed; SQLite stands in with JSON and text ids
+    from sqlalchemy import create_engine
+    from sqlalchemy.dialects.postgresql import JSONB, UUID
+    from sqlalchemy.ext.compiler import compiles
+    from sqlalchemy.orm import sessionmaker
+
+    import main
+    from database.connection import Base
+    from database.models import Run, User
+
+    compiles(JSONB, "sqlite")(lambda type_, compiler, **kw: "JSON")
+    compiles(UUID, "sqlite")(lambda type_, compiler, **kw: "CHAR(32)")
+    engine = create_engine(f"sqlite:///{tmp_path / 'runs.db'}")
+    Base.metadata.create_all(engine, tables=[User.__table__, Run.__table__])
+    Session = sessionmaker(bind=engine)
+
+    fingerprints = fingerprint(RESUME, JOB)
+    with Session() as db:
+        user = User(email="alice@example.com")
+        db.add(user)
+        db.flush()
+        db.add(Run(user_id=user.id, result_json={
+            "fingerprints": fingerprints,
+            "resume_analysis": PAYLOAD["resume_analysis"],
+            "initial_improvement_plan": PAYLOAD["improvement_plan"],
+            "improvement_plan": {"keyword_insertions": ["from the last iteration"]},
+        }))
+        db.commit()
+        user_id = str(user.id)
+
+    index = DuplicateIndex()
+    with patch("database.connection.SessionLocal", Session), patch.object(main, "duplicate_index", index):
+        main._load_duplicate_index()
+
+    assert index.lookup(user_id, fingerprints)[1] == PAYLOAD
@@ -0,0 +1,49 @@
+from unittest.mock import patch
+
+from agent.instant_score import instant_score
+from agent.nodes import job_requirements
+from agent.nodes.job_requirements import cache_requirements
+from agent.nodes.local_requirements import extract_requirements_locally
+
+
+JOB = """Senior Backend Engineer
+We need 5+ years of experience building services in Python and Go.
+You will run workloads on Kubernetes and AWS, with PostgreSQL and Redis."""
+
+RESUME = """Summary
+Backend engineer - Python, golang, k8s and Postgres on Amazon Web Services.
+
+Experience
+- Built APIs"""
+
+
+def test_local_extractor_finds_skills_and_years():
+    requirements, _ = extract_requirements_locally(JOB)
+
+    assert requirements["experience_years"] == 5
+    assert requirements["required_skills"] == ["python", "go", "kubernetes", "aws", "postgresql", "redis"]
+
+
+def test_score_prefers_request_then_cache_then_local():
+    with patch.object(job_requirements, "create_chat_completion") as llm:
+        local = instant_score(JOB, RESUME)
+        assert local["requirements_source"] == "local"
+        assert local["fit_decision"] == "good_fit"
+        assert local["ats_breakdown"]["skills"] == 25.0
+
+        cache_requirements(JOB, {"required_skills": ["rust"], "key_keywords": ["rust"]})
+        cached = instant_score(" ".join(JOB.split()), RESUME)
+        assert cached["requirements_source"] == "cache"
+        assert cached["fit_decision"] == "poor_fit"
+
+        given = instant_score(JOB, RESUME, job_requirements={"required_skills": ["python"]})
+        assert given["requirements_source"] == "request"
+        assert given["ats_breakdown"]["skills"] == 30.0
+
+    llm.assert_not_called()
+
+
+def test_instant_score_does_not_log_fit_details(capsys):
+    instant_score(JOB, RESUME, job_requirements={"required_skills": ["python"]})
+
+    assert "[FIT_CHECK]" not in capsys.readouterr().out
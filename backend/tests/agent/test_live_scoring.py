@@ -0,0 +1,85 @@
+import random
+
+import pytest
+
+from agent.live_scoring import LiveScoringSession, apply_changes
+from agent.nodes.scoring import _score_resume_text
+
+
+REQUIREMENTS = {
+    "required_skills": ["python", "kubernetes", "sql", "react"],
+    "key_keywords": ["python", "docker", "leadership", "aws"],
+}
+WORDS = ["python", "k8s", "sql", "react", "docker", "leadership", "aws", "built", "team", "skills",
+         "experience", "education", "-", "*", "\n", "\n\n", " ", "pythonic"]
+
+
+def test_random_edits_match_full_rescoring():
+    rng = random.Random(3)
+    document = "Summary\nBackend engineer\n\nExperience\n- Built services"
+    session = LiveScoringSession(REQUIREMENTS, document)
+
+    for _ in range(400):
+        start = rng.randint(0, len(document))
+        end = min(len(document), start + rng.choice([0, 0, 1, 3, 12]))
+        text = "".join(rng.choice(WORDS) + rng.choice([" ", ""]) for _ in range(rng.randint(0, 3)))
+
+        session.apply_edit(start, end, text)
+        document = document[:start] + text + document[end:]
+
+        assert session.text == document
+        assert session.score() == _score_resume_text(document, REQUIREMENTS)
+
+
+def test_batched_changes_and_missing_terms():
+    session = LiveScoringSession(REQUIREMENTS, "Skills\nPython")
+    apply_changes(session, [
+        {"start": 13, "end": 13, "text": ", Docker"},
+        {"start": 0, "end": 0, "text": "Summary\n\n"},
+    ])
+
+    snapshot = session.snapshot()
+    assert session.text == "Summary\n\nSkills\nPython, Docker"
+    assert snapshot["version"] == 2
+    assert snapshot["missing_keywords"] == ["leadership", "aws"]
+    assert (snapshot["ats_score"], snapshot["ats_breakdown"]) == _score_resume_text(session.text, REQUIREMENTS)
+
+
+def test_latex_sessions_rescore_in_full():
+    source = "\\section{Skills}\n\\textbf{Python} and SQL"
+    session = LiveScoringSession(REQUIREMENTS, source)
+    session.apply_edit(len(source), len(source), ", React")
+
+    assert session.latex
+    assert session.score() == _score_resume_text(source + ", React", REQUIREMENTS)
+
+
+def test_rejects_out_of_range_edits():
+    session = LiveScoringSession(REQUIREMENTS, "short")
+    with pytest.raises(ValueError):
+        session.apply_edit(3, 10, "x")
+
+
+PHRASE_REQUIREMENTS = {
+    "required_skills": ["machine learning", "aws lambda", "sql"],
+    "key_keywords": ["team player", "node", "ci/cd", "google"],
+}
+PHRASE_WORDS = ["team", "player", "machine", "learning", "ml", "amazon", "web", "services", "lambda",
+                "aws", "node", "js", "sql", "server", "google", "cloud", "ci", "cd", "work", "history",
+                "-", "\n", "\n\n", " "]
+
+
+def test_multi_word_terms_across_lines_match_full_rescoring():
+    rng = random.Random(7)
+    document = "Summary\nteam\nplayer\n\nmachine learning"
+    session = LiveScoringSession(PHRASE_REQUIREMENTS, document)
+
+    for _ in range(3000):
+        start = rng.randint(0, len(document))
+        end = min(len(document), start + rng.choice([0, 1, 3, 12, 40]))
+        text = "".join(rng.choice(PHRASE_WORDS) + rng.choice([" ", "\n", ""]) for _ in range(rng.randint(0, 3)))
+
+        session.apply_edit(start, end, text)
+        document = document[:start] + text + document[end:]
+
+        assert session.score() == _score_resume_text(document, PHRASE_REQUIREMENTS)
@@ -0,0 +1,58 @@
+from unittest.mock import patch
+
+from agent.load_shedding import (
+    LoadShedder,
+    apply_degradation,
+    NORMAL,
+    FEWER_ITERATIONS,
+    SKIP_ANALYSIS,
+)
+from agent.nodes import llm_client
+from agent.state import create_initial_state
+from config import settings
+
+
+def _record(node, seconds, count, error=False):
+    for _ in range(count):
+        llm_client.record_llm_call(node, seconds, error=error)
+
+
+def test_degrades_one_level_per_evaluation_and_recovers():
+    llm_client.reset_llm_stats()
+    shedder = LoadShedder()
+
+    with patch.object(settings, "LOAD_SHEDDING_ENABLED", True), \
+            patch.object(settings, "LOAD_SHED_COOLDOWN_SECONDS", 0):
+        _record("modify_resume", settings.LOAD_SHED_P95_SECONDS * 2, settings.LOAD_SHED_MIN_SAMPLES)
+        assert shedder.evaluate() == FEWER_ITERATIONS
+        assert shedder.evaluate() == FEWER_ITERATIONS + 1
+
+        llm_client.reset_llm_stats()
+        _record("modify_resume", 0.5, settings.LOAD_SHED_MIN_SAMPLES)
+        assert shedder.evaluate() == FEWER_ITERATIONS
+        assert shedder.evaluate() == NORMAL
+
+    assert shedder.snapshot()["level_name"] == "normal"
+
+
+def test_error_rate_counts_as_pressure():
+    llm_client.reset_llm_stats()
+    shedder = LoadShedder()
+
+    with patch.object(settings, "LOAD_SHEDDING_ENABLED", True), \
+            patch.object(settings, "LOAD_SHED_COOLDOWN_SECONDS", 0):
+        _record("plan_improvements", 1.0, settings.LOAD_SHED_MIN_SAMPLES, error=True)
+        assert shedder.evaluate() == FEWER_ITERATIONS
+
+
+def test_apply_degradation_levels():
+    state = create_initial_state("u", "job", "resume", tier="thorough")
+    assert apply_degradation(state, NORMAL) is None
+    assert state["max_iterations"] > 1
+
+    assert apply_degradation(state, SKIP_ANALYSIS) == "fast"
+    assert state["max_iterations"] == 1
+    assert state["modification_candidates"] == 1
+    assert state["models"]["modify_resume"] == settings.FAST_TIER_MODEL
+    assert state["cycle_estimate_seconds"] == settings.FAST_TIER_CYCLE_ESTIMATE_SECONDS
+    assert state["degradation_level"] == SKIP_ANALYSIS
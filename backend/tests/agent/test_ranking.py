@@ -0,0 +1,64 @@
+from unittest.mock import patch
+
+from agent import ranking
+from agent.instant_score import instant_score
+from agent.ranking import rank_postings
+
+
+RESUME = """Summary
+Backend engineer - Python, Go, Kubernetes and PostgreSQL.
+
+Experience
+- Built APIs on AWS"""
+
+BACKEND = {
+    "required_skills": ["python", "go", "kubernetes"],
+    "preferred_skills": ["aws"],
+    "key_keywords": ["python", "postgresql", "api"],
+}
+FRONTEND = {
+    "required_skills": ["react", "typescript"],
+    "preferred_skills": [],
+    "key_keywords": ["react", "css"],
+}
+MIXED = {
+    "required_skills": ["python", "react"],
+    "preferred_skills": [],
+    "key_keywords": ["python", "react"],
+}
+
+POSTINGS = [
+    {"id": "frontend", "job_description": "Frontend role", "job_requirements": FRONTEND},
+    {"id": "backend", "job_description": "Backend role", "job_requirements": BACKEND},
+    {"id": "mixed", "job_description": "Full stack role", "job_requirements": MIXED},
+]
+
+
+def test_postings_ranked_by_fit_with_instant_scores():
+    with patch.object(ranking, "analyze_resume") as llm:
+        results = rank_postings(RESUME, POSTINGS)
+
+    llm.assert_not_called()
+    assert [r["id"] for r in results] == ["backend", "mixed", "frontend"]
+    assert [r["rank"] for r in results] == [1, 2, 3]
+    for result in results:
+        single = instant_score(POSTINGS[result["index"]]["job_description"], RESUME, result["job_requirements"])
+        assert result["ats_score"] == single["ats_score"]
+        assert result["ats_breakdown"] == single["ats_breakdown"]
+        assert result["fit_score"] == single["fit_score"]
+        assert result["resume_analysis"] is None
+
+
+def test_only_top_k_are_analyzed():
+    with patch.object(ranking, "analyze_resume", return_value={"resume_analysis": {"strengths": ["x"]}}) as llm:
+        results = rank_postings(RESUME, POSTINGS, top_k=2, user_llm_api_key="key")
+
+    assert llm.call_count == 2
+    assert [r["resume_analysis"] is not None for r in results] == [True, True, False]
+
+
+def test_failed_analysis_falls_back_to_local():
+    with patch.object(ranking, "analyze_resume", side_effect=RuntimeError("rate limited")):
+        results = rank_postings(RESUME, POSTINGS, top_k=1)
+
+    assert results[0]["resume_analysis"]["analysis_mode"] == "local"
@@ -0,0 +1,77 @@
+from unittest.mock import patch
+
+from agent.relevance import CorpusStats, corpus_stats
+from agent.nodes.fit_check import assess_job_fit
+from config import settings
+
+
+REQUIREMENTS = {"required_skills": ["python", "terraform"], "key_keywords": ["kubernetes"]}
+
+
+def _corpus():
+    stats = CorpusStats()
+    # "python" appears everywhere, "terraform" is rare
+    stats.add_documents([f"python developer role {i}" for i in range(30)])
+    stats.add_documents(["terraform and python infrastructure", "python kubernetes platform"])
+    return stats
+
+
+def test_rare_terms_weigh_more():
+    stats = _corpus()
+    assert stats.idf("terraform") > stats.idf("python")
+
+    with_rare = stats.relevance(REQUIREMENTS, "Platform engineer: terraform modules")
+    with_common = stats.relevance(REQUIREMENTS, "Platform engineer: python scripts")
+    assert with_rare > with_common > 0
+
+
+def test_resume_covering_every_term_scores_near_one():
+    resume = "Platform engineer building python services with terraform on kubernetes"
+    stats = CorpusStats()
+    # Documents of about the resume's length, as real resumes and postings are
+    stats.add_documents([f"Backend engineer building java services with ansible on openstack {i}" for i in range(30)])
+    stats.add_document(resume)
+
+    assert stats.relevance(REQUIREMENTS, resume) >= 0.9
+    assert stats.relevance(REQUIREMENTS, resume + " python python python") <= 1.0
+
+
+def test_counts_are_incremental_and_ranking_orders_by_relevance():
+    stats = _corpus()
+    before = stats.snapshot()["documents"]
+    stats.add_document("Site reliability with Terraform")
+    assert stats.snapshot()["documents"] == before + 1
+
+    ranked = stats.rank(REQUIREMENTS, ["cooking", "python terraform kubernetes", "python"])
+    assert [position for position, _ in ranked] == [1, 2, 0]
+    assert stats.relevance({}, "python") == 0.0
+
+
+def test_merging_persisted_stats_matches_one_pass():
+    # Startup merges the stored statistics with the runs saved after them
+    whole = _corpus()
+    stored = _corpus()
+    recent = CorpusStats()
+    for stats in (whole, recent):
+        stats.add_documents(["terraform modules", "go services"])
+
+    stored.merge(recent.dump())
+
+    assert stored.dump() == whole.dump()
+
+
+def test_fit_check_blends_relevance_only_with_enough_documents():
+    state = {"job_requirements": REQUIREMENTS, "original_resume": "python and terraform, no orchestration"}
+
+    corpus_stats.reset()
+    unblended = assess_job_fit(state)["decision_log"][-1]["fit_score"]
+
+    corpus_stats.add_documents([f"python developer role {i}" for i in range(30)])
+    try:
+        with patch.object(settings, "RELEVANCE_MIN_DOCUMENTS", 10):
+            result = assess_job_fit(state)
+    finally:
+        corpus_stats.reset()
+
+    assert 0 < result["relevance_score"] < 1
+    assert result["decision_log"][-1]["fit_score"] != unblended
@@ -0,0 +1,102 @@
+import json
+
+from agent import rescoring
+from agent.nodes.scoring import SCORE_VERSION, _score_resume_text
+
+
+REQUIREMENTS = {
+    "required_skills": ["python", "docker"],
+    "preferred_skills": ["kubernetes"],
+    "experience_years": 3,
+    "key_keywords": ["python", "docker", "kubernetes", "api"],
+}
+
+RESUME = """Summary
+Backend engineer working in Python.
+
+Experience
+- Built an API used by 10k customers"""
+
+MODIFIED = RESUME + "\n- Shipped services with Docker and Kubernetes"
+
+
+def test_rescore_result_matches_current_scorer():
+    patch = rescoring.rescore_result(RESUME, REQUIREMENTS, MODIFIED)
+
+    before, _ = _score_resume_text(RESUME, REQUIREMENTS)
+    after, _ = _score_resume_text(MODIFIED, REQUIREMENTS)
+    assert patch["ats_score_before"] == before
+    assert patch["ats_score_after"] == after
+    assert patch["improvement_delta"] == round(after - before, 2)
+    assert patch["fit_decision"] in ("good_fit", "poor_fit")
+    assert patch["score_version"] == SCORE_VERSION
+    json.dumps(patch)
+
+
+def test_rejected_runs_only_get_before_scores():
+    patch = rescoring.rescore_result(RESUME, REQUIREMENTS, None)
+
+    assert "ats_score_after" not in patch
+    assert "improvement_delta" not in patch
+
+
+def test_rows_with_json_text_requirements():
+    run_id, patch = rescoring._rescore_row(("abc", RESUME, json.dumps(REQUIREMENTS), None, None, None))
+
+    assert run_id == "abc"
+    assert patch == rescoring.rescore_result(RESUME, REQUIREMENTS, None)
+
+
+def test_fit_decision_stays_consistent_with_final_status():
+    completed = rescoring.rescore_result(RESUME, REQUIREMENTS, MODIFIED, "completed")
+    assert completed["fit_decision"] != "poor_fit"
+
+    # Now a good fit, but the run was rejected and never optimized
+    rejected = rescoring.rescore_result(RESUME, REQUIREMENTS, None, "rejected_poor_fit")
+    assert "fit_decision" not in rejected
+    assert rejected["ats_score_before"] == completed["ats_score_before"]
+
+
+def test_workers_fit_check_with_the_loaded_corpus():
+    corpus = rescoring.CorpusStats()
+    corpus.add_documents([f"python developer role {i}" for i in range(30)])
+    try:
+        rescoring._init_worker(corpus.dump())
+        assert rescoring.corpus_stats.document_count == 30
+    finally:
+        rescoring.corpus_stats.reset()
+
+
+def test_checkpoint_resumes_only_for_same_version(tmp_path):
+    path = str(tmp_path / "checkpoint.json")
+    assert rescoring._load_checkpoint(path) == rescoring._MIN_UUID
+
+    rescoring._save_checkpoint(path, "11111111-1111-1111-1111-111111111111", 500)
+    assert rescoring._load_checkpoint(path) == "11111111-1111-1111-1111-111111111111"
+
+    with open(path, "w") as f:
+        json.dump({"last_id": "11111111-1111-1111-1111-111111111111", "score_version": SCORE_VERSION - 1}, f)
+    assert rescoring._load_checkpoint(path) == rescoring._MIN_UUID
+
+
+def test_score_history_follows_the_rescored_ends():
+    patch = rescoring.rescore_result(RESUME, REQUIREMENTS, MODIFIED, "completed", [10.0, 20.0, 30.0])
+
+    assert patch["score_history"] == [patch["ats_score_before"], 20.0, patch["ats_score_after"]]
+    assert rescoring.rescore_result(RESUME, REQUIREMENTS, None, "rejected_poor_fit", [10.0])["score_history"] == [
+        patch["ats_score_before"]
+    ]
+    assert "score_history" not in rescoring.rescore_result(RESUME, REQUIREMENTS, None)
+
+
+def test_fit_threshold_change_invalidates_stamp_and_checkpoint(tmp_path):
+    from unittest.mock import patch as patch_setting
+    from config import settings
+
+    path = str(tmp_path / "checkpoint.json")
+    rescoring._save_checkpoint(path, "11111111-1111-1111-1111-111111111111", 500)
+    stamped = rescoring.rescore_result(RESUME, REQUIREMENTS, None)["fit_settings"]
+
+    with patch_setting.object(settings, "FIT_THRESHOLD_POOR", settings.FIT_THRESHOLD_POOR + 0.05):
+        assert rescoring.rescore_result(RESUME, REQUIREMENTS, None)["fit_settings"] != stamped
+        assert rescoring._load_checkpoint(path) == rescoring._MIN_UUID
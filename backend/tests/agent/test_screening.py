@@ -0,0 +1,103 @@
+from unittest.mock import patch
+
+from agent import screening
+from agent.instant_score import instant_score
+
+
+REQUIREMENTS = {
+    "required_skills": ["python", "kubernetes", "postgresql"],
+    "preferred_skills": ["aws"],
+    "experience_years": 3,
+    "key_keywords": ["python", "kubernetes", "postgresql", "api"],
+}
+
+STRONG = """Summary
+Backend engineer - Python, Kubernetes, PostgreSQL on AWS.
+
+Experience
+- Built an API serving 2M requests a day"""
+
+PARTIAL = """Summary
+Python developer.
+
+Experience
+- Wrote scripts"""
+
+WEAK = """Summary
+Graphic designer.
+
+Experience
+- Brand identities for startups"""
+
+
+def _run(candidates, optimize=None, threshold=0.4, limit=10):
+    calls = []
+
+    def fake_optimize(resume):
+        calls.append(resume)
+        if optimize:
+            return optimize(resume)
+        return {"final_status": "completed"}
+
+    with patch.object(screening, "extract_job_requirements", return_value={"job_requirements": REQUIREMENTS}) as extract:
+        events = list(screening.screen_candidates("Backend role", candidates, fake_optimize, threshold, limit, "user-key"))
+    extract.assert_called_once()
+    return events, calls
+
+
+def test_screens_ranks_and_optimizes_only_above_threshold():
+    candidates = [{"text": WEAK, "name": "weak"}, {"text": STRONG, "name": "strong"}, {"text": PARTIAL}]
+    events, calls = _run(candidates, threshold=0.25)
+
+    kinds = [e["type"] for e in events]
+    assert kinds[:3] == ["screened"] * 3
+    assert kinds[3] == "ranking"
+
+    ranking = events[3]["candidates"]
+    assert [c["name"] for c in ranking] == ["strong", "candidate-3", "weak"]
+    assert [c["selected"] for c in ranking] == [True, True, False]
+    assert all("resume" not in c for c in ranking)
+
+    # Worker-process scores match the in-process scorer
+    single = instant_score("Backend role", STRONG, REQUIREMENTS)
+    assert ranking[0]["ats_score"] == single["ats_score"]
+    assert ranking[0]["fit_score"] == single["fit_score"]
+
+    optimized = [e for e in events if e["type"] == "optimized"]
+    assert sorted(e["name"] for e in optimized) == ["candidate-3", "strong"]
+    assert sorted(calls) == sorted([STRONG, PARTIAL])
+
+
+def test_optimization_limit_and_failures():
+    def optimize(resume):
+        raise RuntimeError("LLM unavailable")
+
+    events, calls = _run([{"text": STRONG}, {"text": PARTIAL}], optimize=optimize, threshold=0.25, limit=1)
+
+    assert calls == [STRONG]
+    assert [e["type"] for e in events][-1] == "error"
+
+
+def test_unreadable_pdf_is_reported_per_candidate():
+    events, calls = _run([{"pdf": b"not a pdf", "name": "cv.pdf"}, {"text": STRONG}])
+
+    broken = [e for e in events if e["type"] == "screened" and e["name"] == "cv.pdf"][0]
+    assert "error" in broken
+    assert [c["index"] for c in events[2]["candidates"]] == [1]
+    assert calls == [STRONG]
+
+
+def test_extraction_failure_is_reported_in_the_stream():
+    with patch.object(screening, "extract_job_requirements", side_effect=RuntimeError("LLM down")):
+        events = list(screening.screen_candidates("Backend role", [{"text": STRONG}], lambda r: {}, 0.25, 1, "user-key"))
+
+    assert [e["type"] for e in events] == ["error"]
+    assert "LLM down" in events[0]["error"]
+
+
+def test_requests_share_one_worker_pool():
+    _run([{"text": STRONG}])
+    pool = screening._pool
+    _run([{"text": PARTIAL}])
+
+    assert pool is not None and screening._pool is pool
@@ -0,0 +1,68 @@
+from agent.state import create_initial_state
+from agent.tiers import get_tier_config
+from agent.workflow import get_agent_app
+from config import settings
+
+
+def test_balanced_tier_matches_settings():
+    state = create_initial_state("u", "job", "resume", tier="balanced")
+
+    assert state["tier"] == "balanced"
+    assert state["max_iterations"] == settings.MAX_ITERATIONS
+    assert state["target_score"] == settings.TARGET_SCORE
+    assert state["models"] == {}
+
+
+def test_fast_tier_limits_loop_and_sets_deadline():
+    state = create_initial_state("u", "job", "resume", tier="fast")
+
+    assert state["max_iterations"] == 1
+    assert state["models"]["plan_improvements"] == settings.FAST_TIER_MODEL
+    assert state["deadline_at"] is not None
+
+
+def test_unknown_tier_is_rejected():
+    try:
+        get_tier_config("instant")
+        assert False, "expected ValueError"
+    except ValueError:
+        pass
+
+
+def test_compiled_graph_is_cached_per_tier():
+    assert get_agent_app("fast") is get_agent_app("fast")
+    assert get_agent_app("fast") is not get_agent_app("thorough")
+    assert get_agent_app() is get_agent_app(settings.DEFAULT_LATENCY_TIER)
+
+
+def test_fast_tier_graph_reaches_modify_on_a_fresh_server():
+    from unittest.mock import patch
+    from agent import workflow
+    from agent.nodes import llm_client
+
+    def extract(state):
+        return {"job_requirements": {"required_skills": ["Python", "Docker"], "key_keywords": ["backend"]}}
+
+    def plan(state):
+        return {"improvement_plan": {"keyword_insertions": ["Docker"]}}
+
+    def modify(state):
+        return {"modified_resume": state["original_resume"] + "\nDocker"}
+
+    resume = "Experience:\n- Backend services in Python\nSkills: Python\nEducation: BSc"
+    for p95 in (None, 20.0):
+        llm_client.reset_llm_stats()
+        if p95:
+            # Pooled latencies of the default models must not stop a fast run either
+            for node in ("plan_improvements", "modify_resume"):
+                llm_client.record_llm_call(node, p95)
+
+        with patch.object(workflow, "extract_job_requirements", extract), \
+                patch.object(workflow, "plan_improvements", plan), \
+                patch.object(workflow, "modify_resume", modify):
+            app = workflow.create_agent_workflow("fast")
+        result = app.invoke(create_initial_state("u", "Backend engineer", resume, tier="fast"))
+
+        assert result["iteration_count"] == 1
+        assert result["modified_resume"].endswith("Docker")
+    llm_client.reset_llm_stats()
@@ -139,11 +139,274 @@ def test_get_user_runs():
             headers={"Authorization": "Bearer mocked_token"}
         )
         
-        # Verify status - now returns empty list as DB is not connected
+        # Verify status - now returns an empty page as DB is not connected
         assert response.status_code == 200
         data = response.json()
-        assert data == []
+        assert data == {"items": [], "next_cursor": None}
         
     finally:
         app.dependency_overrides = {}
 
+
+
+@patch("api.routes.agent.SessionLocal")
+@patch("api.routes.agent.decrypt_api_key")
+@patch("api.routes.agent.run_optimization")
+def test_batch_streams_one_saved_run_per_posting(mock_run_optimization, mock_decrypt_api_key, mock_session_local):
+    """Test the batch endpoint streams NDJSON and saves each run."""
+    import json
+
+    mock_user = MagicMock()
+    mock_user.id = "00000000-0000-0000-0000-000000000000"
+    mock_user.encrypted_api_key = "encrypted-value"
+
+    from auth.dependencies import get_current_user
+
+    app.dependency_overrides[get_current_user] = lambda: mock_user
+
+    def fake_run(job_description, **kwargs):
+        if job_description.startswith("Broken"):
+            raise RuntimeError("LLM unavailable")
+        return {"final_status": "completed", "fit_decision": "good_fit", "ats_score_before": 50.0}
+
+    try:
+        mock_decrypt_api_key.return_value = "gsk_test_key_1234567890"
+        mock_run_optimization.side_effect = fake_run
+        session = mock_session_local.return_value
+
+        response = client.post(
+            "/api/agent/batch",
+            json={
+                "resume": "A very long resume content that meets the minimum length requirement of 100 characters. " * 3,
+                "job_descriptions": [
+                    "Backend job description that meets the minimum length requirement. " * 2,
+                    "Broken job description that meets the minimum length requirement. " * 2,
+                    "Frontend job description that meets the minimum length requirement. " * 2,
+                ],
+            },
+            headers={"Authorization": "Bearer mocked_token"}
+        )
+
+        assert response.status_code == 200
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert lines[-1] == {"done": True, "completed": 2, "failed": 1}
+        assert sorted(line["index"] for line in lines[:-1] if "run_id" in line) == [0, 2]
+        assert [line["index"] for line in lines[:-1] if "error" in line] == [1]
+        assert session.add.call_count == 2
+        session.close.assert_called_once()
+
+    finally:
+        app.dependency_overrides = {}
+
+
+@patch("api.routes.agent.SessionLocal")
+@patch("api.routes.agent.screen_candidates")
+def test_screen_accepts_text_and_pdf_resumes(mock_screen_candidates, mock_session_local):
+    """Test the recruiter screening endpoint saves optimized candidates."""
+    import json
+
+    mock_user = MagicMock()
+    mock_user.id = "00000000-0000-0000-0000-000000000000"
+    mock_user.encrypted_api_key = None
+
+    from auth.dependencies import get_current_user
+
+    app.dependency_overrides[get_current_user] = lambda: mock_user
+
+    def fake_screen(job_description, candidates, **kwargs):
+        assert [sorted(c) for c in candidates] == [["text"], ["name", "pdf"]]
+        assert kwargs["max_optimizations"] == 0
+        yield {"type": "screened", "index": 0, "name": "candidate-1", "fit_score": 0.5}
+        yield {"type": "ranking", "candidates": []}
+
+    try:
+        mock_screen_candidates.side_effect = fake_screen
+
+        response = client.post(
+            "/api/agent/screen",
+            data={
+                "job_description": "Backend job description that meets the minimum length requirement. " * 2,
+                "resumes": ["Python engineer resume"],
+                "optimize": "false",
+            },
+            files=[("files", ("cv.pdf", b"%PDF-1.4", "application/pdf"))],
+            headers={"Authorization": "Bearer mocked_token"}
+        )
+
+        assert response.status_code == 200
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert lines[-1] == {"type": "done", "screened": 1, "optimized": 0, "failed": 0}
+
+        # Optimization needs the user's API key
+        response = client.post(
+            "/api/agent/screen",
+            data={
+                "job_description": "Backend job description that meets the minimum length requirement. " * 2,
+                "resumes": ["Python engineer resume"],
+            },
+            headers={"Authorization": "Bearer mocked_token"}
+        )
+        assert response.status_code == 400
+
+    finally:
+        app.dependency_overrides = {}
+
+
+
+@patch("api.routes.agent.SessionLocal")
+@patch("agent.screening._screen_all")
+@patch("agent.nodes.llm_client.build_groq_client")
+def test_screen_without_optimize_never_uses_server_key(mock_build_client, mock_screen_all, mock_session_local):
+    """Screening without a user key parses the posting locally instead of calling the LLM."""
+    import json
+
+    mock_user = MagicMock()
+    mock_user.id = "00000000-0000-0000-0000-000000000000"
+    mock_user.encrypted_api_key = None
+    mock_screen_all.return_value = iter([
+        {"index": 0, "name": "candidate-1", "resume": "Python engineer", "ats_score": 40.0, "fit_score": 0.5},
+    ])
+
+    from auth.dependencies import get_current_user
+
+    app.dependency_overrides[get_current_user] = lambda: mock_user
+    try:
+        response = client.post(
+            "/api/agent/screen",
+            data={
+                "job_description": "Backend role. Requirements:\n- Python\n- PostgreSQL\n- Docker\nNice to have: Go",
+                "resumes": ["Python engineer resume"],
+                "optimize": "false",
+            },
+            headers={"Authorization": "Bearer mocked_token"}
+        )
+
+        assert response.status_code == 200
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert [line["type"] for line in lines] == ["screened", "ranking", "done"]
+        assert "python" in lines[1]["job_requirements"]["required_skills"]
+        mock_build_client.assert_not_called()
+    finally:
+        app.dependency_overrides = {}
+
+def test_run_history_reads_summary_columns_only():
+    """Test the run list is built from the denormalized columns."""
+    from types import SimpleNamespace
+    from database.models.run import Run
+
+    mock_user = MagicMock()
+    mock_user.id = "00000000-0000-0000-0000-000000000000"
+    mock_session = MagicMock()
+    query = mock_session.query.return_value
+    query.filter.return_value.order_by.return_value.limit.return_value.all.return_value = [
+        SimpleNamespace(
+            id="11111111-1111-1111-1111-111111111111",
+            created_at="2024-01-01T00:00:00",
+            job_description="J" * 101,
+            ats_score_before=50.0,
+            ats_score_after=80.0,
+            fit_decision="good_fit",
+            iteration_count=2,
+            status="completed",
+        )
+    ]
+
+    from auth.dependencies import get_current_user
+    from database.connection import get_db
+
+    app.dependency_overrides[get_current_user] = lambda: mock_user
+    app.dependency_overrides[get_db] = lambda: mock_session
+
+    try:
+        response = client.get("/api/agent/runs", headers={"Authorization": "Bearer mocked_token"})
+
+        assert response.status_code == 200
+        page = response.json()
+        assert page["next_cursor"] is None
+        [item] = page["items"]
+        assert item["improvement_delta"] == 30.0
+        assert item["fit_decision"] == "good_fit"
+        assert item["job_description"] == "J" * 100 + "..."
+
+        projected = [str(c) for c in mock_session.query.call_args.args]
+        assert not any("result_json" in c for c in projected)
+        assert Run.summary_columns({"ats_score_before": 50.0, "iteration_count": 2.0}) == {
+            "ats_score_before": 50.0,
+            "ats_score_after": None,
+            "fit_decision": None,
+            "iteration_count": 2,
+        }
+
+    finally:
+        app.dependency_overrides = {}
+
+
+def test_run_history_cursor_pages():
+    """Test the run list hands out a cursor and seeks past it on the next page."""
+    from datetime import datetime, timezone
+    from types import SimpleNamespace
+    import uuid
+
+    def run(minute):
+        return SimpleNamespace(
+            id=uuid.UUID(int=minute),
+            created_at=datetime(2024, 1, 1, 0, minute, tzinfo=timezone.utc),
+            job_description="Job",
+            ats_score_before=None,
+            ats_score_after=None,
+            fit_decision=None,
+            iteration_count=None,
+            status="completed",
+        )
+
+    mock_user = MagicMock()
+    mock_session = MagicMock()
+    query = mock_session.query.return_value.filter.return_value
+    # Two rows asked for, three returned: a further page exists
+    query.order_by.return_value.limit.return_value.all.return_value = [run(5), run(4), run(3)]
+
+    from auth.dependencies import get_current_user
+    from database.connection import get_db
+
+    app.dependency_overrides[get_current_user] = lambda: mock_user
+    app.dependency_overrides[get_db] = lambda: mock_session
+
+    try:
+        page = client.get("/api/agent/runs?limit=2").json()
+        assert [item["id"] for item in page["items"]] == [str(uuid.UUID(int=5)), str(uuid.UUID(int=4))]
+        query.order_by.return_value.limit.assert_called_with(3)
+
+        seek = query.filter.return_value
+        seek.order_by.return_value.limit.return_value.all.return_value = [run(4), run(3)]
+        response = client.get(f"/api/agent/runs?limit=2&cursor={page['next_cursor']}")
+        assert response.status_code == 200
+        assert response.json()["next_cursor"] is None
+        # The cursor decodes back to the last row's position
+        bound = query.filter.call_args.args[0].right.clauses
+        assert [c.value for c in bound] == [run(4).created_at, run(4).id]
+
+        assert client.get("/api/agent/runs?cursor=not-a-cursor").status_code == 400
+    finally:
+        app.dependency_overrides = {}
+
+
+@patch("api.routes.agent._user_for_token")
+def test_live_scoring_survives_bad_messages(mock_user_for_token):
+    """Test malformed editor messages get an error frame, not a closed socket."""
+    mock_user_for_token.return_value = MagicMock()
+
+    with client.websocket_connect("/api/agent/live?token=t") as ws:
+        ws.send_text("{not json")
+        assert ws.receive_json()["type"] == "error"
+        ws.send_text("[1, 2]")
+        assert ws.receive_json()["detail"] == "Messages must be JSON objects"
+
+        ws.send_json({
+            "type": "init",
+            "job_description": "Backend role",
+            "job_requirements": {"required_skills": ["python"]},
+            "resume": "Skills\nPython",
+        })
+        score = ws.receive_json()
+        assert score["type"] == "score"
+        assert score["requirements_source"] == "request"
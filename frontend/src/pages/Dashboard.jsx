@@ -25,7 +25,7 @@ export default function Dashboard() {
           console.error("Failed to fetch user:", e);
         }
 
-        const runs = await getUserRuns(5); // Get last 5 runs
+        const { items: runs } = await getUserRuns(5); // Get last 5 runs
 
         if (runs.length > 0) {
           // Calculate stats
@@ -3,18 +3,23 @@ import { useNavigate } from 'react-router-dom';
 import { getUserRuns, deleteRun } from '../services/api';
 import ConfirmDialog from '../components/ConfirmDialog';
 
+const PAGE_SIZE = 20;
+
 export default function RunHistory() {
     const navigate = useNavigate();
     const [historyItems, setHistoryItems] = useState([]);
     const [loading, setLoading] = useState(true);
+    const [nextCursor, setNextCursor] = useState(null);
+    const [loadingMore, setLoadingMore] = useState(false);
     const [deleteConfirm, setDeleteConfirm] = useState({ isOpen: false, runId: null, runTitle: '' });
     const [deleting, setDeleting] = useState(false);
 
     useEffect(() => {
         const fetchRuns = async () => {
             try {
-                const runs = await getUserRuns(100);
-                setHistoryItems(runs);
+                const page = await getUserRuns(PAGE_SIZE);
+                setHistoryItems(page.items);
+                setNextCursor(page.next_cursor);
             } catch (error) {
                 console.error("Failed to fetch history:", error);
             } finally {
@@ -24,6 +29,21 @@ export default function RunHistory() {
         fetchRuns();
     }, []);
 
+    const handleLoadMore = async () => {
+        if (!nextCursor) return;
+
+        setLoadingMore(true);
+        try {
+            const page = await getUserRuns(PAGE_SIZE, nextCursor);
+            setHistoryItems(prev => [...prev, ...page.items]);
+            setNextCursor(page.next_cursor);
+        } catch (error) {
+            console.error("Failed to fetch more history:", error);
+        } finally {
+            setLoadingMore(false);
+        }
+    };
+
     const handleView = (id) => {
         navigate(`/optimization/${id}`);
     };
@@ -149,6 +169,19 @@ export default function RunHistory() {
                         ))
                     )}
                 </div>
+
+                {/* Next page */}
+                {!loading && nextCursor && (
+                    <div className="mt-6 text-center">
+                        <button
+                            onClick={handleLoadMore}
+                            disabled={loadingMore}
+                            className="px-6 py-3 bg-slate-800 hover:bg-slate-700 text-slate-300 rounded-lg font-semibold transition-all disabled:opacity-50"
+                        >
+                            {loadingMore ? "Loading..." : "Load more"}
+                        </button>
+                    </div>
+                )}
             </div>
 
             {/* Delete Confirmation Dialog */}
@@ -144,8 +144,14 @@ export async function runOptimization(job_description, resume) {
     });
 }
 
-export async function getUserRuns(limit = 10, skip = 0) {
-    return apiRequest(`/api/agent/runs?limit=${limit}&skip=${skip}`);
+// One page of run history, newest first: { items, next_cursor }.
+// Pass next_cursor back to fetch the following page; it is null on the last one.
+export async function getUserRuns(limit = 10, cursor = null) {
+    const params = new URLSearchParams({ limit: String(limit) });
+    if (cursor) {
+        params.set('cursor', cursor);
+    }
+    return apiRequest(`/api/agent/runs?${params}`);
 }
 
 export async function getRunDetails(runId) {
@@ -267,9 +273,9 @@ export async function getRuns(limit = 20, options = {}) {
     }
 
     cacheEntry.promise = apiRequest(`/api/agent/runs?limit=${limit}`)
-        .then((data) => {
-            setEntry(cacheEntry, data, CACHE_TTL_MS.runs);
-            return data;
+        .then((page) => {
+            setEntry(cacheEntry, page.items, CACHE_TTL_MS.runs);
+            return page.items;
         })
         .finally(() => {
             cacheEntry.promise = null;